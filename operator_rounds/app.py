@@ -4,23 +4,30 @@ Operator Rounds Tracking Application
 A Streamlit application for tracking operator rounds in industrial facilities.
 """
 import streamlit as st
-from operator_rounds.database.schema import init_db
-from operator_rounds.database.schema import add_mode_column_to_round_items
+from operator_rounds.database.schema import ensure_schema
 from operator_rounds.utils.state import init_session_state
 from operator_rounds.ui.sidebar import render_sidebar
 from operator_rounds.ui.view_rounds import view_saved_rounds
+from operator_rounds.ui.import_rounds import render_import_page
 from operator_rounds.ui.round_completion import render_round_completion
 from operator_rounds.ui.section_editor import render_section_content
-from operator_rounds.database.queries import toggle_expand_all
+from operator_rounds.ui.session import toggle_expand_all
+from operator_rounds.database.connection import get_pool_stats
+from operator_rounds.database.query_cache import get_query_cache_stats
+from operator_rounds.database.query_log import (
+    get_query_timing_stats, get_slow_query_log_path, is_query_timing_enabled,
+    reset_query_timing_stats, set_query_timing
+)
 from operator_rounds.utils.validation import validate_input_data
+from operator_rounds.config import DATABASE, FEATURES
 
 # Page configuration
 st.set_page_config(page_title="Operator Rounds Tracking", layout="wide")
 
-# Initialize database and session state
-init_db()
-
-mode_column_success, mode_column_message = add_mode_column_to_round_items()
+# Initialize database (migrations run once per process) and session state
+schema_ready, schema_message = ensure_schema()
+if not schema_ready:
+    st.error(schema_message)
 
 init_session_state()
 
@@ -32,8 +39,30 @@ else:
 
 st.title("Operator Rounds Tracking")
 
-if st.session_state.get('debug_mode', False) and mode_column_success:
-    st.write(f"Debug - {mode_column_message}")
+if st.session_state.get('debug_mode', False) and schema_ready:
+    st.write(f"Debug - {schema_message}")
+
+if st.session_state.get('debug_mode', False):
+    with st.sidebar.expander("Debug - Connection Pool", expanded=False):
+        st.json(get_pool_stats())
+    with st.sidebar.expander("Debug - Query Cache", expanded=False):
+        st.json(get_query_cache_stats())
+    with st.sidebar.expander("Debug - Query Timing", expanded=False):
+        # Timing is process-wide, so only an actual toggle changes it
+        st.checkbox(
+            "Time every statement", value=is_query_timing_enabled(), key="query_timing_toggle",
+            on_change=lambda: set_query_timing(st.session_state.query_timing_toggle)
+        )
+        timings = get_query_timing_stats()
+        if timings:
+            st.dataframe(timings, hide_index=True)
+            if st.button("Reset Timings", key="query_timing_reset"):
+                reset_query_timing_stats()
+                st.rerun()
+        else:
+            st.write("No statements timed yet.")
+        st.caption(f"Statements over {DATABASE.get('slow_query_ms', 100)} ms are logged to "
+                   f"{get_slow_query_log_path()}")
 
 # Render the sidebar
 render_sidebar()
@@ -47,6 +76,14 @@ if st.session_state.get('viewing_rounds'):
         st.rerun()
     st.markdown("---")
 
+if st.session_state.get('importing_rounds') and FEATURES.get("import_csv", False):
+    st.header("Import Rounds")
+    render_import_page()
+    if st.button("Return to Round Entry", key="import_return"):
+        st.session_state.importing_rounds = False
+        st.rerun()
+    st.markdown("---")
+
 # Main rounds interface
 if st.session_state.current_round:
     units = st.session_state.rounds_data[st.session_state.current_round]["units"]
@@ -113,16 +150,16 @@ if st.session_state.current_round:
                                                     else:
                                                         # Now save the empty section to database
                                                         from operator_rounds.database.connection import get_db_connection
+                                                        from operator_rounds.database.latest_values import record_latest_items
+                                                        from operator_rounds.database.queries import insert_section
                                                         import sqlite3
                                                         
                                                         with get_db_connection() as conn:
-                                                            conn.execute("BEGIN TRANSACTION")
+                                                            conn.execute("BEGIN IMMEDIATE")
                                                             try:
                                                                 c = conn.cursor()
-                                                                c.execute('''
-                                                                    INSERT INTO sections (round_id, unit, section_name)
-                                                                    VALUES (?, ?, ?)
-                                                                ''', (st.session_state.current_round_id, unit_name, section_name))
+                                                                insert_section(c, st.session_state.current_round_id, unit_name, section_name)
+                                                                record_latest_items(c, st.session_state.current_round_id, unit_name, section_name, [])
                                                                 conn.commit()
                                                                 st.success(f"Section '{section_name}' added")
                                                                 st.rerun()
@@ -160,6 +197,21 @@ if st.session_state.current_round:
                                         result = render_section_content(unit_name, section_name, sections[section_name])
                                         if result == "delete_section":
                                             del sections[section_name]
+                                            
+                                            # Drop the section's rows from the round being recorded
+                                            if st.session_state.get('current_round_id'):
+                                                from operator_rounds.database.connection import get_db_connection
+                                                from operator_rounds.database.queries import remove_section
+                                                import sqlite3
+                                                
+                                                try:
+                                                    with get_db_connection() as conn:
+                                                        conn.execute("BEGIN IMMEDIATE")
+                                                        remove_section(conn.cursor(), st.session_state.current_round_id, unit_name, section_name)
+                                                        conn.commit()
+                                                except sqlite3.Error as e:
+                                                    st.error(f"Database error when removing section: {str(e)}")
+                                            
                                             st.session_state.pop('confirm_delete')
                                             st.success(f"Section '{section_name}' removed")
                                             st.rerun()
@@ -0,0 +1,9 @@
+"""
+Benchmarks for Operator Rounds Tracking.
+
+synthetic_data generates databases shaped like years of production use;
+suite times the hot data-layer paths against them and saves the results
+as JSON, so runs on different commits can be compared; load_test runs
+several operator sessions against one at the same time. The modules run
+as scripts (python -m ...), so nothing is imported here.
+"""
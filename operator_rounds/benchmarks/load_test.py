@@ -0,0 +1,398 @@
+"""
+Concurrent-session load test for Operator Rounds Tracking.
+
+Simulates several operators using the app at once, the way consoles do at
+shift change: every session logs in, then repeatedly completes the
+sections of a unit and browses the round history, opening a few rounds.
+All sessions start together, optionally pausing between actions.
+
+Two modes:
+
+- data (default): each session is a thread making the calls the pages
+  make (load_last_round_data and start_round on log-in, save_round_section
+  per section, build_rounds_query + process_rounds_data and get_round_by_id
+  when browsing). The threads share one connection manager and query
+  cache, like the sessions of one Streamlit server.
+- app: each session drives the real pages through Streamlit's AppTest:
+  render_sidebar to log in, render_round_completion to submit the section
+  forms and view_saved_rounds to browse. AppTest cannot run two sessions
+  in one process, so each session is its own process, and the sessions
+  contend for SQLite's file lock rather than the in-process write lock.
+
+The report gives latency percentiles per action, error rates, and lock
+waits: checkouts that queued for the write lock or a pooled reader (from
+the connection manager's statistics), and errors SQLite raised because
+the database stayed locked past busy_timeout_ms.
+
+The sessions write rounds, so the test runs against a copy: by default a
+synthetic database in PATHS["benchmarks"], generated if missing (see
+benchmarks/synthetic_data.py). The configured database is refused.
+
+Usage:
+    python -m operator_rounds.benchmarks.load_test [--sessions N]
+        [--rounds N] [--mode {data,app}] [--think SECONDS]
+        [--open-rounds N] [--database FILE] [--years N] [--output FILE]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from operator_rounds.benchmarks.suite import get_database_filename, get_git_commit
+from operator_rounds.benchmarks.synthetic_data import SyntheticSpec, generate_database, using_database
+from operator_rounds.config import DEFAULTS, PATHS, get_database_path
+from operator_rounds.database.connection import get_pool_stats
+from operator_rounds.database.queries import (
+    get_round_by_id, load_last_round_data, save_round_section, start_round
+)
+from operator_rounds.database.query_cache import cached_query
+from operator_rounds.database.schema import ensure_schema
+from operator_rounds.ui.view_rounds import build_rounds_query, process_rounds_data
+
+MODES = ["data", "app"]
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+APP_TIMEOUT_SECONDS = 120
+START_DELAY_SECONDS = 1.0  # Lets every session get ready before the common start time
+LOCK_ERROR = "database locked"
+WAIT_STATS = ("checkout_waits", "checkout_wait_seconds")
+
+class LoadTestSettings(NamedTuple):
+    """What each simulated operator does."""
+    sessions: int = 5
+    rounds: int = 3  # Rounds completed (and history visits) per session
+    think_seconds: float = 0.0  # Longest pause between actions; 0 for back to back
+    open_rounds: int = 3  # Rounds opened per history visit
+    seed: int = 0
+
+class ActionRecord(NamedTuple):
+    """One timed action of one session."""
+    session: int
+    action: str
+    elapsed_seconds: float
+    error: Optional[str]
+
+class SessionResult(NamedTuple):
+    """The actions of a session, and the lock waits of its process."""
+    records: List[ActionRecord]
+    waits: Dict[str, float]
+
+def classify_error(message: str) -> str:
+    """Group error messages, so that lock timeouts are counted together."""
+    if "locked" in message or "busy" in message:
+        return LOCK_ERROR
+    return message.splitlines()[0][:200] if message else "error"
+
+def _wait_stats() -> Dict[str, float]:
+    """Return the lock-wait counters of this process's connection pool."""
+    stats = get_pool_stats()
+    return {name: stats[name] for name in WAIT_STATS}
+
+class _Session:
+    """Times the actions of one simulated operator."""
+
+    def __init__(self, number: int, settings: LoadTestSettings):
+        self.number = number
+        self.settings = settings
+        self.rng = random.Random(settings.seed * 1000 + number)
+        self.operator_name = f"Load Test {number + 1:02d}"
+        self.records: List[ActionRecord] = []
+
+    def timed(self, action: str, step: Callable[[], Optional[str]]) -> None:
+        """Run a step, recording its time and the error it raised or returned."""
+        started = time.perf_counter()
+        try:
+            error = step()
+        except Exception as e:
+            error = classify_error(str(e))
+        self.records.append(ActionRecord(self.number, action, time.perf_counter() - started, error))
+
+    def think(self) -> None:
+        if self.settings.think_seconds:
+            time.sleep(self.rng.uniform(0, self.settings.think_seconds))
+
+def _wait_until(start_time: float) -> None:
+    time.sleep(max(0.0, start_time - time.time()))
+
+def run_data_session(number: int, settings: LoadTestSettings, start_time: float) -> SessionResult:
+    """Run one session against the data layer, in the calling thread."""
+    session = _Session(number, settings)
+    state: Dict[str, Any] = {}
+
+    def open_app():
+        state["rounds_data"] = load_last_round_data()
+
+    def login():
+        round_type = next(name for name, sheet in state["rounds_data"].items() if sheet["units"])
+        state["round_type"] = round_type
+        state["round_id"] = start_round(round_type, session.operator_name, "Days")
+
+    def save_section(unit, section, items):
+        def step():
+            values = [dict(item, value=f"{session.rng.uniform(5, 500):.2f}") for item in items]
+            save_round_section(state["round_id"], unit, section, values)
+        return step
+
+    def browse_history():
+        query, params = build_rounds_query("All", "All Round Types", "All Operators")
+        state["page"] = list(process_rounds_data(cached_query(query, params)[:DEFAULTS["items_per_page"]]))
+
+    def open_round(round_id):
+        def step():
+            get_round_by_id(round_id)
+        return step
+
+    _wait_until(start_time)
+    session.timed("open_app", open_app)
+    session.timed("login", login)
+    if "round_id" not in state:
+        return SessionResult(session.records, {})
+
+    units = state["rounds_data"][state["round_type"]]["units"]
+    for cycle in range(settings.rounds):
+        if cycle:
+            session.timed("start_round", login)
+        unit = session.rng.choice([name for name, unit in units.items() if unit["sections"]])
+        for section, data in units[unit]["sections"].items():
+            session.think()
+            session.timed("save_section", save_section(unit, section, data["items"]))
+
+        session.think()
+        session.timed("browse_history", browse_history)
+        page = state.get("page", [])
+        for round_id in session.rng.sample(page, min(settings.open_rounds, len(page))):
+            session.timed("open_round", open_round(round_id))
+
+    return SessionResult(session.records, {})
+
+def _app_errors(at) -> Optional[str]:
+    """Return the first exception or error message the last run of an AppTest showed."""
+    messages = [element.value for element in at.exception] + [element.value for element in at.error]
+    return classify_error(str(messages[0])) if messages else None
+
+def run_app_session(number: int, settings: LoadTestSettings, start_time: float,
+                    database_path: str) -> SessionResult:
+    """Run one session through the Streamlit pages, in a process of its own."""
+    from streamlit.testing.v1 import AppTest
+
+    session = _Session(number, settings)
+    with using_database(database_path):
+        waits_before = _wait_stats()
+        at = AppTest.from_file(APP_PATH, default_timeout=APP_TIMEOUT_SECONDS)
+
+        def login():
+            at.sidebar.text_input[0].input(session.operator_name)
+            next(button for button in at.sidebar.button
+                 if button.label == "Set Operator Information").click().run()
+            return _app_errors(at)
+
+        def click(button) -> Callable[[], Optional[str]]:
+            return lambda: _app_errors(button.click().run())
+
+        _wait_until(start_time)
+        session.timed("open_app", lambda: _app_errors(at.run()))
+        session.timed("login", login)
+
+        for cycle in range(settings.rounds):
+            units = at.session_state.rounds_data[at.session_state.current_round]["units"]
+            unit = next((name for name, data in units.items() if data["sections"]), None)
+            if unit is None:
+                session.records.append(ActionRecord(number, "start_round", 0.0, "no sections to complete"))
+                break
+
+            # Each later round is a new one, as at the next shift
+            if cycle:
+                at.session_state.current_round_id = None
+            session.think()
+            session.timed("start_round", click(at.button(key=f"complete_{unit}")))
+            for _ in units[unit]["sections"]:
+                buttons = [button for button in at.button if button.label in ("Next Section", "Complete Round")]
+                if not buttons:
+                    break
+                session.think()
+                session.timed("save_section", click(buttons[0]))
+
+            session.think()
+            session.timed("browse_history", click(next(
+                button for button in at.sidebar.button if button.label == "View Previous Rounds")))
+            toggles = [checkbox for checkbox in at.checkbox if (checkbox.key or "").startswith("details_")]
+            for checkbox in session.rng.sample(toggles, min(settings.open_rounds, len(toggles))):
+                session.timed("open_round", lambda checkbox=checkbox: _app_errors(checkbox.check().run()))
+            returns = [button for button in at.button if button.label == "Return to Round Entry"]
+            if returns:
+                session.timed("close_history", click(returns[0]))
+
+        waits_after = _wait_stats()
+    return SessionResult(session.records, {name: waits_after[name] - waits_before[name] for name in WAIT_STATS})
+
+def summarize_latencies(samples: List[float]) -> Dict[str, float]:
+    """Return latency percentiles of a list of timings, in milliseconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else [ms[0]] * 99
+    return {
+        "p50_ms": round(cuts[49], 3),
+        "p90_ms": round(cuts[89], 3),
+        "p95_ms": round(cuts[94], 3),
+        "p99_ms": round(cuts[98], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def summarize_records(records: List[ActionRecord]) -> Dict[str, Dict[str, Any]]:
+    """Return count, error rate, errors and latencies per action."""
+    actions: Dict[str, List[ActionRecord]] = {}
+    for record in records:
+        actions.setdefault(record.action, []).append(record)
+
+    summary = {}
+    for action, action_records in actions.items():
+        errors: Dict[str, int] = {}
+        for record in action_records:
+            if record.error:
+                errors[record.error] = errors.get(record.error, 0) + 1
+        failed = sum(errors.values())
+        summary[action] = {
+            "count": len(action_records),
+            "errors": failed,
+            "error_rate": round(failed / len(action_records), 4),
+            **summarize_latencies([record.elapsed_seconds for record in action_records]),
+            "error_messages": errors,
+        }
+    return summary
+
+def run_load_test(database_path: str, settings: LoadTestSettings, mode: str = "data") -> Dict[str, Any]:
+    """
+    Run every session against a database and summarize them.
+
+    Args:
+        database_path (str): The database the sessions use; it gets written to
+        settings (LoadTestSettings): Number of sessions and what they do
+        mode (str): "data" for threads calling the data layer, "app" for
+            AppTest sessions in separate processes
+
+    Returns:
+        Dict[str, Any]: The results document saved by save_results()
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {MODES}")
+
+    with using_database(database_path):
+        schema_ready, schema_message = ensure_schema()
+        if not schema_ready:
+            raise RuntimeError(schema_message)
+        waits_before = _wait_stats()
+
+        start_time = time.time() + START_DELAY_SECONDS * (1 if mode == "data" else settings.sessions)
+        if mode == "data":
+            with ThreadPoolExecutor(max_workers=settings.sessions) as executor:
+                results = list(executor.map(run_data_session, range(settings.sessions),
+                                            [settings] * settings.sessions, [start_time] * settings.sessions))
+            waits_after = _wait_stats()
+            waits = {name: waits_after[name] - waits_before[name] for name in WAIT_STATS}
+        else:
+            # Spawned, not forked: a child must not inherit this process's open connections
+            with ProcessPoolExecutor(max_workers=settings.sessions,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                results = list(executor.map(run_app_session, range(settings.sessions),
+                                            [settings] * settings.sessions, [start_time] * settings.sessions,
+                                            [database_path] * settings.sessions))
+            waits = {name: sum(result.waits.get(name, 0) for result in results) for name in WAIT_STATS}
+        elapsed = time.time() - start_time
+
+    records = [record for result in results for record in result.records]
+    failed = [record for record in records if record.error]
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": get_git_commit(),
+        "database": os.path.abspath(database_path),
+        "mode": mode,
+        "settings": settings._asdict(),
+        "totals": {
+            "actions": len(records),
+            "errors": len(failed),
+            "error_rate": round(len(failed) / len(records), 4) if records else 0.0,
+            "lock_errors": sum(1 for record in failed if record.error == LOCK_ERROR),
+            "lock_waits": int(waits["checkout_waits"]),
+            "lock_wait_seconds": round(waits["checkout_wait_seconds"], 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "actions_per_second": round(len(records) / elapsed, 2) if elapsed > 0 else 0.0,
+            **summarize_latencies([record.elapsed_seconds for record in records] or [0.0]),
+        },
+        "actions": summarize_records(records),
+    }
+
+def format_results(results: Dict[str, Any]) -> List[str]:
+    """Return the report as lines of text."""
+    totals = results["totals"]
+    settings = results["settings"]
+    lines = [
+        f"{settings['sessions']} sessions ({results['mode']} mode), {totals['actions']} actions "
+        f"in {totals['elapsed_seconds']:.1f} s ({totals['actions_per_second']:.1f}/s)",
+        f"Errors: {totals['errors']} ({totals['error_rate']:.1%}), {totals['lock_errors']} lock timeouts; "
+        f"lock waits: {totals['lock_waits']} ({totals['lock_wait_seconds']:.2f} s)",
+        f"  {'action':<16} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p90 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    for action, stats in results["actions"].items():
+        lines.append(f"  {action:<16} {stats['count']:>6} {stats['errors']:>6} {stats['p50_ms']:>9.1f} "
+                     f"{stats['p90_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+                     f"{stats['max_ms']:>9.1f}")
+        for message, count in stats["error_messages"].items():
+            lines.append(f"    {count} x {message}")
+    return lines
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the load test."""
+    defaults = LoadTestSettings()
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.benchmarks.load_test",
+        description="Simulate several operators using the app at once."
+    )
+    parser.add_argument("--sessions", type=int, default=defaults.sessions, help="Concurrent operators")
+    parser.add_argument("--rounds", type=int, default=defaults.rounds, help="Rounds completed per operator")
+    parser.add_argument("--mode", choices=MODES, default="data",
+                        help="data: threads calling the data layer; app: AppTest sessions in processes")
+    parser.add_argument("--think", type=float, default=defaults.think_seconds,
+                        help="Longest random pause between actions, in seconds")
+    parser.add_argument("--open-rounds", type=int, default=defaults.open_rounds,
+                        help="Rounds opened per history visit")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+    parser.add_argument("--database", default=None,
+                        help="Database to load (default: a synthetic one in PATHS['benchmarks'])")
+    parser.add_argument("--years", type=float, default=0.25, help="Years of history of the synthetic database")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    settings = LoadTestSettings(args.sessions, args.rounds, args.think, args.open_rounds, args.seed)
+    try:
+        database_path = args.database
+        if database_path is None:
+            spec = SyntheticSpec(years=args.years)
+            os.makedirs(PATHS["benchmarks"], exist_ok=True)
+            database_path = os.path.join(PATHS["benchmarks"], get_database_filename(spec))
+            if not os.path.exists(database_path):
+                print(f"Generating {spec.rounds} rounds in {database_path}", flush=True)
+                generate_database(database_path, spec)
+        if os.path.abspath(database_path) == os.path.abspath(get_database_path()):
+            print("The load test writes rounds; run it against a copy of the database", file=sys.stderr)
+            return 1
+
+        results = run_load_test(database_path, settings, args.mode)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+    except (sqlite3.Error, OSError, ValueError, RuntimeError) as e:
+        print(f"Load test error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print("\n".join(format_results(results)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
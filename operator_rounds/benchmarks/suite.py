@@ -0,0 +1,369 @@
+"""
+Data-layer benchmark suite for Operator Rounds Tracking.
+
+Times the paths every session hits against synthetic databases of several
+sizes (see benchmarks/synthetic_data.py):
+
+- load_last_round_data: the form pre-fill on log-in;
+- save_round_section: saving one section of a new round;
+- get_round_by_id: opening a round's details;
+- history_page / history_page_operator: one page of the round history
+  (build_rounds_query + process_rounds_data), unfiltered and for the least
+  active operator, whose rounds are spread thinnest;
+- export_round_to_csv: a single round export;
+- get_round_summary_for_period: the 30-day summary;
+- delete_round: deleting a round with one saved section.
+
+Read benchmarks clear the query cache before each call, so they measure
+the database rather than the cache. Rounds created for the write
+benchmarks are deleted again afterwards.
+
+Each size's database is generated once into PATHS["benchmarks"] and reused
+as is by later runs (--regenerate starts it over), so runs on different
+commits measure the same data. Results are written as JSON with the commit
+and environment; --compare prints the median of each benchmark against an
+earlier results file.
+
+Usage:
+    python -m operator_rounds.benchmarks.suite [--years N [N ...]]
+        [--sections N] [--items N] [--operators N] [--seed N]
+        [--repeat N] [--output FILE] [--compare BASELINE] [--regenerate]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from operator_rounds.benchmarks.synthetic_data import (
+    SyntheticSpec, add_spec_arguments, generate_database, using_database
+)
+from operator_rounds.config import DEFAULTS, PATHS
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.maintenance import get_database_bytes
+from operator_rounds.database.queries import (
+    delete_round, delete_rounds, get_round_by_id, get_round_summary_for_period,
+    load_last_round_data, save_round_section, start_round
+)
+from operator_rounds.database.query_cache import cached_query, get_query_cache
+from operator_rounds.database.schema import ensure_schema
+from operator_rounds.database.timeutils import epoch_to_local
+from operator_rounds.ui.view_rounds import build_rounds_query, process_rounds_data
+from operator_rounds.utils.export import export_round_to_csv
+
+RESULTS_FORMAT = 1
+DEFAULT_YEARS = [0.25, 1.0]
+DEFAULT_REPEAT = 20
+WARMUP_CALLS = 2
+
+SELECT_ROUND_IDS_SQL = 'SELECT id FROM rounds ORDER BY id'
+SELECT_LAST_ROUND_SQL = '''
+    SELECT round_type, shift, timestamp_utc FROM rounds
+    ORDER BY timestamp_utc DESC
+    LIMIT 1
+'''
+SELECT_LEAST_ACTIVE_OPERATOR_SQL = '''
+    SELECT o.name FROM rounds r
+    JOIN operators o ON r.operator_id = o.id
+    GROUP BY o.id
+    ORDER BY COUNT(*), o.name
+    LIMIT 1
+'''
+
+class Benchmark(NamedTuple):
+    """A timed call, with untimed setup before and teardown after each call."""
+    name: str
+    run: Callable[[Any], Any]  # Called with the result of setup
+    setup: Callable[[], Any] = lambda: None
+    teardown: Callable[[Any], None] = lambda prepared: None
+
+class SuiteContext:
+    """Data the benchmarks pick their arguments from, read once per database."""
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+        with get_db_connection(readonly=True) as conn:
+            self.round_ids = [row[0] for row in conn.execute(SELECT_ROUND_IDS_SQL)]
+            self.round_type, self.shift, last_epoch = conn.execute(SELECT_LAST_ROUND_SQL).fetchone()
+            self.least_active_operator = conn.execute(SELECT_LEAST_ACTIVE_OPERATOR_SQL).fetchone()[0]
+        if not self.round_ids:
+            raise ValueError("The benchmark database has no rounds")
+
+        # The newest round's first section is the one the write benchmarks save
+        newest = get_round_by_id(self.round_ids[-1])
+        section = newest.sections[0]
+        self.unit, self.section = section.unit, section.section_name
+        self.items = [{"description": item.description, "value": item.value,
+                       "output": item.output, "mode": item.mode} for item in section.items]
+
+        last_day = epoch_to_local(last_epoch).date()
+        self.summary_range = ((last_day - timedelta(days=29)).isoformat(), last_day.isoformat())
+        self.created_round_ids: List[int] = []
+
+    def random_round_id(self) -> int:
+        return self.rng.choice(self.round_ids)
+
+    def new_items(self) -> List[Dict[str, Any]]:
+        """Return the section's items with fresh values, as a new round would have."""
+        return [dict(item, value=f"{self.rng.uniform(5, 500):.2f}") for item in self.items]
+
+    def start_round(self) -> int:
+        round_id = start_round(self.round_type, "Benchmark Operator", self.shift)
+        self.created_round_ids.append(round_id)
+        return round_id
+
+def _clear_query_cache() -> None:
+    get_query_cache().clear()
+
+def _history_page(operator: str) -> Dict[int, Dict[str, Any]]:
+    """Fetch and process the first page of the round history, as view_saved_rounds does."""
+    query, params = build_rounds_query("All", "All Round Types", operator)
+    return process_rounds_data(cached_query(query, params)[:DEFAULTS["items_per_page"]])
+
+def build_benchmarks(context: SuiteContext) -> List[Benchmark]:
+    """Return the benchmarks of the suite, in the order they run."""
+
+    def setup_saved_round() -> int:
+        round_id = context.start_round()
+        save_round_section(round_id, context.unit, context.section, context.new_items())
+        return round_id
+
+    return [
+        Benchmark("load_last_round_data", lambda _: load_last_round_data(), _clear_query_cache),
+        Benchmark("save_round_section",
+                  lambda round_id: save_round_section(round_id, context.unit, context.section,
+                                                      context.new_items()),
+                  context.start_round),
+        Benchmark("get_round_by_id", get_round_by_id, context.random_round_id),
+        Benchmark("history_page", lambda _: _history_page("All Operators"), _clear_query_cache),
+        Benchmark("history_page_operator", lambda _: _history_page(context.least_active_operator),
+                  _clear_query_cache),
+        Benchmark("export_round_to_csv", lambda round_id: export_round_to_csv(round_id, True),
+                  context.random_round_id),
+        Benchmark("get_round_summary_for_period",
+                  lambda _: get_round_summary_for_period(*context.summary_range), _clear_query_cache),
+        Benchmark("delete_round", delete_round, setup_saved_round,
+                  lambda round_id: context.created_round_ids.remove(round_id)),
+    ]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Return the count and distribution of timings, in milliseconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    p95 = statistics.quantiles(ms, n=20)[18] if len(ms) > 1 else ms[0]
+    return {
+        "n": len(ms),
+        "min_ms": round(ms[0], 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.mean(ms), 3),
+        "p95_ms": round(p95, 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+def time_benchmark(benchmark: Benchmark, repeat: int) -> Dict[str, float]:
+    """Run a benchmark repeat times after a short warm-up and summarize the timings."""
+    samples = []
+    for call in range(WARMUP_CALLS + repeat):
+        prepared = benchmark.setup()
+        started = time.perf_counter()
+        benchmark.run(prepared)
+        elapsed = time.perf_counter() - started
+        benchmark.teardown(prepared)
+        if call >= WARMUP_CALLS:
+            samples.append(elapsed)
+    return summarize(samples)
+
+def run_suite(database_path: str, repeat: int = DEFAULT_REPEAT, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """
+    Time every benchmark against one database.
+
+    Args:
+        database_path (str): A database generated by synthetic_data
+        repeat (int): Timed calls per benchmark
+        seed (int): Seed for the rounds picked by the read benchmarks
+
+    Returns:
+        Dict[str, Dict[str, float]]: Timing summary per benchmark name
+
+    Raises:
+        sqlite3.Error: If a query fails
+    """
+    with using_database(database_path):
+        schema_ready, schema_message = ensure_schema()
+        if not schema_ready:
+            raise RuntimeError(schema_message)
+
+        context = SuiteContext(seed)
+        try:
+            return {benchmark.name: time_benchmark(benchmark, repeat)
+                    for benchmark in build_benchmarks(context)}
+        finally:
+            # Leave the database as generated for the next run
+            if context.created_round_ids:
+                delete_rounds(context.created_round_ids)
+            _clear_query_cache()
+
+def get_database_filename(spec: SyntheticSpec) -> str:
+    """Return the file name of the generated database for a spec."""
+    round_type = spec.round_type.split()[0].lower()
+    return (f"synthetic-{spec.years:g}y-{spec.sections}s-{spec.items}i-"
+            f"{spec.operators}o-{round_type}-seed{spec.seed}.db")
+
+def get_git_commit() -> Optional[str]:
+    """Return the commit of the working tree, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(specs: List[SyntheticSpec], repeat: int = DEFAULT_REPEAT, regenerate: bool = False,
+                   directory: Optional[str] = None, on_progress=None) -> Dict[str, Any]:
+    """
+    Run the suite against a database per spec, generating missing ones.
+
+    Args:
+        specs (List[SyntheticSpec]): The data sizes to run at
+        repeat (int): Timed calls per benchmark
+        regenerate (bool): Generate the databases again even if they exist
+        directory (str, optional): Where the databases live; defaults to PATHS["benchmarks"]
+        on_progress (callable, optional): Called with a message per step
+
+    Returns:
+        Dict[str, Any]: The results document saved by save_results()
+    """
+    directory = directory or PATHS["benchmarks"]
+    os.makedirs(directory, exist_ok=True)
+    report = on_progress or (lambda message: None)
+
+    sizes = []
+    for spec in specs:
+        path = os.path.join(directory, get_database_filename(spec))
+        if regenerate:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        if not os.path.exists(path):
+            report(f"Generating {spec.rounds} rounds of {spec.items_per_round} readings in {path}")
+            generate_database(path, spec)
+
+        report(f"Running the suite on {path}")
+        results = run_suite(path, repeat, spec.seed)
+        with using_database(path):
+            database_bytes = get_database_bytes()
+        sizes.append({
+            "label": f"{spec.years:g}y",
+            "spec": spec._asdict(),
+            "rounds": spec.rounds,
+            "readings": spec.rounds * spec.items_per_round,
+            "database_bytes": database_bytes,
+            "benchmarks": results,
+        })
+
+    return {
+        "format": RESULTS_FORMAT,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": get_git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "repeat": repeat,
+        "sizes": sizes,
+    }
+
+def save_results(results: Dict[str, Any], path: Optional[str] = None) -> str:
+    """Write a results document as JSON, by default into PATHS["benchmarks"]."""
+    if path is None:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(PATHS["benchmarks"], f"benchmark_{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+def compare_results(baseline: Dict[str, Any], results: Dict[str, Any]) -> List[str]:
+    """
+    Compare the medians of two results documents.
+
+    Returns:
+        List[str]: A line per benchmark present in both, with the ratio of
+            the new median to the baseline's (below 1 is faster)
+    """
+    lines = [f"Baseline {baseline.get('commit') or 'unknown'} -> {results.get('commit') or 'unknown'}"]
+    baseline_sizes = {size["label"]: size for size in baseline.get("sizes", [])}
+    for size in results["sizes"]:
+        old = baseline_sizes.get(size["label"])
+        if old is None:
+            continue
+        if old["spec"] != size["spec"]:
+            lines.append(f"{size['label']}: different data, not compared")
+            continue
+        for name, stats in size["benchmarks"].items():
+            old_stats = old["benchmarks"].get(name)
+            if old_stats is None:
+                continue
+            ratio = stats["median_ms"] / old_stats["median_ms"] if old_stats["median_ms"] else float("inf")
+            lines.append(f"{size['label']:>6} {name:<30} {old_stats['median_ms']:>10.3f} ms "
+                         f"-> {stats['median_ms']:>10.3f} ms  x{ratio:.2f}")
+    return lines
+
+def format_results(results: Dict[str, Any]) -> List[str]:
+    """Return a line per benchmark and size with its median and p95."""
+    lines = []
+    for size in results["sizes"]:
+        lines.append(f"{size['label']}: {size['rounds']} rounds, {size['readings']} readings, "
+                     f"{size['database_bytes'] / 1024 / 1024:.1f} MiB")
+        for name, stats in size["benchmarks"].items():
+            lines.append(f"  {name:<30} median {stats['median_ms']:>9.3f} ms  "
+                         f"p95 {stats['p95_ms']:>9.3f} ms")
+    return lines
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.benchmarks.suite",
+        description="Time the data layer against synthetic databases of several sizes."
+    )
+    parser.add_argument("--years", type=float, nargs="+", default=DEFAULT_YEARS,
+                        help="Years of history of each database size")
+    add_spec_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed calls per benchmark")
+    parser.add_argument("--output", default=None,
+                        help="Results file (default: PATHS['benchmarks']/benchmark_<time>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--regenerate", action="store_true", help="Generate the databases again")
+    args = parser.parse_args(argv)
+
+    try:
+        baseline = None
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f:
+                baseline = json.load(f)
+
+        specs = [SyntheticSpec(years, args.sections, args.items, args.operators, args.round_type, args.seed)
+                 for years in args.years]
+        results = run_benchmarks(specs, args.repeat, args.regenerate,
+                                 on_progress=lambda message: print(message, flush=True))
+        path = save_results(results, args.output)
+    except (sqlite3.Error, OSError, ValueError, RuntimeError) as e:
+        print(f"Benchmark error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print("\n".join(format_results(results)))
+    if baseline:
+        print("\n".join(compare_results(baseline, results)))
+    print(f"Results saved to {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Synthetic round history for Operator Rounds Tracking.
+
+Generates a database shaped like years of production use, for the
+benchmark suite (benchmarks/suite.py) and for trying queries at scale:
+one round per shift per day, each covering every unit of a round sheet in
+ROUND_TEMPLATES with a fixed number of sections and items per unit.
+
+ROUND_TEMPLATES only names the units of a sheet; their sections and items
+are filled in at runtime by the operators. The generator therefore invents
+a stable catalog of section and item names per unit, so that the same item
+recurs round after round the way real readings do.
+
+The distributions follow what the production data looks like rather than
+being uniform:
+
+- a few operators walk most of the rounds (Zipf-weighted);
+- most controllers are in Auto, some in Manual or Cascade, and items
+  without a controller have no mode or output at all;
+- values drift slowly around a per-item set point, and a small share of
+  readings are left blank.
+
+Readings are written through BulkLoader (database/bulk_load.py), the same
+path as the CSV importer, in chunks so memory use stays flat.
+
+Usage:
+    python -m operator_rounds.benchmarks.synthetic_data DATABASE
+        [--years N] [--sections N] [--items N] [--operators N] [--seed N]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from operator_rounds.config import DATABASE, DEFAULTS, ROUND_TEMPLATES
+from operator_rounds.database.bulk_load import BULK_LOAD_COLUMNS, BulkLoader
+from operator_rounds.database.models import normalize_key
+from operator_rounds.database.schema import ensure_schema
+from operator_rounds.database.timeutils import local_midnight_epoch, local_today
+
+SECTION_NAMES = ["Feed", "Reactor", "Fractionation", "Compressor", "Utilities", "Analyzers"]
+ITEM_KINDS = [("TI", "Temperature"), ("PI", "Pressure"), ("FIC", "Flow"), ("LIC", "Level"), ("AI", "Analyzer")]
+MODES = ["Auto", "Manual", "Cascade"]
+MODE_WEIGHTS = [0.75, 0.15, 0.10]
+SHIFT_START_HOURS = {"Days": 6, "Relief": 12, "Nights": 18}
+CONTROLLED_SHARE = 0.4  # Items with a controller (output and mode)
+BLANK_SHARE = 0.02  # Readings left blank
+CHUNK_ROUNDS = 500  # Rounds generated per DataFrame
+
+class SyntheticSpec(NamedTuple):
+    """The size and shape of a synthetic history."""
+    years: float = 1.0
+    sections: int = 4  # Per unit
+    items: int = 10  # Per section
+    operators: int = 12
+    round_type: str = "Alky Console Round Sheet"
+    seed: int = 0
+
+    @property
+    def days(self) -> int:
+        return max(1, int(round(self.years * 365)))
+
+    @property
+    def rounds(self) -> int:
+        return self.days * len(DEFAULTS["shift_options"])
+
+    @property
+    def items_per_round(self) -> int:
+        return len(get_template_units(self.round_type)) * self.sections * self.items
+
+class GenerationReport(NamedTuple):
+    """The outcome of generate_database()."""
+    path: str
+    rounds: int
+    rows: int
+    elapsed_seconds: float
+
+def get_template_units(round_type: str) -> List[str]:
+    """Return the units of a round sheet, or raise ValueError if it has none."""
+    units = list(ROUND_TEMPLATES.get(round_type, {}).get("units", {}))
+    if not units:
+        raise ValueError(f"Round sheet {round_type!r} has no units in ROUND_TEMPLATES")
+    return units
+
+def build_item_catalog(spec: SyntheticSpec) -> pd.DataFrame:
+    """
+    Return the items of one round, one row per item.
+
+    Item names carry the unit's number and a tag like real instrument tags,
+    e.g. "017-TI101 Temperature" in section "Feed".
+    """
+    rng = np.random.default_rng(spec.seed)
+    records = []
+    for unit in get_template_units(spec.round_type):
+        unit_number = unit.split()[0]
+        for s in range(spec.sections):
+            section = SECTION_NAMES[s % len(SECTION_NAMES)]
+            if s >= len(SECTION_NAMES):
+                section += f" {s // len(SECTION_NAMES) + 1}"
+            for i in range(spec.items):
+                tag, label = ITEM_KINDS[i % len(ITEM_KINDS)]
+                records.append({
+                    "unit": unit,
+                    "section_name": section,
+                    "description": f"{unit_number}-{tag}{s + 1}{i + 1:02d} {label}",
+                })
+
+    catalog = pd.DataFrame(records)
+    catalog["unit_key"] = catalog["unit"].map(normalize_key)
+    catalog["section_key"] = catalog["section_name"].map(normalize_key)
+    catalog["description_key"] = catalog["description"].map(normalize_key)
+    catalog["set_point"] = rng.uniform(5, 500, len(catalog))
+    catalog["controlled"] = rng.random(len(catalog)) < CONTROLLED_SHARE
+    return catalog
+
+def get_operator_names(spec: SyntheticSpec) -> List[str]:
+    """Return the synthetic operator names."""
+    return [f"Operator {n + 1:02d}" for n in range(spec.operators)]
+
+def get_round_epochs(spec: SyntheticSpec, end_day=None) -> pd.DataFrame:
+    """
+    Return the time and shift of every round, oldest first.
+
+    Rounds start within an hour and a half of their shift's start, on local
+    days ending with end_day (default: today).
+    """
+    rng = np.random.default_rng(spec.seed + 1)
+    end_day = end_day or local_today()
+    shifts = DEFAULTS["shift_options"]
+    midnights = [local_midnight_epoch(end_day - timedelta(days=n)) for n in range(spec.days - 1, -1, -1)]
+
+    epochs = np.repeat(np.array(midnights, dtype=np.int64), len(shifts))
+    shift_names = np.tile(np.array(shifts, dtype=object), len(midnights))
+    hours = np.tile(np.array([SHIFT_START_HOURS.get(shift, 0) for shift in shifts]), len(midnights))
+    epochs += hours * 3600 + rng.integers(0, 90 * 60, len(epochs))
+    order = np.argsort(epochs, kind="stable")
+    return pd.DataFrame({"timestamp_utc": epochs[order], "shift": shift_names[order]})
+
+def iter_synthetic_rounds(spec: SyntheticSpec, end_day=None,
+                          chunk_rounds: int = CHUNK_ROUNDS) -> Iterator[pd.DataFrame]:
+    """
+    Yield the synthetic history as BULK_LOAD_COLUMNS DataFrames.
+
+    Each DataFrame holds the readings of up to chunk_rounds whole rounds,
+    oldest first. The same spec always yields the same data for a given
+    end_day.
+    """
+    rng = np.random.default_rng(spec.seed + 2)
+    catalog = build_item_catalog(spec)
+    rounds = get_round_epochs(spec, end_day)
+    operators = np.array(get_operator_names(spec), dtype=object)
+    weights = 1.0 / np.arange(1, len(operators) + 1) ** 1.1
+    weights /= weights.sum()
+
+    n_items = len(catalog)
+    static = {column: np.asarray(catalog[column].values, dtype=object) for column in
+              ("unit", "section_name", "description", "unit_key", "section_key", "description_key")}
+    set_points = catalog["set_point"].values
+    controlled = catalog["controlled"].values
+
+    # Slow drift per item: a random walk over the rounds, one step per round
+    drift = np.zeros(n_items)
+    for start in range(0, len(rounds), chunk_rounds):
+        chunk = rounds.iloc[start:start + chunk_rounds]
+        n_rounds = len(chunk)
+        n_rows = n_rounds * n_items
+        item_index = np.tile(np.arange(n_items), n_rounds)
+
+        steps = rng.normal(0, 0.002, (n_rounds, n_items))
+        walk = drift + np.cumsum(steps, axis=0)
+        drift = walk[-1]
+        noise = rng.normal(0, 0.01, (n_rounds, n_items))
+        values = (set_points * (1 + walk + noise)).ravel()
+
+        value_text = pd.Series(values).round(2).astype(str).to_numpy(dtype=object, copy=True)
+        value_text[rng.random(n_rows) < BLANK_SHARE] = ""
+
+        row_controlled = controlled[item_index]
+        outputs = pd.Series(rng.uniform(0, 100, n_rows)).round(1).astype(str).to_numpy(dtype=object, copy=True)
+        outputs[~row_controlled] = ""
+        modes = rng.choice(np.array(MODES, dtype=object), n_rows, p=MODE_WEIGHTS)
+        modes[~row_controlled] = ""
+
+        round_operators = rng.choice(operators, n_rounds, p=weights)
+        rows = pd.DataFrame({
+            "round_key": np.repeat(np.arange(start, start + n_rounds), n_items).astype(str),
+            "round_type": spec.round_type,
+            "operator_name": np.repeat(round_operators, n_items),
+            "shift": np.repeat(chunk["shift"].values, n_items),
+            "timestamp_utc": np.repeat(chunk["timestamp_utc"].values, n_items),
+            **{column: column_values[item_index] for column, column_values in static.items()},
+            "value": value_text,
+            "output": outputs,
+            "mode": modes,
+        })
+        yield rows[BULK_LOAD_COLUMNS]
+
+@contextmanager
+def using_database(path: str):
+    """Point DATABASE at another file for the duration of the block."""
+    saved = DATABASE["path"], DATABASE["filename"]
+    DATABASE["path"], DATABASE["filename"] = os.path.split(os.path.abspath(path))
+    try:
+        yield
+    finally:
+        DATABASE["path"], DATABASE["filename"] = saved
+
+def generate_database(path: str, spec: SyntheticSpec, batch_rounds: Optional[int] = None,
+                      on_progress=None) -> GenerationReport:
+    """
+    Create (or extend) a database with a synthetic history.
+
+    Rounds already in the file are skipped by the loader, so generating the
+    same spec twice on the same day adds nothing.
+
+    Args:
+        path (str): The database file
+        spec (SyntheticSpec): The size and shape of the history
+        batch_rounds (int, optional): Rounds per transaction; defaults to
+            DATABASE["backfill_batch_rounds"]
+        on_progress (callable, optional): Called with the rounds written so far
+
+    Returns:
+        GenerationReport: Rounds and readings written, and the time taken
+
+    Raises:
+        sqlite3.Error: If the schema cannot be created or a write fails
+    """
+    started = time.perf_counter()
+    rounds = rows = 0
+    with using_database(path):
+        schema_ready, schema_message = ensure_schema()
+        if not schema_ready:
+            raise RuntimeError(schema_message)
+
+        loader = BulkLoader(batch_rounds or DATABASE.get("backfill_batch_rounds", 2000))
+        try:
+            for chunk in iter_synthetic_rounds(spec):
+                for report in loader.load(chunk):
+                    rounds += report.rounds
+                    rows += report.rows
+                if on_progress:
+                    on_progress(rounds)
+        finally:
+            loader.finish()
+
+    return GenerationReport(os.path.abspath(path), rounds, rows, time.perf_counter() - started)
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the SyntheticSpec options to a command line parser."""
+    defaults = SyntheticSpec()
+    parser.add_argument("--sections", type=int, default=defaults.sections, help="Sections per unit")
+    parser.add_argument("--items", type=int, default=defaults.items, help="Items per section")
+    parser.add_argument("--operators", type=int, default=defaults.operators, help="Distinct operators")
+    parser.add_argument("--round-type", default=defaults.round_type, help="Round sheet in ROUND_TEMPLATES")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the generator."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.benchmarks.synthetic_data",
+        description="Fill a database with a synthetic history of rounds."
+    )
+    parser.add_argument("database", help="Database file to create or extend")
+    parser.add_argument("--years", type=float, default=SyntheticSpec().years, help="Years of history")
+    add_spec_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        spec = SyntheticSpec(args.years, args.sections, args.items, args.operators, args.round_type, args.seed)
+        print(f"Generating {spec.rounds} rounds of {spec.items_per_round} readings", flush=True)
+        report = generate_database(args.database, spec,
+                                   on_progress=lambda rounds: print(f"{rounds} rounds", flush=True))
+    except (sqlite3.Error, ValueError, RuntimeError, OSError) as e:
+        print(f"Generation error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"Wrote {report.rounds} rounds, {report.rows} readings to {report.path} "
+          f"in {report.elapsed_seconds:.1f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
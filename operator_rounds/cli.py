@@ -0,0 +1,182 @@
+"""
+Command line interface for Operator Rounds Tracking.
+
+Installed as the ``operator-rounds`` console script, so maintenance,
+exports and imports can run headless (e.g. from cron) without the
+Streamlit app. Every command uses the same connection manager and query
+code as the app, against the database configured in config.py.
+
+Usage:
+    operator-rounds export [--start DATE] [--end DATE] [--round-type TYPE]
+                           [--operator NAME] [--unit UNIT] [--layout LAYOUT]
+    operator-rounds export-parquet [--full]
+    operator-rounds import [FILE ...]
+    operator-rounds backfill [PATH ...] [--workers N]
+    operator-rounds vacuum-analyze [--no-vacuum] [--no-analyze]
+    operator-rounds migrate {status,apply,check} [--target VERSION]
+    operator-rounds rebuild-caches
+    operator-rounds retention [--days N] [--dry-run]
+    operator-rounds plan-check
+    operator-rounds stats [--json]
+    operator-rounds generate-data DATABASE [--years N]
+    operator-rounds benchmark [--years N [N ...]] [--compare BASELINE]
+    operator-rounds load-test [--sessions N] [--mode {data,app}]
+
+Commands with a module of their own (import, backfill, export-parquet,
+migrate, retention, plan-check, generate-data, benchmark, load-test) pass their arguments through to it; run
+them with --help for their options.
+"""
+import argparse
+import importlib
+import json
+import sqlite3
+import sys
+from datetime import date
+from typing import List, Optional
+
+from operator_rounds.database.history import HistoryFilter
+from operator_rounds.database.latest_values import rebuild_latest_item_values
+from operator_rounds.database.maintenance import get_database_stats, vacuum_analyze
+from operator_rounds.database.schema import ensure_schema
+from operator_rounds.database.timeutils import local_date_range, local_midnight_epoch
+from operator_rounds.utils.bulk_export import export_rounds_to_file
+from operator_rounds.utils.pivot_export import PIVOT_LAYOUTS, export_pivot_to_file
+
+# Commands implemented by another module's main(argv)
+DELEGATED_COMMANDS = {
+    "import": ("operator_rounds.utils.csv_import", "Import rounds from CSV files"),
+    "backfill": ("operator_rounds.utils.backfill", "Import an archive of CSV files in parallel, resumably"),
+    "export-parquet": ("operator_rounds.utils.parquet_export", "Append new rounds to the Parquet history"),
+    "migrate": ("operator_rounds.database.migrate", "Inspect or apply schema migrations"),
+    "retention": ("operator_rounds.database.retention", "Delete (and archive) rounds past retention"),
+    "plan-check": ("operator_rounds.database.plan_check", "Check that every query uses an index"),
+    "generate-data": ("operator_rounds.benchmarks.synthetic_data", "Fill a database with synthetic rounds"),
+    "benchmark": ("operator_rounds.benchmarks.suite", "Time the data layer on synthetic databases"),
+    "load-test": ("operator_rounds.benchmarks.load_test", "Simulate concurrent operator sessions"),
+}
+# Delegated commands that must run before (or without) ensure_schema() of
+# the configured database; the benchmark commands use their own files
+SCHEMA_COMMANDS = {"migrate", "plan-check", "generate-data", "benchmark", "load-test"}
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the operator-rounds command."""
+    parser = argparse.ArgumentParser(
+        prog="operator-rounds",
+        description="Headless maintenance, export and import for Operator Rounds Tracking."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export the rounds of a date range to CSV")
+    export_parser.add_argument("--start", type=date.fromisoformat, default=None,
+                               help="First local date (YYYY-MM-DD)")
+    export_parser.add_argument("--end", type=date.fromisoformat, default=None,
+                               help="Last local date (YYYY-MM-DD), inclusive")
+    export_parser.add_argument("--round-type", default=None, help="Only rounds of this round sheet")
+    export_parser.add_argument("--operator", default=None, help="Only rounds of this operator")
+    export_parser.add_argument("--unit", default=None, help="Only readings of this unit")
+    export_parser.add_argument("--layout", choices=PIVOT_LAYOUTS, default="long",
+                               help="long: one row per reading; wide/sparse/auto: one row per round")
+    export_parser.add_argument("--values", choices=["value", "output"], default="value",
+                               help="Reading shown in the cells of a wide export")
+    export_parser.add_argument("--output", default=None, help="File name in PATHS['exports']")
+
+    maintenance_parser = subparsers.add_parser("vacuum-analyze",
+                                               help="Refresh planner statistics and compact the database")
+    maintenance_parser.add_argument("--no-vacuum", action="store_true", help="Only run ANALYZE")
+    maintenance_parser.add_argument("--no-analyze", action="store_true", help="Only run VACUUM")
+
+    subparsers.add_parser("rebuild-caches", help="Rebuild the latest-value tables from round history")
+
+    stats_parser = subparsers.add_parser("stats", help="Print database statistics")
+    stats_parser.add_argument("--json", action="store_true", help="Print as JSON")
+
+    for command, (_, help_text) in DELEGATED_COMMANDS.items():
+        subparsers.add_parser(command, help=help_text, add_help=False)
+
+    return parser
+
+def _export(args: argparse.Namespace) -> int:
+    """Run the export command."""
+    start_utc = end_utc = None
+    if args.start and args.end:
+        start_utc, end_utc = local_date_range(args.start, args.end)
+    elif args.start:
+        start_utc = local_midnight_epoch(args.start)
+    elif args.end:
+        end_utc = local_date_range(args.end, args.end)[1]
+
+    filters = HistoryFilter(start_utc=start_utc, end_utc=end_utc, round_type=args.round_type,
+                            operator=args.operator, unit=args.unit)
+    if args.layout == "long":
+        path, size = export_rounds_to_file(filters, args.output)
+    else:
+        path, size, layout = export_pivot_to_file(filters, args.layout, args.values, args.output)
+        print(f"Layout: {layout}")
+    print(f"Exported {size / 1024:.0f} KiB to {path}")
+    return 0
+
+def _vacuum_analyze(args: argparse.Namespace) -> int:
+    """Run the vacuum-analyze command."""
+    report = vacuum_analyze(vacuum=not args.no_vacuum, analyze=not args.no_analyze)
+    print(f"Database size {report.bytes_before / 1024:.0f} KiB -> {report.bytes_after / 1024:.0f} KiB "
+          f"in {report.elapsed_seconds:.2f} s")
+    return 0
+
+def _rebuild_caches(args: argparse.Namespace) -> int:
+    """Run the rebuild-caches command."""
+    sections, items = rebuild_latest_item_values()
+    print(f"Rebuilt latest values: {sections} sections, {items} items")
+    return 0
+
+def _stats(args: argparse.Namespace) -> int:
+    """Run the stats command."""
+    stats = get_database_stats()
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+
+    print(f"Database: {stats['path']}")
+    print(f"Size: {stats['file_bytes'] / 1024:.0f} KiB (+ {stats['wal_bytes'] / 1024:.0f} KiB WAL), "
+          f"{stats['page_count']} pages of {stats['page_size']} bytes, {stats['free_pages']} free")
+    print(f"Schema version: {stats['schema_version']} (latest {stats['latest_schema_version']})")
+    if stats["first_round"]:
+        print(f"Rounds from {stats['first_round']} to {stats['last_round']}")
+    for table, count in stats["row_counts"].items():
+        print(f"  {table:<24} {count:>10}")
+    return 0
+
+COMMANDS = {
+    "export": _export,
+    "vacuum-analyze": _vacuum_analyze,
+    "rebuild-caches": _rebuild_caches,
+    "stats": _stats,
+}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the operator-rounds console script."""
+    argv = sys.argv[1:] if argv is None else argv
+
+    delegated = argv[0] if argv and argv[0] in DELEGATED_COMMANDS else None
+    args = None if delegated else build_parser().parse_args(argv)
+
+    # The app migrates on start-up, so commands run without it do the same;
+    # the commands in SCHEMA_COMMANDS manage the schema themselves
+    if delegated not in SCHEMA_COMMANDS:
+        schema_ready, schema_message = ensure_schema()
+        if not schema_ready:
+            print(schema_message, file=sys.stderr)
+            return 1
+
+    # Delegated commands parse their own arguments
+    if delegated:
+        module = importlib.import_module(DELEGATED_COMMANDS[delegated][0])
+        return module.main(argv[1:])
+
+    try:
+        return COMMANDS[args.command](args)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"{args.command} error: {str(e)}", file=sys.stderr)
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,30 @@ DATABASE = {
     "backup_interval_days": 7,  # How often to back up the database
     "max_backups": 5,  # Maximum number of backup files to keep
     "foreign_keys": True,  # Whether to enable SQLite foreign key support
+    "journal_mode": "WAL",  # WAL lets readers and the writer work concurrently
+    "synchronous": "NORMAL",  # NORMAL is durable enough under WAL and much faster than FULL
+    "cache_size_kb": 16384,  # Page cache per connection, in KiB
+    "mmap_size": 134217728,  # Bytes of the database file to memory-map (0 disables)
+    "busy_timeout_ms": 5000,  # How long a statement waits on a locked database before failing
+    "pool_size": 4,  # Maximum number of pooled read connections per process
+    "pool_timeout_seconds": 30,  # How long to wait for a free pooled connection
+    "retention_days": 0,  # Rounds older than this many days are purged by the retention job (0 keeps everything)
+    "retention_batch_size": 50,  # Rounds deleted per retention transaction; keeps each write lock short
+    "retention_archive": True,  # Copy purged rounds into the archive database before deleting them
+    "archive_filename": "rounds_archive.db",  # Archive database, created in PATHS["backups"]
+    "query_cache_entries": 256,  # Query results kept by the process-wide query cache
+    "query_cache_ttl_seconds": 300,  # Upper bound on the age of a cached query result
+    "query_cache_max_rows": 10000,  # Results with more rows than this are not cached
+    "export_fetch_rows": 5000,  # Rows fetched per chunk by bulk exports; bounds their memory use
+    "import_batch_rounds": 200,  # Rounds written per transaction by the CSV import
+    "backfill_batch_rounds": 2000,  # Rounds written per transaction by the parallel backfill
+    "backfill_workers": 0,  # Parse processes used by the backfill (0 = one per CPU)
+    "backfill_files_per_task": 50,  # Files parsed and validated together by a backfill worker
+    "query_timing": False,  # Time every statement (see database/query_log.py); also switchable in debug mode
+    "slow_query_ms": 100,  # Timed statements at least this slow are written to PATHS["logs"]/slow_queries.log
+    "slow_query_log_bytes": 1048576,  # Size at which the slow-query log is rotated
+    "slow_query_log_backups": 3,  # Rotated slow-query logs kept
+    "query_timing_max_statements": 500,  # Distinct statements kept in the timing summary
 }
 
 # Get full database path
@@ -35,7 +59,7 @@ def get_database_path() -> str:
 # Feature flags - control which features are enabled
 FEATURES = {
     "export_csv": True,  # Allow exporting rounds to CSV
-    "import_csv": False,  # Allow importing rounds from CSV (future feature)
+    "import_csv": False,  # Allow importing rounds from CSV files in the app
     "advanced_analytics": False,  # Enable advanced analytics dashboard (future feature)
     "user_management": False,  # Enable user roles and permissions (future feature)
     "notifications": False,  # Enable email/SMS notifications (future feature)
@@ -51,6 +75,9 @@ DEFAULTS = {
     "session_expiry_hours": 12,  # Session expiry time in hours
     "date_format": "%Y-%m-%d %H:%M:%S",  # Default date format
     "short_date_format": "%Y-%m-%d",  # Format for dates without time
+    "timezone": "",  # IANA time zone for displayed dates and date filters ("" = server local time)
+    "pivot_max_cells": 2000000,  # Rounds x items above which comparison tables use sparse columns
+    "analytics_export_lag_hours": 12,  # Rounds younger than this may still be recorded and wait for the next Parquet export
 }
 
 # Round types and default units/sections
@@ -122,9 +149,11 @@ SUCCESS_MESSAGES = {
 # Paths configuration
 PATHS = {
     "exports": os.path.join("data", "exports"),
+    "analytics": os.path.join("data", "exports", "parquet"),  # Partitioned Parquet history (see utils/parquet_export.py)
     "imports": os.path.join("data", "imports"),
     "backups": os.path.join("data", "backups"),
     "logs": os.path.join("logs"),
+    "benchmarks": os.path.join("data", "benchmarks"),  # Synthetic databases and results (see benchmarks/suite.py)
 }
 
 # Create directories if they don't exist
@@ -6,25 +6,56 @@ for the operator rounds tracking application.
 """
 
 # Import key components to expose at the package level
-from operator_rounds.database.connection import get_db_connection
-from operator_rounds.database.schema import init_db
-from operator_rounds.database.models import Round, Section, RoundItem, Operator
+from operator_rounds.database.connection import (
+    get_db_connection,
+    get_connection_manager,
+    get_pool_stats,
+    get_data_version
+)
+from operator_rounds.database.query_cache import cached_query, get_query_cache_stats
+from operator_rounds.database.query_log import (
+    get_query_timing_stats,
+    reset_query_timing_stats,
+    set_query_timing
+)
+from operator_rounds.database.schema import init_db, ensure_schema
+from operator_rounds.database.models import Round, Section, RoundItem, Operator, ItemDefinition
+from operator_rounds.database.item_catalog import get_item_definitions
+from operator_rounds.database.history import HistoryFilter, iter_history_rows
+from operator_rounds.database.bulk_load import BulkLoader
+from operator_rounds.database.maintenance import get_database_stats, vacuum_analyze
+from operator_rounds.database.reference_data import (
+    get_round_types,
+    get_operator_names,
+    get_unit_names,
+    get_section_names
+)
 from operator_rounds.database.queries import (
     start_round,
     save_round_section,
     load_last_round_data,
     get_round_by_id,
+    get_rounds_by_ids,
+    get_last_hydration_stats,
     get_operator_rounds,
     get_round_summary_for_period,
     get_all_operators,
-    delete_round
+    delete_round,
+    delete_rounds
 )
 
 # Define what gets imported with "from operator_rounds.database import *"
 __all__ = [
-    'get_db_connection', 'init_db',
-    'Round', 'Section', 'RoundItem', 'Operator',
+    'get_db_connection', 'get_connection_manager', 'get_pool_stats', 'get_data_version',
+    'cached_query', 'get_query_cache_stats',
+    'get_query_timing_stats', 'reset_query_timing_stats', 'set_query_timing',
+    'init_db', 'ensure_schema',
+    'Round', 'Section', 'RoundItem', 'Operator', 'ItemDefinition',
+    'get_item_definitions',
+    'HistoryFilter', 'iter_history_rows', 'BulkLoader',
+    'get_database_stats', 'vacuum_analyze',
+    'get_round_types', 'get_operator_names', 'get_unit_names', 'get_section_names',
     'start_round', 'save_round_section', 'load_last_round_data',
-    'get_round_by_id', 'get_operator_rounds', 'get_round_summary_for_period',
-    'get_all_operators', 'delete_round'
+    'get_round_by_id', 'get_rounds_by_ids', 'get_last_hydration_stats', 'get_operator_rounds', 'get_round_summary_for_period',
+    'get_all_operators', 'delete_round', 'delete_rounds'
 ]
\ No newline at end of file
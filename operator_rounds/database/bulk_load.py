@@ -0,0 +1,212 @@
+"""
+Bulk loading of historical rounds for Operator Rounds Tracking.
+
+The CSV importer (utils/csv_import.py) hands validated readings to a
+BulkLoader, which writes them in transactions of
+DATABASE["import_batch_rounds"] rounds:
+
+- operators and item definitions are resolved through in-memory lookup
+  maps loaded once, so only names never seen before touch the database;
+- rounds and sections get explicit ids allocated under the batch's write
+  lock, so that rounds, sections and readings are each inserted with one
+  executemany instead of a statement per row;
+- rounds already in the database (same round type, operator, shift and
+  time) are skipped, which makes re-running an import safe. The shift
+  keeps apart different rounds of one day imported with date-only
+  timestamps.
+
+Imported readings keep the time of their round. Because historical rounds
+usually predate the newest ones, the latest-value tables are rebuilt once
+after an import (see finish()) rather than updated per section.
+"""
+import sqlite3
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from operator_rounds.config import DATABASE
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.item_catalog import ensure_item_definitions
+from operator_rounds.database.latest_values import rebuild_latest_item_values
+from operator_rounds.database.queries import INSERT_OPERATOR_SQL
+
+# Columns of the DataFrame passed to BulkLoader.load. round_key groups the
+# readings of one round and only has to be unique within the import.
+BULK_LOAD_COLUMNS = [
+    "round_key", "round_type", "operator_name", "shift", "timestamp_utc",
+    "unit", "section_name", "description", "value", "output", "mode",
+    "unit_key", "section_key", "description_key",
+]
+
+SELECT_OPERATOR_IDS_SQL = 'SELECT name, id FROM operators'
+SELECT_DEFINITION_IDS_SQL = 'SELECT unit_key, section_key, description_key, id FROM item_definitions'
+SELECT_EXISTING_ROUNDS_SQL = '''
+    SELECT r.round_type, o.name, r.shift, r.timestamp_utc
+    FROM rounds r
+    JOIN operators o ON r.operator_id = o.id
+    WHERE r.timestamp_utc >= ? AND r.timestamp_utc <= ?
+'''
+SELECT_MAX_ROUND_ID_SQL = 'SELECT COALESCE(MAX(id), 0) FROM rounds'
+SELECT_MAX_SECTION_ID_SQL = 'SELECT COALESCE(MAX(id), 0) FROM sections'
+INSERT_IMPORTED_ROUND_SQL = '''
+    INSERT INTO rounds (id, round_type, operator_id, shift, timestamp, timestamp_utc)
+    VALUES (?, ?, ?, ?, datetime(?, 'unixepoch'), ?)
+'''
+INSERT_IMPORTED_SECTION_SQL = '''
+    INSERT INTO sections (id, round_id, unit, section_name, unit_key, section_key)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+INSERT_IMPORTED_ITEM_SQL = '''
+    INSERT INTO round_items
+    (section_id, item_definition_id, description, value, output, mode, timestamp, timestamp_utc)
+    VALUES (?, ?, ?, ?, ?, ?, datetime(?, 'unixepoch'), ?)
+'''
+
+class LoadReport(NamedTuple):
+    """The outcome of one bulk-load transaction."""
+    rounds: int
+    rounds_skipped: int
+    rows: int
+    elapsed_seconds: float
+
+class BulkLoader:
+    """Writes validated readings to the database in batched transactions."""
+
+    def __init__(self, batch_rounds: Optional[int] = None):
+        self.batch_rounds = batch_rounds or DATABASE.get("import_batch_rounds", 200)
+        self._operator_ids: Optional[Dict[str, int]] = None
+        self._definition_ids: Optional[Dict[Tuple[str, str, str], int]] = None
+        self.rounds_loaded = 0
+
+    def _load_lookup_maps(self, c: sqlite3.Cursor) -> None:
+        """Read every operator and item definition id once."""
+        c.execute(SELECT_OPERATOR_IDS_SQL)
+        self._operator_ids = dict(c.fetchall())
+        c.execute(SELECT_DEFINITION_IDS_SQL)
+        self._definition_ids = {tuple(row[:3]): row[3] for row in c.fetchall()}
+
+    def load(self, rows: pd.DataFrame) -> List[LoadReport]:
+        """
+        Write readings, one transaction per batch of rounds.
+
+        Args:
+            rows (pd.DataFrame): Validated readings with BULK_LOAD_COLUMNS,
+                the readings of each round adjacent
+
+        Returns:
+            List[LoadReport]: One report per committed batch
+
+        Raises:
+            sqlite3.Error: If a batch fails; earlier batches stay committed
+        """
+        if rows.empty:
+            return []
+
+        round_numbers = pd.factorize(rows["round_key"])[0]
+        reports = []
+        for start in range(0, round_numbers.max() + 1, self.batch_rounds):
+            in_batch = (round_numbers >= start) & (round_numbers < start + self.batch_rounds)
+            reports.append(self._load_batch(rows[in_batch]))
+        return reports
+
+    def _load_batch(self, rows: pd.DataFrame) -> LoadReport:
+        """Write the readings of one batch of rounds in a single transaction."""
+        started = time.perf_counter()
+
+        with get_db_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                c = conn.cursor()
+                if self._operator_ids is None:
+                    self._load_lookup_maps(c)
+                new_operators, new_definitions = {}, {}
+
+                rounds = rows.drop_duplicates("round_key")
+                candidates = len(rounds)
+
+                # Skip rounds that are already stored, or repeated in this batch
+                c.execute(SELECT_EXISTING_ROUNDS_SQL, (
+                    int(rounds["timestamp_utc"].min()), int(rounds["timestamp_utc"].max())
+                ))
+                existing = set(c.fetchall())
+                round_identity = list(zip(rounds["round_type"], rounds["operator_name"], rounds["shift"],
+                                          rounds["timestamp_utc"].astype(int)))
+                rounds = rounds[[identity not in existing for identity in round_identity]]
+                rounds = rounds.drop_duplicates(["round_type", "operator_name", "shift", "timestamp_utc"])
+                rows = rows[rows["round_key"].isin(rounds["round_key"])]
+
+                if rounds.empty:
+                    conn.rollback()
+                    return LoadReport(0, candidates, 0, time.perf_counter() - started)
+
+                # Operators never seen before
+                for name in rounds["operator_name"].unique():
+                    if name not in self._operator_ids and name not in new_operators:
+                        c.execute(INSERT_OPERATOR_SQL, (name,))
+                        new_operators[name] = c.lastrowid
+                operator_ids = {**self._operator_ids, **new_operators}
+
+                # Catalog entries never seen before, one call per section
+                definition_keys = list(zip(rows["unit_key"], rows["section_key"], rows["description_key"]))
+                unknown = rows[[key not in self._definition_ids for key in definition_keys]]
+                for (_, _), items in unknown.groupby(["unit_key", "section_key"], sort=False):
+                    first = items.iloc[0]
+                    ids = ensure_item_definitions(
+                        c, first["unit"], first["section_name"],
+                        items.drop_duplicates("description_key").to_dict("records")
+                    )
+                    for description_key, definition_id in ids.items():
+                        new_definitions[(first["unit_key"], first["section_key"], description_key)] = definition_id
+                definition_ids = {**self._definition_ids, **new_definitions}
+
+                # Ids are allocated under the write lock this transaction holds
+                c.execute(SELECT_MAX_ROUND_ID_SQL)
+                next_round_id = c.fetchone()[0] + 1
+                round_ids = dict(zip(rounds["round_key"], range(next_round_id, next_round_id + len(rounds))))
+                c.executemany(INSERT_IMPORTED_ROUND_SQL, [
+                    (round_ids[key], round_type, operator_ids[operator], shift, int(epoch), int(epoch))
+                    for key, round_type, operator, shift, epoch in zip(
+                        rounds["round_key"], rounds["round_type"], rounds["operator_name"],
+                        rounds["shift"], rounds["timestamp_utc"])
+                ])
+
+                sections = rows.drop_duplicates(["round_key", "unit_key", "section_key"])
+                c.execute(SELECT_MAX_SECTION_ID_SQL)
+                next_section_id = c.fetchone()[0] + 1
+                section_ids = dict(zip(
+                    zip(sections["round_key"], sections["unit_key"], sections["section_key"]),
+                    range(next_section_id, next_section_id + len(sections))
+                ))
+                c.executemany(INSERT_IMPORTED_SECTION_SQL, [
+                    (section_ids[(key, unit_key, section_key)], round_ids[key], unit, section, unit_key, section_key)
+                    for key, unit, section, unit_key, section_key in zip(
+                        sections["round_key"], sections["unit"], sections["section_name"],
+                        sections["unit_key"], sections["section_key"])
+                ])
+
+                c.executemany(INSERT_IMPORTED_ITEM_SQL, [
+                    (section_ids[(key, unit_key, section_key)],
+                     definition_ids[(unit_key, section_key, description_key)],
+                     description, value, output, mode, int(epoch), int(epoch))
+                    for key, unit_key, section_key, description_key, description, value, output, mode, epoch in zip(
+                        rows["round_key"], rows["unit_key"], rows["section_key"], rows["description_key"],
+                        rows["description"], rows["value"], rows["output"], rows["mode"], rows["timestamp_utc"])
+                ])
+
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        # Only ids from committed transactions enter the lookup maps
+        self._operator_ids.update(new_operators)
+        self._definition_ids.update(new_definitions)
+        self.rounds_loaded += len(rounds)
+
+        return LoadReport(len(rounds), candidates - len(rounds), len(rows), time.perf_counter() - started)
+
+    def finish(self) -> None:
+        """Rebuild the latest-value tables if any rounds were loaded."""
+        if self.rounds_loaded:
+            rebuild_latest_item_values()
@@ -1,19 +1,402 @@
-"""Database connection management for Operator Rounds Tracking."""
+"""
+Database connection management for Operator Rounds Tracking.
+
+Connections are handed out by a process-wide ConnectionManager instead of
+being opened on every call. Each manager owns one database file and keeps:
+
+- a small pool of read connections (opened with ``query_only``), and
+- a single write connection guarded by a lock, so that writers inside this
+  process queue up instead of fighting over SQLite's write lock.
+
+All connections are opened in WAL mode with the pragmas configured in
+``config.DATABASE``, as TimedConnections so that their statements can be
+timed (see query_log.py).
+
+The manager also versions the data so that results computed from it can be
+cached: every table written through the write connection gets its version
+bumped when the connection is released, and commits from other processes
+are detected through ``PRAGMA data_version``.
+"""
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
+from queue import LifoQueue, Empty
+from typing import Dict, Any, Iterable, Iterator, Optional, Set, Tuple
+
+from operator_rounds.config import DATABASE, get_database_path
+from operator_rounds.database.query_log import TimedConnection
+
+
+# Authorizer actions that modify a table, and ones that change the schema
+_WRITE_ACTIONS = {sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE}
+_SCHEMA_ACTIONS = {
+    sqlite3.SQLITE_ALTER_TABLE, sqlite3.SQLITE_CREATE_INDEX, sqlite3.SQLITE_CREATE_TABLE,
+    sqlite3.SQLITE_DROP_INDEX, sqlite3.SQLITE_DROP_TABLE,
+}
+
+# Table name standing for "every table" in write tracking
+ALL_TABLES = "*"
+
+
+class ConnectionManager:
+    """Pool of reusable SQLite connections for a single database file."""
+
+    def __init__(self, database_path: str, pool_size: Optional[int] = None):
+        self.database_path = database_path
+        self.pool_size = pool_size or DATABASE.get("pool_size", 4)
+        self.pool_timeout = DATABASE.get("pool_timeout_seconds", 30)
+
+        self._idle_readers = LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(self.pool_size)
+        self._writer = None
+        self._writer_lock = threading.RLock()
+        self._writer_depth = 0
+        self._writer_changes = 0
+        self._write_version = 0
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+        self._seen_data_version = None
+        self._external_version = 0
+        self._written_tables: Set[str] = set()
+        self._table_versions: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "connections_created": 0,
+            "connections_discarded": 0,
+            "read_checkouts": 0,
+            "write_checkouts": 0,
+            "readers_in_use": 0,
+            "checkout_waits": 0,
+            "checkout_wait_seconds": 0.0,
+            "max_checkout_wait_seconds": 0.0,
+        }
+
+    def _open_connection(self, readonly: bool) -> sqlite3.Connection:
+        """Open a new connection and apply the configured pragmas."""
+        busy_timeout_ms = DATABASE.get("busy_timeout_ms", 5000)
+        conn = sqlite3.connect(
+            self.database_path,
+            timeout=busy_timeout_ms / 1000,
+            check_same_thread=False,  # Pooled connections move between Streamlit threads
+            # The authorizer that records written tables only sees statements
+            # as they are prepared, so the writer must not reuse them
+            cached_statements=128 if readonly else 0,
+            factory=TimedConnection
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        if DATABASE.get("journal_mode"):
+            conn.execute(f"PRAGMA journal_mode = {DATABASE['journal_mode']}")
+        conn.execute(f"PRAGMA synchronous = {DATABASE.get('synchronous', 'NORMAL')}")
+        conn.execute(f"PRAGMA cache_size = -{int(DATABASE.get('cache_size_kb', 2000))}")
+        conn.execute(f"PRAGMA mmap_size = {int(DATABASE.get('mmap_size', 0))}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA foreign_keys = {1 if DATABASE.get('foreign_keys', True) else 0}")
+        if readonly:
+            conn.execute("PRAGMA query_only = 1")
+        else:
+            conn.set_authorizer(self._record_write)
+
+        with self._stats_lock:
+            self._stats["connections_created"] += 1
+        return conn
+
+    def _record_write(self, action: int, arg1: Optional[str], arg2: Optional[str],
+                      database: Optional[str], source: Optional[str]) -> int:
+        """Authorizer for the write connection: note every main-database table a statement writes."""
+        if database == "main":
+            if action in _WRITE_ACTIONS:
+                self._written_tables.add(arg1)
+            elif action in _SCHEMA_ACTIONS:
+                self._written_tables.add(ALL_TABLES)
+        return sqlite3.SQLITE_OK
+
+    def _record_wait(self, waited: float) -> float:
+        """Record how long a caller waited for a connection, and return the wait."""
+        with self._stats_lock:
+            if waited > 0.001:
+                self._stats["checkout_waits"] += 1
+            self._stats["checkout_wait_seconds"] += waited
+            self._stats["max_checkout_wait_seconds"] = max(
+                self._stats["max_checkout_wait_seconds"], waited
+            )
+        return waited
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection that can no longer be reused."""
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._stats_lock:
+            self._stats["connections_discarded"] += 1
+
+    @staticmethod
+    def _reset(conn: sqlite3.Connection) -> bool:
+        """Roll back anything a caller left open. Returns False if the connection is unusable."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @contextmanager
+    def read_connection(self):
+        """Check out a pooled read-only connection."""
+        started = time.perf_counter()
+        if not self._reader_slots.acquire(timeout=self.pool_timeout):
+            self._record_wait(time.perf_counter() - started)
+            raise sqlite3.OperationalError("Timed out waiting for a database connection")
+        waited = self._record_wait(time.perf_counter() - started)
+
+        conn = None
+        try:
+            try:
+                conn = self._idle_readers.get_nowait()
+            except Empty:
+                conn = self._open_connection(readonly=True)
+            conn.set_lock_wait(waited)
+
+            with self._stats_lock:
+                self._stats["read_checkouts"] += 1
+                self._stats["readers_in_use"] += 1
+
+            yield conn
+        finally:
+            if conn is not None:
+                with self._stats_lock:
+                    self._stats["readers_in_use"] -= 1
+                if self._reset(conn):
+                    self._idle_readers.put(conn)
+                else:
+                    self._discard(conn)
+            self._reader_slots.release()
+
+    @contextmanager
+    def write_connection(self):
+        """
+        Check out the write connection.
+
+        Only one thread holds it at a time; the same thread may re-enter,
+        in which case it receives the connection it already holds.
+        """
+        started = time.perf_counter()
+        if not self._writer_lock.acquire(timeout=self.pool_timeout):
+            self._record_wait(time.perf_counter() - started)
+            raise sqlite3.OperationalError("Timed out waiting for the database write connection")
+        waited = self._record_wait(time.perf_counter() - started)
+
+        try:
+            if self._writer is None:
+                self._writer = self._open_connection(readonly=False)
+            if self._writer_depth == 0:
+                self._writer_changes = self._writer.total_changes
+                self._writer.set_lock_wait(waited)
+            self._writer_depth += 1
+            with self._stats_lock:
+                self._stats["write_checkouts"] += 1
+
+            try:
+                yield self._writer
+            finally:
+                self._writer_depth -= 1
+                if self._writer_depth == 0:
+                    # Any change through the writer makes derived data stale
+                    if self._writer.total_changes != self._writer_changes or self._written_tables:
+                        self._bump_versions()
+                    if not self._reset(self._writer):
+                        self._discard(self._writer)
+                        self._writer = None
+        finally:
+            self._writer_lock.release()
+
+    def _bump_versions(self) -> None:
+        """Advance the write version and the version of every table just written."""
+        with self._watcher_lock:
+            self._write_version += 1
+            for table in self._written_tables:
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+            self._written_tables.clear()
+
+            # This commit moved the watcher's data_version too; take it as
+            # seen so that it is not mistaken for another process writing.
+            # A foreign commit landing in the same instant is missed, which
+            # is why caches built on these versions also expire by age.
+            if self._watcher is not None:
+                self._seen_data_version = self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _poll_external_writes(self) -> int:
+        """Check PRAGMA data_version for commits by other connections; caller holds _watcher_lock."""
+        if self._watcher is None:
+            self._watcher = self._open_connection(readonly=True)
+        data_version = self._watcher.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._seen_data_version:
+            if self._seen_data_version is not None:
+                self._external_version += 1
+            self._seen_data_version = data_version
+        return self._external_version
+
+    def get_write_version(self) -> int:
+        """Return a counter that increases whenever this process writes to the database."""
+        return self._write_version
+
+    def get_data_version(self) -> int:
+        """
+        Return a number that changes whenever the database changes.
+
+        Writes made through this manager bump the write version as soon as
+        the write connection is released. Commits from any other connection,
+        including other processes, are caught by PRAGMA data_version on a
+        dedicated idle connection: SQLite changes that value whenever another
+        connection commits.
+        """
+        with self._watcher_lock:
+            # Both counters only grow, so their sum changes when either does
+            return self._write_version + self._poll_external_writes()
+
+    def get_table_versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Return a snapshot of the versions of some tables.
+
+        Two snapshots of the same tables are equal only if none of the tables
+        was written in between. A write by another process counts as a write
+        to every table, as does a schema change; ALL_TABLES stands for any write.
+
+        Args:
+            tables (Iterable[str]): Table names, or ALL_TABLES
+
+        Returns:
+            Tuple[int, ...]: An opaque, comparable snapshot
+        """
+        with self._watcher_lock:
+            external = self._poll_external_writes()
+            return (external, self._table_versions.get(ALL_TABLES, 0)) + tuple(
+                self._write_version if table == ALL_TABLES else self._table_versions.get(table, 0)
+                for table in sorted(tables)
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return a snapshot of pool statistics."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            "database_path": self.database_path,
+            "pool_size": self.pool_size,
+            "readers_idle": self._idle_readers.qsize(),
+            "writer_open": self._writer is not None,
+            "writer_in_use": self._writer_depth > 0,
+            "write_version": self._write_version,
+            "external_writes_seen": self._external_version,
+        })
+        return stats
+
+    def close_all(self) -> None:
+        """Close every idle connection held by this manager."""
+        while True:
+            try:
+                self._discard(self._idle_readers.get_nowait())
+            except Empty:
+                break
+        with self._writer_lock:
+            if self._writer is not None:
+                self._discard(self._writer)
+                self._writer = None
+        with self._watcher_lock:
+            if self._watcher is not None:
+                self._discard(self._watcher)
+                self._watcher = None
+                self._seen_data_version = None
+                # Changes made while no connection was watching are unknown
+                self._external_version += 1
+
+
+class StatementCounter:
+    """Counts the SQL statements a connection runs; see count_statements()."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, statement: str) -> None:
+        self.count += 1
+
 
 @contextmanager
-def get_db_connection():
-    """Context manager for database connections with improved error handling"""
-    conn = None
+def count_statements(conn: sqlite3.Connection) -> Iterator[StatementCounter]:
+    """
+    Count the statements executed on a connection inside the block.
+
+    Uses SQLite's trace callback, so every statement the connection runs is
+    counted, including ones issued by helpers the caller did not write.
+
+    Yields:
+        StatementCounter: Its ``count`` is the number of statements run so far
+    """
+    counter = StatementCounter()
+    conn.set_trace_callback(counter)
     try:
-        conn = sqlite3.connect('rounds.db')
-        conn.execute("PRAGMA foreign_keys = 1")  # Enable foreign key support
-        yield conn
-    except sqlite3.Error as e:
-        if conn:
-            conn.close()
-        raise e
+        yield counter
     finally:
-        if conn:
-            conn.close()
\ No newline at end of file
+        conn.set_trace_callback(None)
+
+
+_managers: Dict[str, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+def get_connection_manager(database_path: Optional[str] = None) -> ConnectionManager:
+    """
+    Return the process-wide connection manager for a database file.
+
+    Args:
+        database_path (str, optional): Database file; defaults to config.get_database_path()
+
+    Returns:
+        ConnectionManager: The shared manager for that file
+    """
+    database_path = database_path or get_database_path()
+    with _managers_lock:
+        manager = _managers.get(database_path)
+        if manager is None:
+            manager = ConnectionManager(database_path)
+            _managers[database_path] = manager
+        return manager
+
+@contextmanager
+def get_db_connection(readonly: bool = False):
+    """
+    Context manager for pooled database connections.
+
+    Args:
+        readonly (bool): Hand out a read-only connection from the reader pool
+            instead of the shared write connection
+
+    Yields:
+        sqlite3.Connection: A connection that is returned to the pool on exit
+    """
+    manager = get_connection_manager()
+    if readonly:
+        with manager.read_connection() as conn:
+            yield conn
+    else:
+        with manager.write_connection() as conn:
+            yield conn
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return statistics for the connection pool of the configured database."""
+    return get_connection_manager().get_stats()
+
+def get_data_version() -> int:
+    """
+    Return a version number for the data in the configured database.
+
+    It changes whenever the data changes, in this process or another one,
+    so results computed from the database can be memoized against it.
+    """
+    return get_connection_manager().get_data_version()
+
+def close_all_connections() -> None:
+    """Close all pooled connections for every database opened by this process."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.close_all()
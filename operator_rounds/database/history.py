@@ -0,0 +1,147 @@
+"""
+Round history reads for bulk exports of Operator Rounds Tracking.
+
+Bulk exports cover any number of rounds, so the flat round/section/reading
+rows are never materialized as a whole: iter_history_rows() keeps one read
+connection for the duration of the export and pulls rows from the cursor in
+chunks of DATABASE["export_fetch_rows"], holding at most one chunk in memory.
+
+Rows come back ordered by round (oldest first) and, within a round, by
+unit, section and reading, so a consumer can stream them straight out.
+"""
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from operator_rounds.config import DATABASE
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.models import normalize_key
+
+# CROSS JOIN fixes the join order: rounds drive the loop in ORDER BY order,
+# so only the rows of one round at a time are sorted. Left to choose, a
+# planner without ANALYZE statistics walks every reading and sorts the
+# whole result before the first row comes back.
+SELECT_HISTORY_SQL = '''
+    SELECT
+        r.id, r.round_type, o.name, r.shift, r.timestamp_utc,
+        s.unit, s.section_name,
+        ri.description, ri.value, ri.output, ri.mode
+    FROM rounds r
+    CROSS JOIN operators o ON r.operator_id = o.id
+    CROSS JOIN sections s ON s.round_id = r.id
+    CROSS JOIN round_items ri ON ri.section_id = s.id
+    {where}
+    ORDER BY r.timestamp_utc, r.id, s.unit_key, s.section_key, ri.id
+'''
+
+# The first round after a given id that started at or after a cutoff, and
+# the newest round; see get_settled_round_id
+SELECT_FIRST_UNSETTLED_ROUND_SQL = 'SELECT MIN(id) FROM rounds WHERE id > ? AND timestamp_utc >= ?'
+SELECT_LAST_ROUND_ID_SQL = 'SELECT COALESCE(MAX(id), 0) FROM rounds'
+
+# Column names of the rows returned by iter_history_rows
+HISTORY_COLUMNS = [
+    "round_id", "round_type", "operator_name", "shift", "timestamp_utc",
+    "unit", "section_name", "description", "value", "output", "mode",
+]
+
+class HistoryFilter(NamedTuple):
+    """Which rounds a bulk export covers; None means no restriction."""
+    start_utc: Optional[int] = None  # Inclusive
+    end_utc: Optional[int] = None  # Exclusive
+    round_type: Optional[str] = None
+    operator: Optional[str] = None
+    unit: Optional[str] = None  # Only readings of this unit
+    # Only rounds with after_id < id <= through_id, for incremental exports
+    after_id: Optional[int] = None
+    through_id: Optional[int] = None
+
+def build_history_query(filters: HistoryFilter) -> Tuple[str, List]:
+    """
+    Build the history query for a filter.
+
+    Returns:
+        Tuple[str, List]: (query_string, parameters)
+    """
+    where_clauses = []
+    params = []
+
+    if filters.start_utc is not None:
+        where_clauses.append("r.timestamp_utc >= ?")
+        params.append(filters.start_utc)
+    if filters.end_utc is not None:
+        where_clauses.append("r.timestamp_utc < ?")
+        params.append(filters.end_utc)
+    if filters.round_type:
+        where_clauses.append("r.round_type = ?")
+        params.append(filters.round_type)
+    if filters.operator:
+        where_clauses.append("o.name = ?")
+        params.append(filters.operator)
+    if filters.unit:
+        where_clauses.append("s.unit_key = ?")
+        params.append(normalize_key(filters.unit))
+    # Unary + keeps the rowid out of the plan, so rounds are still read in
+    # timestamp order rather than sorted
+    if filters.after_id is not None:
+        where_clauses.append("+r.id > ?")
+        params.append(filters.after_id)
+    if filters.through_id is not None:
+        where_clauses.append("+r.id <= ?")
+        params.append(filters.through_id)
+
+    where = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+    return SELECT_HISTORY_SQL.format(where=where), params
+
+def get_settled_round_id(after_id: Optional[int], cutoff_utc: int) -> int:
+    """
+    Return the id up to which an incremental export can safely go.
+
+    Round ids only grow as rounds are inserted, including imported rounds
+    with a historical time. The export covers every round after after_id
+    and stops short of the first one that started at or after cutoff_utc,
+    which may still be being recorded.
+
+    Args:
+        after_id (int, optional): The last round already exported
+        cutoff_utc (int): Rounds started at or after this UTC epoch are not settled
+
+    Returns:
+        int: The highest settled round id; after_id (or 0) if there is none
+
+    Raises:
+        sqlite3.Error: If the query fails
+    """
+    after_id = after_id or 0
+    with get_db_connection(readonly=True) as conn:
+        first_unsettled = conn.execute(SELECT_FIRST_UNSETTLED_ROUND_SQL, (after_id, cutoff_utc)).fetchone()[0]
+        if first_unsettled is not None:
+            return first_unsettled - 1
+        return max(after_id, conn.execute(SELECT_LAST_ROUND_ID_SQL).fetchone()[0])
+
+def iter_history_rows(filters: HistoryFilter, fetch_rows: Optional[int] = None) -> Iterator[List[Tuple]]:
+    """
+    Yield the history rows matching a filter in chunks.
+
+    The read connection is held until the generator is exhausted or closed,
+    so callers should consume it promptly.
+
+    Args:
+        filters (HistoryFilter): Which rounds and readings to read
+        fetch_rows (int, optional): Rows per chunk; defaults to DATABASE["export_fetch_rows"]
+
+    Yields:
+        List[Tuple]: Up to fetch_rows rows, with the columns in HISTORY_COLUMNS
+
+    Raises:
+        sqlite3.Error: If the query fails
+    """
+    fetch_rows = fetch_rows or DATABASE.get("export_fetch_rows", 5000)
+    sql, params = build_history_query(filters)
+
+    with get_db_connection(readonly=True) as conn:
+        c = conn.cursor()
+        c.execute(sql, params)
+        while True:
+            rows = c.fetchmany(fetch_rows)
+            if not rows:
+                break
+            yield rows
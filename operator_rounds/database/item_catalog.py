@@ -0,0 +1,162 @@
+"""
+Item-definition catalog for Operator Rounds Tracking.
+
+Every item that readings are recorded against (unit, section, description,
+default mode and display order) has one row in item_definitions, and each
+round_items row references it through item_definition_id. Renaming or
+removing an item is therefore a single catalog change: readings already
+recorded keep the description they were taken under.
+
+Units, sections and descriptions are matched through their normalize_key()
+columns, so lookups are case- and whitespace-insensitive and indexed.
+"""
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.models import ItemDefinition, normalize_key
+
+# New definitions go to the end of their section. Recording a reading
+# against a retired definition brings it back.
+UPSERT_ITEM_DEFINITION_SQL = '''
+    INSERT INTO item_definitions
+    (unit, section_name, description, default_mode, sort_order, unit_key, section_key, description_key)
+    SELECT ?, ?, ?, ?, COALESCE(MAX(sort_order), 0) + 1, ?, ?, ?
+    FROM item_definitions
+    WHERE unit_key = ? AND section_key = ?
+    ON CONFLICT (unit_key, section_key, description_key) DO UPDATE SET active = 1
+    WHERE active = 0
+'''
+
+SELECT_SECTION_DEFINITION_IDS_SQL = '''
+    SELECT id, description_key FROM item_definitions
+    WHERE unit_key = ? AND section_key = ?
+'''
+
+SELECT_ITEM_DEFINITION_ID_SQL = '''
+    SELECT id FROM item_definitions
+    WHERE unit_key = ? AND section_key = ? AND description_key = ?
+'''
+
+RENAME_ITEM_DEFINITION_SQL = '''
+    UPDATE item_definitions
+    SET description = ?, description_key = ?, default_mode = ?
+    WHERE unit_key = ? AND section_key = ? AND description_key = ?
+'''
+
+RETIRE_ITEM_DEFINITION_SQL = '''
+    UPDATE item_definitions
+    SET active = 0
+    WHERE unit_key = ? AND section_key = ? AND description_key = ? AND active = 1
+'''
+
+SELECT_ITEM_DEFINITIONS_SQL = '''
+    SELECT id, unit, section_name, description, default_mode, sort_order, active
+    FROM item_definitions
+    WHERE unit_key = ? AND section_key = ?
+    ORDER BY sort_order, id
+'''
+
+def ensure_item_definitions(c: sqlite3.Cursor, unit: str, section_name: str,
+                            items: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Make sure every item has an active catalog entry.
+
+    Must run inside the caller's write transaction.
+
+    Args:
+        c (sqlite3.Cursor): Cursor inside the caller's transaction
+        unit (str): The unit name
+        section_name (str): The section name
+        items (Iterable[Dict[str, Any]]): Items with description and optional mode
+
+    Returns:
+        Dict[str, int]: Definition ids of the section keyed by normalize_key(description)
+    """
+    unit = unit.strip()
+    section_name = section_name.strip()
+    unit_key = normalize_key(unit)
+    section_key = normalize_key(section_name)
+
+    c.executemany(UPSERT_ITEM_DEFINITION_SQL, [
+        (unit, section_name, item["description"].strip(), (item.get("mode") or "").strip(),
+         unit_key, section_key, normalize_key(item["description"]),
+         unit_key, section_key)
+        for item in items
+        if normalize_key(item.get("description"))
+    ])
+
+    c.execute(SELECT_SECTION_DEFINITION_IDS_SQL, (unit_key, section_key))
+    return {description_key: definition_id for definition_id, description_key in c.fetchall()}
+
+def find_item_definition_id(c: sqlite3.Cursor, unit: str, section_name: str, description: str) -> Optional[int]:
+    """Return the id of an item's catalog entry, or None if it has none."""
+    c.execute(SELECT_ITEM_DEFINITION_ID_SQL, (
+        normalize_key(unit), normalize_key(section_name), normalize_key(description)
+    ))
+    row = c.fetchone()
+    return row[0] if row else None
+
+def rename_item_definition(c: sqlite3.Cursor, unit: str, section_name: str, original_description: str,
+                           new_description: str, default_mode: str = "") -> bool:
+    """
+    Rename an item in the catalog. Recorded readings are left untouched.
+
+    Raises:
+        sqlite3.IntegrityError: If the section already has an item with the new description
+
+    Returns:
+        bool: True if the item was found
+    """
+    c.execute(RENAME_ITEM_DEFINITION_SQL, (
+        new_description.strip(), normalize_key(new_description), (default_mode or "").strip(),
+        normalize_key(unit), normalize_key(section_name), normalize_key(original_description)
+    ))
+    return c.rowcount > 0
+
+def retire_item_definition(c: sqlite3.Cursor, unit: str, section_name: str, description: str) -> bool:
+    """
+    Remove an item from future rounds. Recorded readings are left untouched.
+
+    Returns:
+        bool: True if an active item was found
+    """
+    c.execute(RETIRE_ITEM_DEFINITION_SQL, (
+        normalize_key(unit), normalize_key(section_name), normalize_key(description)
+    ))
+    return c.rowcount > 0
+
+def get_item_definitions(unit: str, section_name: str, include_retired: bool = False) -> List[ItemDefinition]:
+    """
+    Get the catalog entries of a section in display order.
+
+    Args:
+        unit (str): The unit name
+        section_name (str): The section name
+        include_retired (bool): Also return items that have been removed
+
+    Returns:
+        List[ItemDefinition]: The section's item definitions
+
+    Raises:
+        sqlite3.Error: If the catalog could not be read
+    """
+    with get_db_connection(readonly=True) as conn:
+        c = conn.cursor()
+        c.execute(SELECT_ITEM_DEFINITIONS_SQL, (normalize_key(unit), normalize_key(section_name)))
+        definitions = [
+            ItemDefinition(
+                id=row[0],
+                unit=row[1],
+                section_name=row[2],
+                description=row[3],
+                default_mode=row[4] or "",
+                sort_order=row[5],
+                active=bool(row[6])
+            )
+            for row in c.fetchall()
+        ]
+
+    if include_retired:
+        return definitions
+    return [definition for definition in definitions if definition.active]
@@ -0,0 +1,224 @@
+"""
+Materialized "latest value per item" tables for Operator Rounds Tracking.
+
+New sessions prefill every section with the most recent reading of each
+item. Instead of scanning the whole round history for that, two small
+tables are kept up to date by every write path:
+
+- latest_sections: every (round_type, unit, section_name) ever recorded
+- latest_item_values: the newest value/output/mode per
+  (round_type, unit, section_name, description)
+
+Names are matched through their normalize_key() columns.
+
+rebuild_latest_item_values() recreates both from history and the item
+catalog at any time.
+
+Usage:
+    python -m operator_rounds.database.latest_values rebuild
+"""
+import argparse
+import sqlite3
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.models import normalize_key
+
+SELECT_ROUND_TYPE_SQL = 'SELECT round_type FROM rounds WHERE id = ?'
+
+INSERT_LATEST_SECTION_SQL = '''
+    INSERT OR IGNORE INTO latest_sections (round_type, unit, section_name, unit_key, section_key)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+UPSERT_LATEST_ITEM_SQL = '''
+    INSERT INTO latest_item_values
+    (round_type, unit, section_name, description, unit_key, section_key, description_key,
+     value, output, mode, round_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (round_type, unit_key, section_key, description_key) DO UPDATE SET
+        description = excluded.description,
+        value = excluded.value,
+        output = excluded.output,
+        mode = excluded.mode,
+        round_id = excluded.round_id,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+UPDATE_LATEST_ITEM_SQL = '''
+    UPDATE OR REPLACE latest_item_values
+    SET description = ?, description_key = ?, value = ?, output = ?, mode = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE unit_key = ? AND section_key = ? AND description_key = ?
+'''
+
+DELETE_LATEST_ITEM_SQL = '''
+    DELETE FROM latest_item_values
+    WHERE unit_key = ? AND section_key = ? AND description_key = ?
+'''
+
+# Used by load_last_round_data: one ordered read of two small tables
+SELECT_LATEST_ROUND_DATA_SQL = '''
+    SELECT ls.round_type, ls.unit, ls.section_name,
+           li.description, li.value, li.output, li.mode
+    FROM latest_sections ls
+    LEFT JOIN latest_item_values li
+        ON li.round_type = ls.round_type
+        AND li.unit_key = ls.unit_key
+        AND li.section_key = ls.section_key
+    ORDER BY ls.round_type, ls.unit_key, ls.section_key, li.id
+'''
+
+def record_latest_section(c: sqlite3.Cursor, round_type: str, unit: str, section_name: str) -> None:
+    """Register a section so that new sessions show it even before it has items."""
+    c.execute(INSERT_LATEST_SECTION_SQL, (
+        round_type, unit.strip(), section_name.strip(), normalize_key(unit), normalize_key(section_name)
+    ))
+
+def record_latest_items(c: sqlite3.Cursor, round_id: int, unit: str, section_name: str,
+                        items: Iterable[Dict[str, Any]]) -> None:
+    """
+    Store the values just written for a section of a round as the latest ones.
+
+    Must run inside the same transaction as the round_items write.
+
+    Args:
+        c (sqlite3.Cursor): Cursor inside the caller's transaction
+        round_id (int): The round the items were saved to
+        unit (str): The unit name
+        section_name (str): The section name
+        items (Iterable[Dict[str, Any]]): Items with description/value/output/mode
+    """
+    c.execute(SELECT_ROUND_TYPE_SQL, (round_id,))
+    row = c.fetchone()
+    if not row:
+        return
+    round_type = row[0]
+
+    record_latest_section(c, round_type, unit, section_name)
+    c.executemany(UPSERT_LATEST_ITEM_SQL, [
+        (round_type, unit.strip(), section_name.strip(),
+         item["description"].strip(),
+         normalize_key(unit), normalize_key(section_name), normalize_key(item["description"]),
+         (item.get("value") or "").strip(),
+         (item.get("output") or "").strip(),
+         (item.get("mode") or "").strip(),
+         round_id)
+        for item in items
+    ])
+
+def rename_latest_item(c: sqlite3.Cursor, unit: str, section_name: str, original_description: str,
+                       item: Dict[str, Any]) -> None:
+    """Apply an edit made in the section editor to the latest values."""
+    c.execute(UPDATE_LATEST_ITEM_SQL, (
+        item["description"].strip(),
+        normalize_key(item["description"]),
+        (item.get("value") or "").strip(),
+        (item.get("output") or "").strip(),
+        (item.get("mode") or "").strip(),
+        normalize_key(unit), normalize_key(section_name), normalize_key(original_description)
+    ))
+
+def delete_latest_item(c: sqlite3.Cursor, unit: str, section_name: str, description: str) -> None:
+    """Remove an item deleted in the section editor from the latest values."""
+    c.execute(DELETE_LATEST_ITEM_SQL, (normalize_key(unit), normalize_key(section_name), normalize_key(description)))
+
+def load_latest_round_data(c: sqlite3.Cursor) -> List[Tuple]:
+    """
+    Read all known sections with the latest values of their items.
+
+    Returns:
+        List[Tuple]: (round_type, unit, section_name, description, value, output, mode)
+            rows; description is None for sections without items
+    """
+    c.execute(SELECT_LATEST_ROUND_DATA_SQL)
+    return c.fetchall()
+
+def _rebuild(c: sqlite3.Cursor) -> Tuple[int, int]:
+    """Recreate both tables from round history inside the caller's transaction."""
+    c.execute("DELETE FROM latest_item_values")
+    c.execute("DELETE FROM latest_sections")
+
+    # Before migration 8 rounds only have the TEXT timestamp, which sorts
+    # the same way as the epoch backfilled from it
+    c.execute("PRAGMA table_info(rounds)")
+    order_column = "timestamp_utc" if "timestamp_utc" in [info[1] for info in c.fetchall()] else "timestamp"
+
+    c.execute('''
+        INSERT INTO latest_sections (round_type, unit, section_name, unit_key, section_key)
+        SELECT r.round_type, TRIM(MIN(s.unit)), TRIM(MIN(s.section_name)), s.unit_key, s.section_key
+        FROM sections s
+        JOIN rounds r ON s.round_id = r.id
+        GROUP BY r.round_type, s.unit_key, s.section_key
+    ''')
+    section_count = c.rowcount
+
+    # Keep the newest reading per active catalog item, under its current
+    # description, inserted in catalog order so that the rowid gives the
+    # display order
+    c.execute(f'''
+        INSERT INTO latest_item_values
+        (round_type, unit, section_name, description, unit_key, section_key, description_key,
+         value, output, mode, round_id)
+        SELECT round_type, unit, section_name, description, unit_key, section_key, description_key,
+               value, output, mode, round_id
+        FROM (
+            SELECT r.round_type, d.unit, d.section_name, d.description,
+                   d.unit_key, d.section_key, d.description_key, d.sort_order,
+                   ri.value, ri.output, ri.mode, r.id AS round_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY r.round_type, d.id
+                       ORDER BY r.{order_column} DESC, ri.id DESC
+                   ) AS recency
+            FROM round_items ri
+            JOIN item_definitions d ON ri.item_definition_id = d.id
+            JOIN sections s ON ri.section_id = s.id
+            JOIN rounds r ON s.round_id = r.id
+            WHERE d.active = 1
+        )
+        WHERE recency = 1
+        ORDER BY round_type, unit_key, section_key, sort_order
+    ''')
+    item_count = c.rowcount
+
+    return section_count, item_count
+
+def rebuild_latest_item_values() -> Tuple[int, int]:
+    """
+    Recreate latest_sections and latest_item_values from round history.
+
+    Returns:
+        Tuple[int, int]: (sections, items) written
+    """
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            counts = _rebuild(conn.cursor())
+            conn.commit()
+            return counts
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for rebuilding the latest-value tables."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.database.latest_values",
+        description="Maintain the materialized latest-value tables."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild", help="Recreate latest values from round history")
+    parser.parse_args(argv)
+
+    try:
+        sections, items = rebuild_latest_item_values()
+    except sqlite3.Error as e:
+        print(f"Database error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"Rebuilt latest values: {sections} sections, {items} items")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Database maintenance and statistics for Operator Rounds Tracking.
+
+vacuum_analyze() refreshes the planner statistics (ANALYZE), rewrites the
+file without free pages (VACUUM) and truncates the write-ahead log. VACUUM
+briefly takes the write lock and rewrites the whole file, so it belongs in
+a quiet period such as a nightly job; ANALYZE alone is cheap.
+
+get_database_stats() reports sizes, the schema version and row counts for
+monitoring.
+
+Both run through the application's connection manager, so they respect
+the configured pragmas and queue behind other writers in the process.
+"""
+import os
+import time
+from typing import Any, Dict, NamedTuple
+
+from operator_rounds.config import get_database_path
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.schema import SCHEMA_VERSION, get_schema_version
+from operator_rounds.database.timeutils import format_epoch
+
+SELECT_TABLE_NAMES_SQL = '''
+    SELECT name FROM sqlite_master
+    WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+    ORDER BY name
+'''
+SELECT_ROUND_RANGE_SQL = 'SELECT MIN(timestamp_utc), MAX(timestamp_utc) FROM rounds'
+
+class MaintenanceReport(NamedTuple):
+    """The outcome of a vacuum_analyze() run."""
+    bytes_before: int
+    bytes_after: int
+    elapsed_seconds: float
+
+def _file_size(path: str) -> int:
+    """Return the size of a file, or 0 if it does not exist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def get_database_bytes() -> int:
+    """Return the size of the database file plus its write-ahead log."""
+    path = get_database_path()
+    return _file_size(path) + _file_size(path + "-wal")
+
+def vacuum_analyze(vacuum: bool = True, analyze: bool = True) -> MaintenanceReport:
+    """
+    Refresh planner statistics and compact the database file.
+
+    Args:
+        vacuum (bool): Rewrite the file without free pages
+        analyze (bool): Recompute the statistics the query planner uses
+
+    Returns:
+        MaintenanceReport: File sizes before and after, and the time taken
+
+    Raises:
+        sqlite3.Error: If a statement fails, e.g. because the database is busy
+    """
+    started = time.perf_counter()
+    bytes_before = get_database_bytes()
+
+    with get_db_connection() as conn:
+        if analyze:
+            conn.execute("ANALYZE")
+            conn.commit()
+        if vacuum:
+            conn.execute("VACUUM")
+        # Fold the log back into the file so the reported size is its real size
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    return MaintenanceReport(bytes_before, get_database_bytes(), time.perf_counter() - started)
+
+def get_database_stats() -> Dict[str, Any]:
+    """
+    Collect statistics about the configured database.
+
+    Returns:
+        Dict[str, Any]: Path, sizes, page counts, schema version, the time
+            range of the stored rounds and the row count of every table
+
+    Raises:
+        sqlite3.Error: If the database cannot be read
+    """
+    path = get_database_path()
+    with get_db_connection(readonly=True) as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        schema_version = get_schema_version(conn)
+        first_round, last_round = conn.execute(SELECT_ROUND_RANGE_SQL).fetchone()
+        tables = [row[0] for row in conn.execute(SELECT_TABLE_NAMES_SQL)]
+        row_counts = {
+            table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            for table in tables
+        }
+
+    return {
+        "path": path,
+        "file_bytes": _file_size(path),
+        "wal_bytes": _file_size(path + "-wal"),
+        "page_size": page_size,
+        "page_count": page_count,
+        "free_pages": freelist_count,
+        "schema_version": schema_version,
+        "latest_schema_version": SCHEMA_VERSION,
+        "first_round": format_epoch(first_round) if first_round is not None else None,
+        "last_round": format_epoch(last_round) if last_round is not None else None,
+        "row_counts": row_counts,
+    }
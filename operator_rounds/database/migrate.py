@@ -0,0 +1,131 @@
+"""
+Command line interface for database schema migrations.
+
+Usage:
+    python -m operator_rounds.database.migrate status
+    python -m operator_rounds.database.migrate apply [--target VERSION]
+    python -m operator_rounds.database.migrate check
+"""
+import argparse
+import sqlite3
+import sys
+from typing import List, Optional
+
+from operator_rounds.config import get_database_path
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.models import normalize_key
+from operator_rounds.database.schema import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    apply_migrations,
+    get_schema_version
+)
+
+# Readings as earlier versions of the app stored them, for the upgrade
+# check: the unit and section names of a section vary in case and spacing
+# between rounds, and an item can be entered twice in one section.
+CHECK_FROM_VERSION = 4
+CHECK_ROUNDS = [
+    ("017 Alky I", "Pumps", [("P-1", "10"), ("p-1", "11"), ("P-2", "20")]),
+    ("017 alky i", "pumps", [("P-1", "12"), ("P-2 ", "21")]),
+    (" 017 ALKY I", "PUMPS ", [("p-1", "13"), ("P-1", "14"), ("P-1", "15")]),
+]
+
+def check_upgrade() -> List[str]:
+    """
+    Upgrade an in-memory copy of CHECK_ROUNDS to the latest version.
+
+    Returns:
+        List[str]: The problems found; empty if the upgrade succeeded, kept
+            every reading (in round_items or superseded_round_items) and left
+            one catalog item per normalized name
+    """
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        apply_migrations(conn, CHECK_FROM_VERSION)
+        conn.execute("INSERT INTO operators (name) VALUES ('Check')")
+        for round_id, (unit, section, readings) in enumerate(CHECK_ROUNDS, start=1):
+            conn.execute("INSERT INTO rounds (id, round_type, operator_id, shift) VALUES (?, 'Check', 1, 'Days')",
+                         (round_id,))
+            conn.execute("INSERT INTO sections (id, round_id, unit, section_name) VALUES (?, ?, ?, ?)",
+                         (round_id, round_id, unit, section))
+            conn.executemany("INSERT INTO round_items (section_id, description, value) VALUES (?, ?, ?)",
+                             [(round_id, description, value) for description, value in readings])
+        conn.commit()
+
+        try:
+            apply_migrations(conn)
+        except sqlite3.Error as e:
+            return [f"Upgrade from version {CHECK_FROM_VERSION} failed: {str(e)}"]
+
+        problems = []
+        if get_schema_version(conn) != SCHEMA_VERSION:
+            problems.append(f"Upgrade stopped at version {get_schema_version(conn)}")
+
+        expected = sorted(value for _, _, readings in CHECK_ROUNDS for _, value in readings)
+        kept = sorted(row[0] for row in conn.execute(
+            "SELECT value FROM round_items UNION ALL SELECT value FROM superseded_round_items"))
+        if kept != expected:
+            problems.append(f"Readings {expected} became {kept}")
+
+        names = {normalize_key(description) for _, _, readings in CHECK_ROUNDS for description, _ in readings}
+        definitions = conn.execute("SELECT COUNT(*) FROM item_definitions").fetchone()[0]
+        if definitions != len(names):
+            problems.append(f"{definitions} catalog items for {len(names)} distinct names")
+
+        unlinked = conn.execute("SELECT COUNT(*) FROM round_items WHERE item_definition_id IS NULL").fetchone()[0]
+        if unlinked:
+            problems.append(f"{unlinked} readings without a catalog item")
+
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            problems.append(f"Foreign key violations: {violations[:5]}")
+        return problems
+    finally:
+        conn.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for inspecting and applying migrations."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.database.migrate",
+        description="Inspect or apply database schema migrations."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Show the current version and pending migrations")
+    subparsers.add_parser("check", help="Upgrade sample legacy data in memory and verify the result")
+    apply_parser = subparsers.add_parser("apply", help="Apply pending migrations")
+    apply_parser.add_argument("--target", type=int, default=None,
+                              help="Migrate up to this version instead of the latest")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        problems = check_upgrade()
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        if not problems:
+            print(f"Upgrade from version {CHECK_FROM_VERSION} to {SCHEMA_VERSION} kept every reading")
+        return 1 if problems else 0
+
+    try:
+        with get_db_connection() as conn:
+            if args.command == "status":
+                current = get_schema_version(conn)
+                print(f"Database: {get_database_path()}")
+                print(f"Current version: {current} (latest {SCHEMA_VERSION})")
+                for migration in MIGRATIONS:
+                    state = "applied" if migration.version <= current else "pending"
+                    print(f"  {migration.version:>3}  {state:<8} {migration.description}")
+            else:
+                applied = apply_migrations(conn, args.target)
+                for migration in applied:
+                    print(f"Applied {migration.version}: {migration.description}")
+                print(f"Database is at version {get_schema_version(conn)}")
+    except sqlite3.Error as e:
+        print(f"Database migration error: {str(e)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
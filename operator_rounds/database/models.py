@@ -10,6 +10,16 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
+def normalize_key(value: Optional[str]) -> str:
+    """
+    Normalize a unit, section or item name for matching.
+
+    Names match case- and whitespace-insensitively. This is the single
+    definition used for the stored unit_key/section_key/description_key
+    columns and for every lookup against them.
+    """
+    return (value or "").strip().lower()
+
 @dataclass
 class RoundItem:
     """Represents a single item within a section of a round."""
@@ -19,6 +29,7 @@ class RoundItem:
     mode: str = ""
     id: Optional[int] = None
     section_id: Optional[int] = None
+    item_definition_id: Optional[int] = None
     timestamp: Optional[datetime] = None
 
     def to_dict(self) -> Dict[str, Any]:
@@ -30,6 +41,29 @@ class RoundItem:
             "mode": self.mode
         }
 
+@dataclass
+class ItemDefinition:
+    """Represents a catalog entry for an item that readings are recorded against."""
+    unit: str
+    section_name: str
+    description: str
+    default_mode: str = ""
+    sort_order: int = 0
+    active: bool = True
+    id: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the item definition to a dictionary for JSON serialization."""
+        return {
+            "id": self.id,
+            "unit": self.unit,
+            "section_name": self.section_name,
+            "description": self.description,
+            "default_mode": self.default_mode,
+            "sort_order": self.sort_order,
+            "active": self.active
+        }
+
 @dataclass
 class Section:
     """Represents a section within a unit of a round."""
@@ -57,9 +91,9 @@ class Section:
 
     def get_item_by_description(self, description: str) -> Optional[RoundItem]:
         """Find an item by its description (case-insensitive)."""
-        description_lower = description.lower().strip()
+        description_key = normalize_key(description)
         for item in self.items:
-            if item.description.lower().strip() == description_lower:
+            if normalize_key(item.description) == description_key:
                 return item
         return None
 
@@ -107,20 +141,20 @@ class Round:
 
     def get_section_by_name(self, unit: str, section_name: str) -> Optional[Section]:
         """Find a section by its unit and name (case-insensitive)."""
-        unit_lower = unit.lower().strip()
-        section_name_lower = section_name.lower().strip()
+        unit_key = normalize_key(unit)
+        section_key = normalize_key(section_name)
         
         for section in self.sections:
-            if (section.unit.lower().strip() == unit_lower and 
-                section.section_name.lower().strip() == section_name_lower):
+            if (normalize_key(section.unit) == unit_key and 
+                normalize_key(section.section_name) == section_key):
                 return section
         return None
 
     def get_sections_by_unit(self, unit: str) -> List[Section]:
         """Get all sections for a specific unit."""
-        unit_lower = unit.lower().strip()
+        unit_key = normalize_key(unit)
         return [section for section in self.sections 
-                if section.unit.lower().strip() == unit_lower]
+                if normalize_key(section.unit) == unit_key]
 
     def get_units(self) -> List[str]:
         """Get a list of all unique units in this round."""
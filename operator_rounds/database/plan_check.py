@@ -0,0 +1,263 @@
+"""
+Query plan check for Operator Rounds Tracking.
+
+Runs EXPLAIN QUERY PLAN over every statement issued by the database package
+and the UI modules and reports any that fall back to a full table SCAN
+(a "SCAN <table>" step that does not use an index), that walk a whole
+index of the large tables (sections, round_items), or that sort their
+whole result in a temp B-tree while walking a table from end to end, so
+nothing is returned until every row has been read and sorted.
+
+By default the check runs twice against an in-memory database built from
+the migrations: once seeded with planner statistics for a multi-year
+database (REPRESENTATIVE_STATS), and once without any, which is what a
+database that has never been analyzed gives the planner. The result
+depends only on the schema; migration 10 collects real statistics on every
+database, which vacuum-analyze keeps current. Pass --database to check a
+live file instead, using its own ANALYZE statistics (if any).
+
+Usage:
+    python -m operator_rounds.database.plan_check [--database PATH] [--verbose]
+"""
+import argparse
+import re
+import sqlite3
+import sys
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from operator_rounds.database import (
+    bulk_load, history, item_catalog, latest_values, maintenance, queries, reference_data, retention
+)
+from operator_rounds.database.schema import apply_migrations
+
+class PlanCase(NamedTuple):
+    """A statement to check, with representative parameters."""
+    name: str
+    sql: str
+    params: Tuple
+
+class PlanResult(NamedTuple):
+    """The outcome of checking one statement."""
+    case: PlanCase
+    plan: List[str]
+    full_scans: List[str]
+    full_sorts: List[str]
+
+# "SCAN rounds" or "SCAN r" is a full table scan; "SCAN r USING INDEX ..."
+# walks an index and "SCAN CONSTANT ROW"/"SCAN (subquery-1)" touch no table.
+_FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!\()(\S+)$")
+# Tables that grow with every round: even walking one of their indexes end
+# to end reads millions of rows
+LARGE_TABLES = ("sections", "round_items")
+_INDEX_SCAN = re.compile(r"^SCAN (\S+) USING (?:COVERING )?INDEX ")
+_TABLE_ALIAS = re.compile(
+    r"\b(?:FROM|JOIN)\s+(" + "|".join(LARGE_TABLES) + r")\b"
+    r"(?:\s+(?:AS\s+)?(?!(?:ON|WHERE|JOIN|CROSS|LEFT|INNER|GROUP|ORDER|LIMIT|SET)\b)(\w+))?",
+    re.IGNORECASE
+)
+# "USE TEMP B-TREE FOR ORDER BY" sorts the whole result; RIGHT PART/LAST
+# TERM sorts only the rows of each outer loop iteration
+_WHOLE_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+# sqlite_stat1 rows describing several years of 3-shift rounds. Without
+# statistics SQLite assumes every table is the same size, which is not what
+# the planner sees in production.
+REPRESENTATIVE_STATS = [
+    ("operators", None, "60"),
+    ("operators", "idx_operators_name", "60 1"),
+    ("rounds", None, "20000"),
+    ("rounds", "idx_rounds_utc", "20000 1"),
+    ("rounds", "idx_rounds_operator_utc", "20000 350 1"),
+    ("rounds", "idx_rounds_type_utc", "20000 10000 1"),
+    ("sections", None, "600000"),
+    ("sections", "idx_sections_round_key", "600000 30 2 1"),
+    ("round_items", None, "12000000"),
+    ("round_items", "idx_round_items_section_definition", "12000000 20 1"),
+    ("round_items", "idx_round_items_definition", "12000000 20000"),
+    ("round_items", "idx_round_items_utc", "12000000 30"),
+    ("item_definitions", None, "1200"),
+    ("item_definitions", "sqlite_autoindex_item_definitions_1", "1200 600 20 1"),
+    ("item_definitions", "idx_item_definitions_key", "1200 600 20 1"),
+    ("latest_sections", "sqlite_autoindex_latest_sections_1", "600 300 20 1"),
+    ("latest_item_values", None, "12000"),
+    ("latest_item_values", "sqlite_autoindex_latest_item_values_1", "12000 6000 600 20 1"),
+    ("latest_item_values", "idx_latest_item_values_key", "12000 1200 40 2"),
+]
+
+def seed_statistics(conn: sqlite3.Connection) -> None:
+    """Load REPRESENTATIVE_STATS into an empty database's sqlite_stat1 table."""
+    conn.execute("ANALYZE")  # Creates sqlite_stat1
+    conn.execute("DELETE FROM sqlite_stat1")
+    known_indexes = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    conn.executemany(
+        "INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (?, ?, ?)",
+        [row for row in REPRESENTATIVE_STATS if row[1] is None or row[1] in known_indexes]
+    )
+    conn.commit()
+    conn.execute("ANALYZE sqlite_schema")  # Reload statistics into the planner
+
+def get_plan_cases() -> List[PlanCase]:
+    """Collect every statement the application runs against the database."""
+    # Imported here because the UI module pulls in Streamlit
+    from operator_rounds.ui import section_editor, view_rounds
+
+    cases = [
+        PlanCase("start_round: operator lookup", queries.SELECT_OPERATOR_ID_SQL, ("Operator",)),
+        PlanCase("start_round: insert operator", queries.INSERT_OPERATOR_SQL, ("Operator",)),
+        PlanCase("start_round: insert round", queries.INSERT_ROUND_SQL, ("Round", 1, "Days")),
+        PlanCase("save_round_section: section lookup", queries.SELECT_SECTION_ID_SQL, (1, "unit", "section")),
+        PlanCase("save_round_section: existing readings", queries.SELECT_SECTION_READINGS_SQL, (1,)),
+        PlanCase("save_round_section: insert section", queries.INSERT_SECTION_SQL, (1, "Unit", "Section", "unit", "section")),
+        PlanCase("save_round_section: upsert readings", queries.UPSERT_ROUND_ITEM_SQL, (1, 1, "Item", "", "", "")),
+        PlanCase("load_last_round_data: latest values", latest_values.SELECT_LATEST_ROUND_DATA_SQL, ()),
+        PlanCase("latest values: round type", latest_values.SELECT_ROUND_TYPE_SQL, (1,)),
+        PlanCase("latest values: record section", latest_values.INSERT_LATEST_SECTION_SQL,
+                 ("Round", "Unit", "Section", "unit", "section")),
+        PlanCase("latest values: record item", latest_values.UPSERT_LATEST_ITEM_SQL,
+                 ("Round", "Unit", "Section", "Item", "unit", "section", "item", "", "", "", 1)),
+        PlanCase("latest values: rename item", latest_values.UPDATE_LATEST_ITEM_SQL,
+                 ("New", "new", "", "", "", "unit", "section", "item")),
+        PlanCase("latest values: delete item", latest_values.DELETE_LATEST_ITEM_SQL, ("unit", "section", "item")),
+        PlanCase("item catalog: record definition", item_catalog.UPSERT_ITEM_DEFINITION_SQL,
+                 ("Unit", "Section", "Item", "", "unit", "section", "item", "unit", "section")),
+        PlanCase("item catalog: section definitions", item_catalog.SELECT_SECTION_DEFINITION_IDS_SQL, ("unit", "section")),
+        PlanCase("item catalog: definition lookup", item_catalog.SELECT_ITEM_DEFINITION_ID_SQL, ("unit", "section", "item")),
+        PlanCase("item catalog: rename", item_catalog.RENAME_ITEM_DEFINITION_SQL,
+                 ("New", "new", "", "unit", "section", "item")),
+        PlanCase("item catalog: retire", item_catalog.RETIRE_ITEM_DEFINITION_SQL, ("unit", "section", "item")),
+        PlanCase("item catalog: list", item_catalog.SELECT_ITEM_DEFINITIONS_SQL, ("unit", "section")),
+        PlanCase("get_rounds_by_ids: rounds",
+                 queries.SELECT_ROUNDS_SQL.format(placeholders="?, ?, ?"), (1, 2, 3)),
+        PlanCase("get_rounds_by_ids: sections and readings",
+                 queries.SELECT_ROUNDS_SECTION_ITEMS_SQL.format(placeholders="?, ?, ?"), (1, 2, 3)),
+        PlanCase("get_operator_rounds", queries.SELECT_OPERATOR_ROUNDS_SQL, ("Operator",)),
+        PlanCase("get_round_summary_for_period", queries.SELECT_ROUND_SUMMARY_SQL, (1735689600, 1738368000)),
+        PlanCase("get_all_operators", queries.SELECT_ALL_OPERATORS_SQL, ()),
+        PlanCase("delete_rounds", queries.DELETE_ROUNDS_SQL.format(placeholders="?, ?, ?"), (1, 2, 3)),
+        PlanCase("remove_section", queries.DELETE_SECTION_SQL, (1, "unit", "section")),
+        PlanCase("retention: expired rounds", retention.SELECT_EXPIRED_ROUND_IDS_SQL, (1735689600, 50)),
+        PlanCase("retention: count", retention.COUNT_EXPIRED_ROUNDS_SQL, (1735689600,)),
+        PlanCase("stats: round range", maintenance.SELECT_ROUND_RANGE_SQL, ()),
+        PlanCase("parquet export: first unsettled round", history.SELECT_FIRST_UNSETTLED_ROUND_SQL, (100, 1738368000)),
+        PlanCase("parquet export: last round", history.SELECT_LAST_ROUND_ID_SQL, ()),
+        PlanCase("bulk load: existing rounds", bulk_load.SELECT_EXISTING_ROUNDS_SQL, (1735689600, 1738368000)),
+        PlanCase("bulk load: next round id", bulk_load.SELECT_MAX_ROUND_ID_SQL, ()),
+        PlanCase("bulk load: next section id", bulk_load.SELECT_MAX_SECTION_ID_SQL, ()),
+        PlanCase("bulk load: insert round", bulk_load.INSERT_IMPORTED_ROUND_SQL, (1, "Round", 1, "Days", 1735689600, 1735689600)),
+        PlanCase("bulk load: insert section", bulk_load.INSERT_IMPORTED_SECTION_SQL, (1, 1, "Unit", "Section", "unit", "section")),
+        PlanCase("bulk load: insert reading", bulk_load.INSERT_IMPORTED_ITEM_SQL, (1, 1, "Item", "", "", "", 1735689600, 1735689600)),
+        PlanCase("section editor: update reading", section_editor.UPDATE_ROUND_READING_SQL, ("Item", "", "", "", 1, 1)),
+        PlanCase("section editor: delete reading", section_editor.DELETE_ROUND_READING_SQL, (1, 1)),
+        PlanCase("reference data: round types", reference_data.ROUND_TYPES_SQL, ()),
+        PlanCase("reference data: operators", reference_data.OPERATOR_NAMES_SQL, ()),
+        PlanCase("reference data: units", reference_data.UNIT_NAMES_SQL, ()),
+        PlanCase("reference data: sections", reference_data.SECTION_NAMES_SQL, ("unit",)),
+        PlanCase("render_round_details: round", view_rounds.ROUND_DETAILS_SQL, (1,)),
+        PlanCase("render_round_details: items", view_rounds.ROUND_DETAIL_ITEMS_SQL, (1,)),
+    ]
+
+    # Every filter combination the history page can produce, on the first
+    # page and paging either way from a cursor
+    end_date = date.today()
+    start_date = end_date - timedelta(days=7)
+    for date_filter in ["All Time", "Today", "Last 7 Days", "Last 30 Days", "Custom"]:
+        for round_type in ["All Round Types", "Alky Console Round Sheet"]:
+            for operator in ["All Operators", "Operator"]:
+                for cursor, direction in [(None, "next"), ((1735689600, 1), "next"), ((1735689600, 1), "prev")]:
+                    sql, params = view_rounds.build_rounds_query(
+                        date_filter, round_type, operator, start_date, end_date,
+                        cursor=cursor, direction=direction, page_size=20
+                    )
+                    page = "first page" if cursor is None else direction
+                    name = f"build_rounds_query: {date_filter} / {round_type} / {operator} / {page}"
+                    cases.append(PlanCase(name, sql, tuple(params)))
+
+    # Bulk export filters
+    for filters in [
+        history.HistoryFilter(),
+        history.HistoryFilter(unit="Unit"),
+        history.HistoryFilter(start_utc=1735689600, end_utc=1738368000),
+        history.HistoryFilter(start_utc=1735689600, end_utc=1738368000, round_type="Alky Console Round Sheet"),
+        history.HistoryFilter(start_utc=1735689600, end_utc=1738368000, operator="Operator"),
+        history.HistoryFilter(start_utc=1735689600, end_utc=1738368000, unit="Unit"),
+        history.HistoryFilter(after_id=100, through_id=200),
+    ]:
+        sql, params = history.build_history_query(filters)
+        active = ", ".join(field for field, value in filters._asdict().items() if value is not None)
+        cases.append(PlanCase(f"bulk export: {active or 'everything'}", sql, tuple(params)))
+
+    return cases
+
+def explain(conn: sqlite3.Connection, case: PlanCase) -> PlanResult:
+    """Run EXPLAIN QUERY PLAN for one statement and flag full scans and sorts."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {case.sql}", case.params).fetchall()
+    plan = [row[3] for row in rows]
+    large = set()
+    for table, alias in _TABLE_ALIAS.findall(case.sql):
+        large.update({table, alias} - {""})
+    full_scans = [step for step in plan if _FULL_SCAN.match(step)
+                  or (_INDEX_SCAN.match(step) and _INDEX_SCAN.match(step).group(1) in large)]
+
+    # A whole-result sort is only a problem when the outermost loop reads a
+    # table from end to end rather than seeking into it
+    loops = [row[3] for row in rows if row[1] == 0 and row[3].startswith(("SCAN ", "SEARCH "))]
+    outer_scan = bool(loops) and loops[0].startswith("SCAN ") and not loops[0].startswith(("SCAN CONSTANT", "SCAN ("))
+    full_sorts = [step for step in plan if step == _WHOLE_SORT and outer_scan]
+    return PlanResult(case, plan, full_scans, full_sorts)
+
+def check_query_plans(conn: sqlite3.Connection, cases: Optional[Sequence[PlanCase]] = None) -> List[PlanResult]:
+    """
+    Check every plan case against a database connection.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a migrated database
+        cases (Sequence[PlanCase], optional): Statements to check; defaults to get_plan_cases()
+
+    Returns:
+        List[PlanResult]: One result per statement
+    """
+    return [explain(conn, case) for case in (cases or get_plan_cases())]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point. Exits non-zero if any statement does a full scan or sort."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.database.plan_check",
+        description="Fail if any application query falls back to a full table scan."
+    )
+    parser.add_argument("--database", help="Check this database file instead of a fresh in-memory schema")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every statement")
+    args = parser.parse_args(argv)
+
+    passes = [(args.database, False)] if args.database else [
+        ("representative statistics", True),
+        ("no statistics", False),
+    ]
+    failed = False
+    for label, seeded in passes:
+        conn = sqlite3.connect(args.database or ":memory:")
+        try:
+            if not args.database:
+                apply_migrations(conn)
+                if seeded:
+                    seed_statistics(conn)
+            results = check_query_plans(conn)
+        finally:
+            conn.close()
+
+        failures = [result for result in results if result.full_scans or result.full_sorts]
+        for result in results:
+            if args.verbose or result in failures:
+                status = "FULL SCAN" if result.full_scans else "FULL SORT" if result.full_sorts else "ok"
+                print(f"[{status}] {result.case.name}")
+                for step in result.plan:
+                    print(f"    {step}")
+
+        print(f"{len(results) - len(failures)} of {len(results)} statements use indexes ({label})")
+        failed = failed or bool(failures)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
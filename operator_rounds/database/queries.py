@@ -4,204 +4,291 @@ Database queries for Operator Rounds Tracking.
 This module provides functions for interacting with the SQLite database,
 including creating, reading, updating, and deleting records for rounds,
 sections, items, and operators.
+
+It does not depend on Streamlit: every input is an explicit argument,
+results are returned as models or plain data, database errors are raised
+to the caller and diagnostics go to the module's logger. This lets batch
+jobs, benchmarks and worker threads use it; the UI reaches it through the
+adapters in ui/session.py.
 """
+import logging
 import sqlite3
-import traceback
-from typing import Dict, List, Tuple, Optional, Any, Union
-from datetime import datetime
-import streamlit as st
+import threading
+from typing import Dict, Iterable, List, Tuple, Optional, Any, Union
+from datetime import date, datetime
 import pandas as pd
 
-from operator_rounds.database.connection import get_db_connection
-from operator_rounds.database.models import Round, Section, RoundItem, Operator
+from operator_rounds.database.connection import count_statements, get_db_connection
+from operator_rounds.database.models import Round, Section, RoundItem, Operator, normalize_key
+from operator_rounds.database.latest_values import SELECT_LATEST_ROUND_DATA_SQL, record_latest_items
+from operator_rounds.database.item_catalog import ensure_item_definitions
+from operator_rounds.database.query_cache import cached_query
+from operator_rounds.database.timeutils import SQL_UTC_NOW_EPOCH, epoch_to_local, format_epoch, local_date_range
+
+logger = logging.getLogger(__name__)
+
+# SQL statements live at module level so that plan_check.py can run
+# EXPLAIN QUERY PLAN against exactly what the application executes.
+
+# start_round
+SELECT_OPERATOR_ID_SQL = 'SELECT id FROM operators WHERE name = ?'
+INSERT_OPERATOR_SQL = 'INSERT INTO operators (name) VALUES (?)'
+INSERT_ROUND_SQL = f'''
+    INSERT INTO rounds (round_type, operator_id, shift, timestamp_utc)
+    VALUES (?, ?, ?, {SQL_UTC_NOW_EPOCH})
+'''
+
+# save_round_section
+SELECT_SECTION_ID_SQL = '''
+    SELECT id 
+    FROM sections 
+    WHERE round_id = ? AND unit_key = ? AND section_key = ?
+'''
+SELECT_SECTION_READINGS_SQL = '''
+    SELECT item_definition_id, description, value, output, mode
+    FROM round_items
+    WHERE section_id = ?
+'''
+INSERT_SECTION_SQL = '''
+    INSERT INTO sections (round_id, unit, section_name, unit_key, section_key)
+    VALUES (?, ?, ?, ?, ?)
+'''
+UPSERT_ROUND_ITEM_SQL = f'''
+    INSERT INTO round_items 
+    (section_id, item_definition_id, description, value, output, mode, timestamp_utc)
+    VALUES (?, ?, ?, ?, ?, ?, {SQL_UTC_NOW_EPOCH})
+    ON CONFLICT (section_id, item_definition_id) DO UPDATE SET
+        description = excluded.description,
+        value = excluded.value,
+        output = excluded.output,
+        mode = excluded.mode
+'''
+
+# Per-item outcomes reported by save_round_section
+ITEM_INSERTED = "inserted"
+ITEM_UPDATED = "updated"
+ITEM_UNCHANGED = "unchanged"
+
+# get_rounds_by_ids: a fixed two statements per batch of ids, however many
+# sections and readings the rounds have. {placeholders} is filled with one
+# "?" per id in the batch.
+SELECT_ROUNDS_SQL = '''
+    SELECT r.id, r.round_type, r.shift, r.timestamp_utc, o.id, o.name
+    FROM rounds r
+    JOIN operators o ON r.operator_id = o.id
+    WHERE r.id IN ({placeholders})
+'''
+SELECT_ROUNDS_SECTION_ITEMS_SQL = '''
+    SELECT s.round_id, s.id, s.unit, s.section_name, s.completed,
+           ri.id, ri.description, ri.value, ri.output, ri.mode, ri.timestamp_utc,
+           ri.item_definition_id
+    FROM sections s
+    LEFT JOIN round_items ri ON ri.section_id = s.id
+    WHERE s.round_id IN ({placeholders})
+    ORDER BY s.round_id, s.unit, s.section_name, ri.id
+'''
+
+# Ids bound per IN (...) statement; stays well under SQLite's host parameter limit
+MAX_IDS_PER_STATEMENT = 500
+
+# get_operator_rounds
+SELECT_OPERATOR_ROUNDS_SQL = '''
+    SELECT r.id, r.round_type, r.shift, r.timestamp_utc, 
+           (SELECT COUNT(*) FROM sections WHERE round_id = r.id) as section_count
+    FROM rounds r
+    JOIN operators o ON r.operator_id = o.id
+    WHERE o.name = ?
+    ORDER BY r.timestamp_utc DESC
+'''
+
+# get_round_summary_for_period
+SELECT_ROUND_SUMMARY_SQL = '''
+    SELECT 
+        o.name as operator_name,
+        r.round_type,
+        COUNT(r.id) as round_count,
+        MIN(r.timestamp_utc) as first_round,
+        MAX(r.timestamp_utc) as last_round
+    FROM rounds r
+    JOIN operators o ON r.operator_id = o.id
+    WHERE r.timestamp_utc >= ? AND r.timestamp_utc < ?
+    GROUP BY o.name, r.round_type
+    ORDER BY o.name, r.round_type
+'''
+
+# get_all_operators
+SELECT_ALL_OPERATORS_SQL = '''
+    SELECT id, name, created_at
+    FROM operators
+    ORDER BY name
+'''
+
+# delete_rounds / remove_section: sections and readings are removed by
+# their ON DELETE CASCADE foreign keys
+DELETE_ROUNDS_SQL = 'DELETE FROM rounds WHERE id IN ({placeholders})'
+DELETE_SECTION_SQL = 'DELETE FROM sections WHERE round_id = ? AND unit_key = ? AND section_key = ?'
 
-def start_round(unit_name: str) -> Optional[int]:
+def start_round(round_type: str, operator_name: str, shift: str) -> int:
     """
-    Create a new round in the database.
+    Create a new round in the database, adding the operator if they are new.
     
     Args:
-        unit_name (str): The name of the unit to start the round for
+        round_type (str): The round sheet being recorded
+        operator_name (str): The operator recording the round
+        shift (str): The operator's shift
         
     Returns:
-        Optional[int]: The ID of the newly created round, or None if an error occurred
+        int: The ID of the newly created round
+        
+    Raises:
+        sqlite3.Error: If the round could not be created
     """
-    try:
-        if st.session_state.get('debug_mode', False):
-            st.write("Debug - Attempting to start round with:")
-            st.write(f"Operator: {st.session_state.operator_name}")
-            st.write(f"Round type: {st.session_state.current_round}")
-            st.write(f"Shift: {st.session_state.shift}")
-            
-        with get_db_connection() as conn:
-            conn.execute("BEGIN TRANSACTION")
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
             c = conn.cursor()
             
             # First try to get the operator
-            c.execute('SELECT id FROM operators WHERE name = ?', (st.session_state.operator_name,))
+            c.execute(SELECT_OPERATOR_ID_SQL, (operator_name,))
             operator_result = c.fetchone()
             
             if operator_result:
                 operator_id = operator_result[0]
             else:
                 # Insert new operator
-                c.execute('INSERT INTO operators (name) VALUES (?)', (st.session_state.operator_name,))
+                c.execute(INSERT_OPERATOR_SQL, (operator_name,))
                 operator_id = c.lastrowid
             
-            if st.session_state.get('debug_mode', False):
-                st.write(f"Debug - Got operator_id: {operator_id}")
-            
             # Create new round
-            c.execute('''
-                INSERT INTO rounds (round_type, operator_id, shift)
-                VALUES (?, ?, ?)
-            ''', (st.session_state.current_round, operator_id, st.session_state.shift))
-            
+            c.execute(INSERT_ROUND_SQL, (round_type, operator_id, shift))
             round_id = c.lastrowid
             
-            if st.session_state.get('debug_mode', False):
-                st.write(f"Debug - Created round with ID: {round_id}")
-                
             conn.commit()
-            
-            return round_id
-            
-    except sqlite3.Error as e:
-        if st.session_state.get('debug_mode', False):
-            st.write(f"Debug - SQLite error in start_round: {str(e)}")
-            st.write(traceback.format_exc())
-        return None
+        except Exception:
+            conn.rollback()
+            raise
+    
+    logger.debug("Started round %s (%s) for operator %s (id %s), shift %s",
+                 round_id, round_type, operator_name, operator_id, shift)
+    return round_id
+
+def find_section_id(c: sqlite3.Cursor, round_id: int, unit: str, section: str) -> Optional[int]:
+    """Return the id of a round's section, matching names by normalize_key()."""
+    c.execute(SELECT_SECTION_ID_SQL, (round_id, normalize_key(unit), normalize_key(section)))
+    row = c.fetchone()
+    return row[0] if row else None
+
+def insert_section(c: sqlite3.Cursor, round_id: int, unit: str, section: str) -> int:
+    """Add a section to a round and return its id."""
+    c.execute(INSERT_SECTION_SQL, (
+        round_id, unit.strip(), section.strip(), normalize_key(unit), normalize_key(section)
+    ))
+    return c.lastrowid
+
+def upsert_section_items(c: sqlite3.Cursor, round_id: int, unit: str, section: str,
+                         items: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Write the readings of one section of a round in a single batch.
 
-def save_round_section(unit: str, section: str, data: Dict[str, Any]) -> bool:
+    Readings are matched to the section's existing ones by catalog entry
+    (case- and whitespace-insensitive description); only new and changed
+    readings are written. Must run inside the caller's write transaction.
+
+    Args:
+        c (sqlite3.Cursor): Cursor inside the caller's transaction
+        round_id (int): The round being recorded
+        unit (str): The unit name
+        section (str): The section name
+        items (List[Dict[str, Any]]): Items with description/value/output/mode
+
+    Returns:
+        Dict[str, str]: Outcome per item description (ITEM_INSERTED,
+            ITEM_UPDATED or ITEM_UNCHANGED)
+    """
+    unit = unit.strip()
+    section = section.strip()
+
+    section_id = find_section_id(c, round_id, unit, section)
+
+    if section_id is not None:
+        c.execute(SELECT_SECTION_READINGS_SQL, (section_id,))
+        existing = {
+            row[0]: tuple((field or "").strip() for field in row[1:])
+            for row in c.fetchall()
+        }
+    else:
+        section_id = insert_section(c, round_id, unit, section)
+        existing = {}
+
+    # Every reading references its item's catalog entry
+    definition_ids = ensure_item_definitions(c, unit, section, items)
+
+    outcomes = {}
+    changed_rows = []
+    changed_items = []
+    for item in items:
+        description = (item.get("description") or "").strip()
+        if not description:
+            continue
+
+        definition_id = definition_ids.get(normalize_key(description))
+        reading = (
+            description,
+            (item.get("value") or "").strip(),
+            (item.get("output") or "").strip(),
+            (item.get("mode") or "").strip()
+        )
+
+        current = existing.get(definition_id)
+        if current is None:
+            outcomes[description] = ITEM_INSERTED
+        elif current == reading:
+            outcomes[description] = ITEM_UNCHANGED
+            continue
+        else:
+            outcomes[description] = ITEM_UPDATED
+
+        changed_rows.append((section_id, definition_id) + reading)
+        changed_items.append(item)
+
+    c.executemany(UPSERT_ROUND_ITEM_SQL, changed_rows)
+
+    # Keep the prefill values for new rounds in step
+    record_latest_items(c, round_id, unit, section, changed_items)
+
+    return outcomes
+
+def save_round_section(round_id: int, unit: str, section: str,
+                       items: List[Dict[str, Any]]) -> Dict[str, str]:
     """
     Save section data to the database, preserving historical round items.
     
     Args:
+        round_id (int): The round being recorded
         unit (str): The unit name
         section (str): The section name
-        data (Dict[str, Any]): The section data including items
+        items (List[Dict[str, Any]]): Items with description/value/output/mode
         
     Returns:
-        bool: True if successful, False otherwise
+        Dict[str, str]: Outcome per item description (inserted, updated or unchanged)
+        
+    Raises:
+        sqlite3.Error: If the section could not be saved; nothing is written
     """
-    if st.session_state.get('debug_mode', False):
-        st.write("Debug - save_round_section function called")
-        st.write(f"Debug - Unit: {unit}, Section: {section}")
-        st.write(f"Debug - Items count: {len(data['items'])}")
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            outcomes = upsert_section_items(conn.cursor(), round_id, unit, section, items)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
-    # Verify we have a valid round ID
-    if not st.session_state.current_round_id:
-        st.error("No active round found. Please start a new round.")
-        return False
-        
-    try:
-        with get_db_connection() as conn:
-            conn.execute("BEGIN TRANSACTION")
-            
-            try:
-                c = conn.cursor()
-                
-                # Find the section ID
-                c.execute('''
-                    SELECT id 
-                    FROM sections 
-                    WHERE round_id = ? AND LOWER(TRIM(unit)) = LOWER(TRIM(?)) 
-                    AND LOWER(TRIM(section_name)) = LOWER(TRIM(?))
-                ''', (st.session_state.current_round_id, unit, section))
-                
-                section_result = c.fetchone()
-                
-                if section_result:
-                    section_id = section_result[0]
-                    
-                    if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Found existing section ID: {section_id}")
-                    
-                    # Instead of deleting all items, we'll update existing ones and add new ones
-                    # First, get all existing items for this section
-                    c.execute('SELECT id, description FROM round_items WHERE section_id = ?', (section_id,))
-                    existing_items = {desc.strip().lower(): id for id, desc in c.fetchall()}
-                    
-                    if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Found {len(existing_items)} existing items")
-                    
-                    # Go through the items we want to save
-                    for item in data["items"]:
-                        item_desc = item["description"].strip()
-                        item_desc_lower = item_desc.lower()
-                        
-                        if item_desc_lower in existing_items:
-                            # Update existing item
-                            item_id = existing_items[item_desc_lower]
-                            c.execute('''
-                                UPDATE round_items 
-                                SET description = ?, value = ?, output = ?, mode = ?
-                                WHERE id = ?
-                            ''', (item_desc, item.get("value", "").strip(), 
-                                 item.get("output", "").strip(), 
-                                 item.get("mode", "").strip(),
-                                 item_id))
-                            
-                            if st.session_state.get('debug_mode', False):
-                                st.write(f"Debug - Updated item: {item_desc}")
-                            
-                            # Remove from existing_items so we know what's left
-                            existing_items.pop(item_desc_lower)
-                        else:
-                            # Insert new item
-                            c.execute('''
-                                INSERT INTO round_items 
-                                (section_id, description, value, output, mode)
-                                VALUES (?, ?, ?, ?, ?)
-                            ''', (section_id, item_desc, item.get("value", "").strip(), 
-                                 item.get("output", "").strip(),
-                                 item.get("mode", "").strip()))
-                            
-                            if st.session_state.get('debug_mode', False):
-                                st.write(f"Debug - Inserted new item: {item_desc}")
-                else:
-                    # Create a new section
-                    c.execute('''
-                        INSERT INTO sections (round_id, unit, section_name)
-                        VALUES (?, ?, ?)
-                    ''', (st.session_state.current_round_id, unit.strip(), section.strip()))
-                    
-                    section_id = c.lastrowid
-                    
-                    if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Created new section with ID: {section_id}")
-                    
-                    # Insert all items as new
-                    for item in data["items"]:
-                        c.execute('''
-                            INSERT INTO round_items 
-                            (section_id, description, value, output, mode)
-                            VALUES (?, ?, ?, ?, ?)
-                        ''', (section_id, item["description"].strip(), 
-                             item.get("value", "").strip(), 
-                             item.get("output", "").strip(),
-                             item.get("mode", "").strip()))
-                
-                # Commit changes
-                conn.commit()
-                return True
-                
-            except Exception as e:
-                conn.rollback()
-                st.error(f"Error saving section: {str(e)}")
-                
-                if st.session_state.get('debug_mode', False):
-                    st.write("Debug - Exception details:")
-                    st.write(traceback.format_exc())
-                
-                return False
-    except Exception as e:
-        st.error(f"Database connection error: {str(e)}")
-        
-        if st.session_state.get('debug_mode', False):
-            st.write("Debug - Connection error:")
-            st.write(traceback.format_exc())
-        
-        return False
+    if logger.isEnabledFor(logging.DEBUG):
+        counts = {outcome: list(outcomes.values()).count(outcome)
+                  for outcome in (ITEM_INSERTED, ITEM_UPDATED, ITEM_UNCHANGED)}
+        logger.debug("Saved %s / %s of round %s: %s", unit, section, round_id, counts)
+    return outcomes
 
 def load_last_round_data() -> Dict[str, Any]:
     """
@@ -209,150 +296,94 @@ def load_last_round_data() -> Dict[str, Any]:
     
     This function retrieves all sections and the most recent values
     for items in those sections to populate the initial application state.
+    It reads the small latest_sections/latest_item_values tables rather
+    than the full round history.
     
     Returns:
         Dict[str, Any]: Round data in the application's expected structure
+        
+    Raises:
+        sqlite3.Error: If the data could not be read
     """
-    if 'rounds_data_needs_refresh' in st.session_state and st.session_state.rounds_data_needs_refresh:
-        if st.session_state.get('debug_mode', False):
-            st.write("Debug - Forcing refresh of rounds data from database")
-        # Reset the flag after we've acknowledged it
-        st.session_state.rounds_data_needs_refresh = False
+    # Sections and their latest item values come from the materialized
+    # tables maintained by every write path (see latest_values.py)
+    rows = cached_query(SELECT_LATEST_ROUND_DATA_SQL)
     
-    try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            # First, get all existing sections
-            c.execute('''
-                SELECT DISTINCT r.round_type, s.unit, s.section_name
-                FROM sections s
-                JOIN rounds r ON s.round_id = r.id
-                ORDER BY s.unit, s.section_name
-            ''')
-            
-            section_results = c.fetchall()
-            
-            # Modified query to correctly fetch the most recent round items
-            c.execute('''
-                SELECT r.id, r.round_type, r.timestamp,
-                       s.unit, s.section_name,
-                       ri.description, ri.value, ri.output, ri.mode
-                FROM rounds r
-                JOIN sections s ON s.round_id = r.id
-                LEFT JOIN round_items ri ON ri.section_id = s.id
-                WHERE ri.description IS NOT NULL
-                ORDER BY r.timestamp DESC
-            ''')
-            
-            item_results = c.fetchall()
-            
-            # Initialize with default structure
-            from operator_rounds.utils.state import initialize_round_data_structure
-            round_data = initialize_round_data_structure()
-            
-            # First, ensure all sections exist
-            for row in section_results:
-                round_type, unit, section = row
-                
-                # Ensure the unit exists in the structure
-                if unit not in round_data[round_type]["units"]:
-                    round_data[round_type]["units"][unit] = {"sections": {}}
-                
-                # Create section if it doesn't exist
-                if section not in round_data[round_type]["units"][unit]["sections"]:
-                    round_data[round_type]["units"][unit]["sections"][section] = {"items": []}
-            
-            # Process items - we need to track which items we've already added
-            added_items = set()
-            
-            # Then process the most recent items
-            for row in item_results:
-                round_id, round_type, timestamp, unit, section, desc, value, output, mode = row
-                
-                # Add item if it exists and description is not None
-                if desc:
-                    # Create a unique identifier for this item
-                    item_key = f"{unit}_{section}_{desc}"
-                    
-                    # Only add if we haven't seen this item before
-                    if item_key not in added_items:
-                        # The section should already exist from previous step
-                        round_data[round_type]["units"][unit]["sections"][section]["items"].append({
-                            "description": desc,
-                            "value": value,
-                            "output": output,
-                            "mode": mode
-                        })
-                        
-                        # Mark this item as added
-                        added_items.add(item_key)
-            
-            return round_data
-            
-    except sqlite3.Error as e:
-        st.error(f"Error loading round data: {str(e)}")
-        from operator_rounds.utils.state import initialize_round_data_structure
-        return initialize_round_data_structure()
+    # Initialize with default structure
+    from operator_rounds.utils.state import initialize_round_data_structure
+    round_data = initialize_round_data_structure()
+    
+    for row in rows:
+        round_type, unit, section, desc, value, output, mode = row
+        
+        # Ensure the unit exists in the structure
+        units = round_data.setdefault(round_type, {"units": {}})["units"]
+        if unit not in units:
+            units[unit] = {"sections": {}}
+        
+        # Create section if it doesn't exist
+        sections = units[unit]["sections"]
+        if section not in sections:
+            sections[section] = {"items": []}
+        
+        # Sections without items come back with a NULL description
+        if desc:
+            sections[section]["items"].append({
+                "description": desc,
+                "value": value,
+                "output": output,
+                "mode": mode
+            })
+    
+    return round_data
 
-def get_round_by_id(round_id: int) -> Optional[Round]:
+# Statement counts of the calling thread's last hydration, for debug output
+# and regression checks
+_hydration_stats = threading.local()
+
+def hydrate_rounds(c: sqlite3.Cursor, round_ids: List[int]) -> Dict[int, Round]:
     """
-    Retrieve a complete round by its ID.
-    
+    Build complete Round objects for a list of round ids.
+
+    Runs two statements per MAX_IDS_PER_STATEMENT ids (rounds with their
+    operators, then every section and reading of those rounds) and assembles
+    the objects in a single pass over the rows.
+
     Args:
-        round_id (int): The ID of the round to retrieve
-        
+        c (sqlite3.Cursor): Cursor to read with
+        round_ids (List[int]): Round ids without duplicates
+
     Returns:
-        Optional[Round]: The round object if found, None otherwise
+        Dict[int, Round]: The rounds found, keyed by id
     """
-    try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            # Get round information
-            c.execute('''
-                SELECT r.round_type, r.shift, r.timestamp, o.id, o.name
-                FROM rounds r
-                JOIN operators o ON r.operator_id = o.id
-                WHERE r.id = ?
-            ''', (round_id,))
-            
-            round_result = c.fetchone()
-            
-            if not round_result:
-                return None
-                
-            round_type, shift, timestamp, operator_id, operator_name = round_result
-            
-            # Create the operator object
-            operator = Operator(
-                id=operator_id,
-                name=operator_name
-            )
-            
-            # Create the round object
-            round_obj = Round(
+    rounds = {}
+    for start in range(0, len(round_ids), MAX_IDS_PER_STATEMENT):
+        batch = round_ids[start:start + MAX_IDS_PER_STATEMENT]
+        placeholders = ", ".join("?" * len(batch))
+
+        c.execute(SELECT_ROUNDS_SQL.format(placeholders=placeholders), batch)
+        for round_id, round_type, shift, timestamp_utc, operator_id, operator_name in c.fetchall():
+            rounds[round_id] = Round(
                 id=round_id,
                 round_type=round_type,
-                operator=operator,
+                operator=Operator(id=operator_id, name=operator_name),
                 shift=shift,
-                timestamp=timestamp
+                timestamp=epoch_to_local(timestamp_utc)
             )
-            
-            # Get all sections for this round
-            c.execute('''
-                SELECT id, unit, section_name, completed
-                FROM sections
-                WHERE round_id = ?
-                ORDER BY unit, section_name
-            ''', (round_id,))
-            
-            section_results = c.fetchall()
-            
-            for section_row in section_results:
-                section_id, unit, section_name, completed = section_row
-                
-                # Create the section object
+
+        # Rows arrive grouped by round and section; a section without
+        # readings comes back once with NULL item columns
+        section = None
+        c.execute(SELECT_ROUNDS_SECTION_ITEMS_SQL.format(placeholders=placeholders), batch)
+        for row in c.fetchall():
+            (round_id, section_id, unit, section_name, completed,
+             item_id, description, value, output, mode, item_timestamp_utc, definition_id) = row
+
+            round_obj = rounds.get(round_id)
+            if round_obj is None:
+                continue
+
+            if section is None or section.id != section_id:
                 section = Section(
                     id=section_id,
                     unit=unit,
@@ -360,44 +391,76 @@ def get_round_by_id(round_id: int) -> Optional[Round]:
                     completed=bool(completed),
                     round_id=round_id
                 )
-                
-                # Get all items for this section
-                c.execute('''
-                    SELECT id, description, value, output, mode, timestamp
-                    FROM round_items
-                    WHERE section_id = ?
-                    ORDER BY id
-                ''', (section_id,))
-                
-                item_results = c.fetchall()
-                
-                for item_row in item_results:
-                    item_id, description, value, output, mode, item_timestamp = item_row
-                    
-                    # Create the item object
-                    item = RoundItem(
-                        id=item_id,
-                        description=description,
-                        value=value,
-                        output=output,
-                        mode=mode,
-                        section_id=section_id,
-                        timestamp=item_timestamp
-                    )
-                    
-                    # Add the item to the section
-                    section.items.append(item)
-                
-                # Add the section to the round
                 round_obj.sections.append(section)
-            
-            return round_obj
-            
-    except sqlite3.Error as e:
-        if st.session_state.get('debug_mode', False):
-            st.write(f"Debug - Error in get_round_by_id: {str(e)}")
-            st.write(traceback.format_exc())
-        return None
+
+            if item_id is not None:
+                section.items.append(RoundItem(
+                    id=item_id,
+                    description=description,
+                    value=value,
+                    output=output,
+                    mode=mode,
+                    section_id=section_id,
+                    timestamp=epoch_to_local(item_timestamp_utc),
+                    item_definition_id=definition_id
+                ))
+
+    return rounds
+
+def get_rounds_by_ids(round_ids: Iterable[int]) -> List[Round]:
+    """
+    Retrieve complete rounds for a list of ids, for reports and exports.
+
+    The number of statements depends only on the number of ids (see
+    hydrate_rounds); get_last_hydration_stats() reports it for the call.
+    
+    Args:
+        round_ids (Iterable[int]): The IDs of the rounds to retrieve
+        
+    Returns:
+        List[Round]: The rounds found, in the order their ids were given
+        
+    Raises:
+        sqlite3.Error: If the rounds could not be read
+    """
+    round_ids = list(dict.fromkeys(round_ids))
+    _hydration_stats.last = {"rounds": 0, "statements": 0}
+    if not round_ids:
+        return []
+    
+    with get_db_connection(readonly=True) as conn:
+        with count_statements(conn) as counter:
+            rounds = hydrate_rounds(conn.cursor(), round_ids)
+        
+    _hydration_stats.last = {"rounds": len(rounds), "statements": counter.count}
+    logger.debug("Loaded %d round(s) with %d statement(s)", len(rounds), counter.count)
+    
+    return [rounds[round_id] for round_id in round_ids if round_id in rounds]
+
+def get_round_by_id(round_id: int) -> Optional[Round]:
+    """
+    Retrieve a complete round by its ID.
+    
+    Args:
+        round_id (int): The ID of the round to retrieve
+        
+    Returns:
+        Optional[Round]: The round object if found, None otherwise
+        
+    Raises:
+        sqlite3.Error: If the round could not be read
+    """
+    rounds = get_rounds_by_ids([round_id])
+    return rounds[0] if rounds else None
+
+def get_last_hydration_stats() -> Dict[str, int]:
+    """
+    Report the last get_rounds_by_ids/get_round_by_id call of this thread.
+
+    Returns:
+        Dict[str, int]: "rounds" loaded and "statements" executed
+    """
+    return dict(getattr(_hydration_stats, "last", {"rounds": 0, "statements": 0}))
 
 def get_operator_rounds(operator_name: str) -> List[Dict[str, Any]]:
     """
@@ -408,104 +471,53 @@ def get_operator_rounds(operator_name: str) -> List[Dict[str, Any]]:
         
     Returns:
         List[Dict[str, Any]]: A list of round summary dictionaries
+        
+    Raises:
+        sqlite3.Error: If the rounds could not be read
     """
-    try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            c.execute('''
-                SELECT r.id, r.round_type, r.shift, r.timestamp, 
-                       (SELECT COUNT(*) FROM sections WHERE round_id = r.id) as section_count
-                FROM rounds r
-                JOIN operators o ON r.operator_id = o.id
-                WHERE o.name = ?
-                ORDER BY r.timestamp DESC
-            ''', (operator_name,))
-            
-            round_results = c.fetchall()
-            
-            rounds = []
-            for row in round_results:
-                round_id, round_type, shift, timestamp, section_count = row
-                
-                rounds.append({
-                    "id": round_id,
-                    "round_type": round_type,
-                    "shift": shift,
-                    "timestamp": timestamp,
-                    "section_count": section_count
-                })
-            
-            return rounds
-            
-    except sqlite3.Error as e:
-        if st.session_state.get('debug_mode', False):
-            st.write(f"Debug - Error in get_operator_rounds: {str(e)}")
-            st.write(traceback.format_exc())
-        return []
+    rounds = []
+    for row in cached_query(SELECT_OPERATOR_ROUNDS_SQL, (operator_name,)):
+        round_id, round_type, shift, timestamp_utc, section_count = row
+        
+        rounds.append({
+            "id": round_id,
+            "round_type": round_type,
+            "shift": shift,
+            "timestamp": format_epoch(timestamp_utc),
+            "section_count": section_count
+        })
+    
+    return rounds
 
 def get_round_summary_for_period(start_date: str, end_date: str) -> pd.DataFrame:
     """
     Get a summary of rounds completed during a specific period.
     
     Args:
-        start_date (str): The start date in ISO format (YYYY-MM-DD)
-        end_date (str): The end date in ISO format (YYYY-MM-DD)
+        start_date (str): The first local date in ISO format (YYYY-MM-DD)
+        end_date (str): The last local date in ISO format (YYYY-MM-DD), inclusive
         
     Returns:
         pd.DataFrame: A dataframe containing round summary statistics
-    """
-    try:
-        with get_db_connection() as conn:
-            # Query to get round counts by operator and type
-            query = """
-                SELECT 
-                    o.name as operator_name,
-                    r.round_type,
-                    COUNT(r.id) as round_count,
-                    MIN(r.timestamp) as first_round,
-                    MAX(r.timestamp) as last_round
-                FROM rounds r
-                JOIN operators o ON r.operator_id = o.id
-                WHERE DATE(r.timestamp) BETWEEN ? AND ?
-                GROUP BY o.name, r.round_type
-                ORDER BY o.name, r.round_type
-            """
-            
-            # Execute the query
-            df = pd.read_sql_query(query, conn, params=(start_date, end_date))
-            
-            return df
-            
-    except (sqlite3.Error, pd.io.sql.DatabaseError) as e:
-        if st.session_state.get('debug_mode', False):
-            st.write(f"Debug - Error in get_round_summary_for_period: {str(e)}")
-            st.write(traceback.format_exc())
         
-        # Return an empty DataFrame with the expected columns
-        return pd.DataFrame(columns=[
-            "operator_name", "round_type", "round_count", 
-            "first_round", "last_round"
-        ])
-
-def toggle_expand_all(unit_name: str, sections: List[str]) -> None:
-    """
-    Helper function to handle expand/collapse all functionality for a unit's sections.
-    
-    Args:
-        unit_name (str): The name of the unit
-        sections (List[str]): List of section names in the unit
+    Raises:
+        ValueError: If a date is not in ISO format
+        sqlite3.Error: If the rounds could not be read
     """
-    unit_sections = {f"{unit_name}_{section}" for section in sections}
+    range_start, range_end = local_date_range(
+        date.fromisoformat(start_date), date.fromisoformat(end_date)
+    )
     
-    if not hasattr(st.session_state, 'expanded_sections'):
-        st.session_state.expanded_sections = set()
+    df = pd.DataFrame(
+        cached_query(SELECT_ROUND_SUMMARY_SQL, (range_start, range_end)),
+        columns=["operator_name", "round_type", "round_count", "first_round", "last_round"]
+    )
+        
+    # Show the first and last round in local time
+    for column in ["first_round", "last_round"]:
+        df[column] = df[column].map(format_epoch)
     
-    # If all sections are expanded, collapse all. Otherwise, expand all
-    if unit_sections.issubset(st.session_state.expanded_sections):
-        st.session_state.expanded_sections -= unit_sections
-    else:
-        st.session_state.expanded_sections.update(unit_sections)
+    return df
 
 def get_all_operators() -> List[Operator]:
     """
@@ -513,36 +525,73 @@ def get_all_operators() -> List[Operator]:
     
     Returns:
         List[Operator]: A list of all operators
+        
+    Raises:
+        sqlite3.Error: If the operators could not be read
     """
-    try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            c.execute('''
-                SELECT id, name, created_at
-                FROM operators
-                ORDER BY name
-            ''')
-            
-            operator_results = c.fetchall()
-            
-            operators = []
-            for row in operator_results:
-                operator_id, name, created_at = row
-                
-                operators.append(Operator(
-                    id=operator_id,
-                    name=name,
-                    created_at=created_at
-                ))
-            
-            return operators
-            
-    except sqlite3.Error as e:
-        if st.session_state.get('debug_mode', False):
-            st.write(f"Debug - Error in get_all_operators: {str(e)}")
-            st.write(traceback.format_exc())
-        return []
+    operators = []
+    for row in cached_query(SELECT_ALL_OPERATORS_SQL):
+        operator_id, name, created_at = row
+        
+        operators.append(Operator(
+            id=operator_id,
+            name=name,
+            created_at=created_at
+        ))
+    
+    return operators
+
+def remove_rounds(c: sqlite3.Cursor, round_ids: List[int]) -> int:
+    """
+    Delete rounds together with their sections and readings.
+
+    Must run inside the caller's write transaction, on a connection with
+    foreign keys enabled.
+
+    Args:
+        c (sqlite3.Cursor): Cursor inside the caller's transaction
+        round_ids (List[int]): The rounds to delete
+
+    Returns:
+        int: Rows deleted across rounds, sections and round_items
+    """
+    changes_before = c.connection.total_changes
+    for start in range(0, len(round_ids), MAX_IDS_PER_STATEMENT):
+        batch = round_ids[start:start + MAX_IDS_PER_STATEMENT]
+        c.execute(DELETE_ROUNDS_SQL.format(placeholders=", ".join("?" * len(batch))), batch)
+    # total_changes includes the rows removed by the cascades
+    return c.connection.total_changes - changes_before
+
+def remove_section(c: sqlite3.Cursor, round_id: int, unit: str, section: str) -> bool:
+    """Delete a section and its readings from a round. Returns True if it existed."""
+    c.execute(DELETE_SECTION_SQL, (round_id, normalize_key(unit), normalize_key(section)))
+    return c.rowcount > 0
+
+def delete_rounds(round_ids: Iterable[int]) -> int:
+    """
+    Delete several rounds and all their sections and items in one transaction.
+    
+    Args:
+        round_ids (Iterable[int]): The IDs of the rounds to delete
+        
+    Returns:
+        int: Rows deleted (cascades included)
+        
+    Raises:
+        sqlite3.Error: If the rounds could not be deleted; nothing is deleted
+    """
+    round_ids = list(dict.fromkeys(round_ids))
+    with get_db_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            deleted = remove_rounds(conn.cursor(), round_ids)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+    logger.debug("Deleted %d round(s), %d row(s) in total", len(round_ids), deleted)
+    return deleted
 
 def delete_round(round_id: int) -> bool:
     """
@@ -552,33 +601,9 @@ def delete_round(round_id: int) -> bool:
         round_id (int): The ID of the round to delete
         
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if the round existed
+        
+    Raises:
+        sqlite3.Error: If the round could not be deleted
     """
-    try:
-        with get_db_connection() as conn:
-            conn.execute("BEGIN TRANSACTION")
-            c = conn.cursor()
-            
-            # Get all sections for this round
-            c.execute('SELECT id FROM sections WHERE round_id = ?', (round_id,))
-            section_ids = [row[0] for row in c.fetchall()]
-            
-            # Delete all items for each section
-            for section_id in section_ids:
-                c.execute('DELETE FROM round_items WHERE section_id = ?', (section_id,))
-            
-            # Delete all sections
-            c.execute('DELETE FROM sections WHERE round_id = ?', (round_id,))
-            
-            # Delete the round
-            c.execute('DELETE FROM rounds WHERE id = ?', (round_id,))
-            
-            # Commit changes
-            conn.commit()
-            return True
-            
-    except sqlite3.Error as e:
-        if st.session_state.get('debug_mode', False):
-            st.write(f"Debug - Error in delete_round: {str(e)}")
-            st.write(traceback.format_exc())
-        return False
\ No newline at end of file
+    return delete_rounds([round_id]) > 0
@@ -0,0 +1,161 @@
+"""
+Read-through query result cache for Operator Rounds Tracking.
+
+Read queries that Streamlit reruns repeat with the same parameters are
+answered from a process-wide LRU cache shared by every session. Entries are
+keyed on (database, statement, parameters) and tagged with the tables the
+statement reads. An entry is served only while:
+
+- none of its tables has been written through this process's write
+  connection (see ConnectionManager.get_table_versions),
+- no other process has committed to the database (PRAGMA data_version), and
+- it is younger than DATABASE["query_cache_ttl_seconds"].
+
+Results larger than DATABASE["query_cache_max_rows"] rows are never stored,
+and at most DATABASE["query_cache_entries"] results are kept.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+
+from operator_rounds.config import DATABASE
+from operator_rounds.database.connection import ALL_TABLES, get_connection_manager
+
+class _Entry(NamedTuple):
+    """A cached result and what it was computed from."""
+    rows: List[Tuple]
+    versions: Tuple[int, ...]
+    stored_at: float
+
+class QueryCache:
+    """LRU cache of query results invalidated by writes to the tables they read."""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 max_rows: Optional[int] = None):
+        self.max_entries = max_entries or DATABASE.get("query_cache_entries", 256)
+        self.ttl_seconds = ttl_seconds or DATABASE.get("query_cache_ttl_seconds", 300)
+        self.max_rows = max_rows or DATABASE.get("query_cache_max_rows", 10000)
+
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._tables: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidated": 0,
+            "expired": 0,
+            "evicted": 0,
+            "too_large": 0,
+        }
+
+    @staticmethod
+    def _read_tables(conn: sqlite3.Connection, sql: str, params: Sequence) -> FrozenSet[str]:
+        """Find the tables a statement reads by compiling it under an authorizer."""
+        tables = set()
+
+        def authorizer(action, arg1, arg2, database, source):
+            if action == sqlite3.SQLITE_READ and database == "main":
+                tables.add(arg1)
+            return sqlite3.SQLITE_OK
+
+        conn.set_authorizer(authorizer)
+        try:
+            # EXPLAIN compiles the statement without running it
+            conn.execute(f"EXPLAIN {sql}", params).fetchall()
+        finally:
+            conn.set_authorizer(None)
+
+        # A statement already prepared on this connection is not compiled
+        # again and reports nothing; depend on every table in that case
+        return frozenset(tables) or frozenset([ALL_TABLES])
+
+    def fetchall(self, sql: str, params: Sequence = ()) -> List[Tuple]:
+        """
+        Run a read query, or return its cached result if still valid.
+
+        Args:
+            sql (str): A read-only statement
+            params (Sequence): Its parameters
+
+        Returns:
+            List[Tuple]: The result rows (a copy of the cached list)
+
+        Raises:
+            sqlite3.Error: If the query has to run and fails
+        """
+        manager = get_connection_manager()
+        params = tuple(params)
+        key = (manager.database_path, sql, params)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            tables = self._tables.get(sql)
+
+        if entry is not None and tables is not None:
+            if time.monotonic() - entry.stored_at > self.ttl_seconds:
+                outcome = "expired"
+            elif manager.get_table_versions(tables) != entry.versions:
+                outcome = "invalidated"
+            else:
+                outcome = "hits"
+            with self._lock:
+                self._stats[outcome] += 1
+                if outcome == "hits":
+                    self._entries.move_to_end(key)
+                    return list(entry.rows)
+                self._entries.pop(key, None)
+
+        with manager.read_connection() as conn:
+            if tables is None:
+                tables = self._read_tables(conn, sql, params)
+            # Versions are taken before the query runs, so a write racing
+            # with it can only cause an extra miss later, never a stale hit
+            versions = manager.get_table_versions(tables)
+            rows = conn.execute(sql, params).fetchall()
+
+        with self._lock:
+            self._stats["misses"] += 1
+            self._tables[sql] = tables
+            if len(rows) > self.max_rows:
+                self._stats["too_large"] += 1
+            else:
+                self._entries[key] = _Entry(rows, versions, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evicted"] += 1
+
+        return list(rows)
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        return stats
+
+
+_query_cache = QueryCache()
+
+def cached_query(sql: str, params: Sequence = ()) -> List[Tuple]:
+    """Run a read query through the process-wide query cache; see QueryCache.fetchall."""
+    return _query_cache.fetchall(sql, params)
+
+def get_query_cache() -> QueryCache:
+    """Return the process-wide query cache."""
+    return _query_cache
+
+def get_query_cache_stats() -> Dict[str, Any]:
+    """Return statistics for the process-wide query cache."""
+    return _query_cache.get_stats()
@@ -0,0 +1,293 @@
+"""
+Per-statement timing for Operator Rounds Tracking.
+
+Every connection the ConnectionManager opens is a TimedConnection. While
+timing is on (DATABASE["query_timing"], or set_query_timing() at runtime,
+e.g. from the debug sidebar), the cursors it hands out time each statement
+from execute() until its last row is fetched, and record:
+
+- the statement, with its whitespace collapsed;
+- the rows it returned (or changed, for writes);
+- the function of this package that ran it, found on the call stack;
+- the lock wait: how long the checkout that ran it queued for the
+  connection (the in-process write lock or a pooled reader), charged to
+  the first statement of the checkout. Waits on SQLite's own lock
+  (busy_timeout) are inside the statement's time, usually BEGIN IMMEDIATE.
+
+Timings are aggregated per statement and caller in a process-wide
+summary (get_query_timing_stats). Statements slower than
+DATABASE["slow_query_ms"] are also written to a rotating log,
+PATHS["logs"]/slow_queries.log.
+
+While timing is off, cursors are plain sqlite3 cursors.
+"""
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional, Tuple
+
+from operator_rounds.config import DATABASE, PATHS
+
+SLOW_QUERY_LOG_FILENAME = "slow_queries.log"
+STATEMENT_DISPLAY_CHARS = 300
+
+# Modules whose frames are plumbing rather than the caller of a statement.
+# The connection pool's own statements (pragmas on open, data_version
+# polls) keep connection.py as their caller.
+_PLUMBING_MODULES = {
+    __name__,
+    "operator_rounds.database.query_cache",
+}
+
+_enabled = bool(DATABASE.get("query_timing", False))
+_slow_query_logger: Optional[logging.Logger] = None
+_logger_lock = threading.Lock()
+
+def is_query_timing_enabled() -> bool:
+    """Return whether statements are being timed."""
+    return _enabled
+
+def set_query_timing(enabled: bool) -> None:
+    """Turn statement timing on or off for every connection of this process."""
+    global _enabled
+    _enabled = bool(enabled)
+
+def get_slow_query_log_path() -> str:
+    """Return the path of the slow-query log, in PATHS["logs"]."""
+    return os.path.join(PATHS["logs"], SLOW_QUERY_LOG_FILENAME)
+
+def _get_slow_query_logger() -> logging.Logger:
+    """Return the slow-query logger, attaching its rotating file on first use."""
+    global _slow_query_logger
+    with _logger_lock:
+        if _slow_query_logger is None:
+            logger = logging.getLogger(f"{__name__}.slow")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            os.makedirs(PATHS["logs"], exist_ok=True)
+            handler = RotatingFileHandler(
+                get_slow_query_log_path(),
+                maxBytes=DATABASE.get("slow_query_log_bytes", 1048576),
+                backupCount=DATABASE.get("slow_query_log_backups", 3),
+                encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            _slow_query_logger = logger
+        return _slow_query_logger
+
+def _find_caller() -> str:
+    """Return "module.function" of the innermost frame of this package that is not plumbing."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _PLUMBING_MODULES and (module.startswith("operator_rounds") or module == "__main__"):
+            return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+class QueryTimingStats:
+    """Timings aggregated per (statement, caller)."""
+
+    def __init__(self, max_statements: Optional[int] = None):
+        self.max_statements = max_statements or DATABASE.get("query_timing_max_statements", 500)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.dropped = 0
+
+    def record(self, statement: str, caller: str, elapsed: float, rows: int, lock_wait: float) -> None:
+        """Add one execution of a statement."""
+        slow_ms = DATABASE.get("slow_query_ms", 100)
+        slow = elapsed * 1000 >= slow_ms
+        with self._lock:
+            entry = self._entries.get((statement, caller))
+            if entry is None:
+                # Statements built with varying text could grow this without bound
+                if len(self._entries) >= self.max_statements:
+                    self.dropped += 1
+                    entry = None
+                else:
+                    entry = self._entries[(statement, caller)] = {
+                        "calls": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                        "rows": 0, "lock_wait_seconds": 0.0, "slow_calls": 0,
+                    }
+            if entry is not None:
+                entry["calls"] += 1
+                entry["total_seconds"] += elapsed
+                entry["max_seconds"] = max(entry["max_seconds"], elapsed)
+                entry["rows"] += rows
+                entry["lock_wait_seconds"] += lock_wait
+                entry["slow_calls"] += slow
+
+        if slow:
+            _get_slow_query_logger().info(
+                "%.1f ms rows=%d lock_wait=%.1f ms caller=%s sql=%s",
+                elapsed * 1000, rows, lock_wait * 1000, caller, statement[:STATEMENT_DISPLAY_CHARS]
+            )
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Return one row per statement and caller, most total time first."""
+        with self._lock:
+            items = [(key, dict(entry)) for key, entry in self._entries.items()]
+        rows = []
+        for (statement, caller), entry in items:
+            rows.append({
+                "statement": statement[:STATEMENT_DISPLAY_CHARS],
+                "caller": caller,
+                "calls": entry["calls"],
+                "total_ms": round(entry["total_seconds"] * 1000, 2),
+                "mean_ms": round(entry["total_seconds"] * 1000 / entry["calls"], 3),
+                "max_ms": round(entry["max_seconds"] * 1000, 2),
+                "rows": entry["rows"],
+                "lock_wait_ms": round(entry["lock_wait_seconds"] * 1000, 2),
+                "slow_calls": entry["slow_calls"],
+            })
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows
+
+    def clear(self) -> None:
+        """Forget every recorded timing."""
+        with self._lock:
+            self._entries.clear()
+            self.dropped = 0
+
+
+_stats = QueryTimingStats()
+
+def get_query_timing_stats() -> List[Dict[str, Any]]:
+    """Return the aggregated statement timings of this process; see QueryTimingStats.summary."""
+    return _stats.summary()
+
+def reset_query_timing_stats() -> None:
+    """Forget the statement timings recorded so far."""
+    _stats.clear()
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that times each statement until its rows are fetched; see the module docstring."""
+
+    _pending: Optional[List[Any]] = None  # [statement, caller, seconds, rows, lock wait]
+
+    def _begin(self, sql: str) -> List[Any]:
+        self._finish()
+        return [" ".join(sql.split()), _find_caller(), 0.0, 0, self.connection.take_lock_wait()]
+
+    def _finish(self) -> None:
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            _stats.record(*pending)
+
+    def _run(self, pending: List[Any], method, *args):
+        started = time.perf_counter()
+        try:
+            result = method(*args)
+        except Exception:
+            pending[2] += time.perf_counter() - started
+            _stats.record(*pending)
+            raise
+        pending[2] += time.perf_counter() - started
+        if self.description is None:
+            # Nothing to fetch: the statement is complete
+            pending[3] = max(self.rowcount, 0)
+            _stats.record(*pending)
+        else:
+            self._pending = pending
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self._run(self._begin(sql), super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(self._begin(sql), super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self._run(self._begin(sql_script), super().executescript, sql_script)
+
+    def _fetched(self, started: float, rows: int, exhausted: bool) -> None:
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - started
+            pending[3] += rows
+            if exhausted:
+                self._finish()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(started, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Cursors dropped before their last row still count
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors are TimedCursors while timing is on."""
+
+    _lock_wait = 0.0
+
+    def cursor(self, factory=None):
+        if _enabled and factory is None:
+            return super().cursor(TimedCursor)
+        return super().cursor() if factory is None else super().cursor(factory)
+
+    # The shortcuts below make their cursor in C, bypassing cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        if not _enabled:
+            return super().commit()
+        # The commit is where a write transaction syncs, so it is timed as a statement
+        started = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            _stats.record("COMMIT", _find_caller(), time.perf_counter() - started, 0, 0.0)
+
+    def set_lock_wait(self, waited: float) -> None:
+        """Note how long the current checkout waited for this connection."""
+        self._lock_wait = waited
+
+    def take_lock_wait(self) -> float:
+        """Return the checkout's wait once, for its first statement."""
+        waited, self._lock_wait = self._lock_wait, 0.0
+        return waited
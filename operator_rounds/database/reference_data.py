@@ -0,0 +1,64 @@
+"""
+Cached reference data for Operator Rounds Tracking.
+
+Filter and picker option lists (round types, operators, units and section
+names) change only when rounds or the item catalog are written, yet they
+were queried on every Streamlit rerun. They are read through the
+process-wide query cache (see query_cache.py), which shares them across
+sessions and reloads each list only after a write to the tables it reads,
+from this process or from any other.
+"""
+from typing import List, Tuple
+
+from operator_rounds.database.models import normalize_key
+from operator_rounds.database.query_cache import cached_query, get_query_cache
+
+ROUND_TYPES_SQL = "SELECT DISTINCT round_type FROM rounds ORDER BY round_type"
+OPERATOR_NAMES_SQL = '''
+    SELECT DISTINCT o.name
+    FROM operators o
+    JOIN rounds r ON o.id = r.operator_id
+    ORDER BY o.name
+'''
+# Grouped by normalized key so that spelling variants collapse into one entry
+UNIT_NAMES_SQL = '''
+    SELECT MIN(unit) FROM item_definitions
+    WHERE active = 1
+    GROUP BY unit_key
+    ORDER BY unit_key
+'''
+SECTION_NAMES_SQL = '''
+    SELECT MIN(section_name) FROM item_definitions
+    WHERE unit_key = ? AND active = 1
+    GROUP BY section_key
+    ORDER BY section_key
+'''
+
+def _cached_list(sql: str, params: Tuple = ()) -> List[str]:
+    """
+    Return the first column of a query, from the cache while the data is unchanged.
+
+    Raises:
+        sqlite3.Error: If the list has to be loaded and the query fails
+    """
+    return [row[0] for row in cached_query(sql, params)]
+
+def get_round_types() -> List[str]:
+    """Return the round types that have recorded rounds."""
+    return _cached_list(ROUND_TYPES_SQL)
+
+def get_operator_names() -> List[str]:
+    """Return the names of operators who have recorded rounds."""
+    return _cached_list(OPERATOR_NAMES_SQL)
+
+def get_unit_names() -> List[str]:
+    """Return the units that have active catalog items."""
+    return _cached_list(UNIT_NAMES_SQL)
+
+def get_section_names(unit: str) -> List[str]:
+    """Return the sections of a unit that have active catalog items."""
+    return _cached_list(SECTION_NAMES_SQL, (normalize_key(unit),))
+
+def clear_reference_cache() -> None:
+    """Drop every cached list, e.g. after editing the database by hand."""
+    get_query_cache().clear()
@@ -0,0 +1,219 @@
+"""
+Retention job for Operator Rounds Tracking.
+
+Rounds older than DATABASE["retention_days"] are deleted together with
+their sections and readings (see queries.remove_rounds). With
+DATABASE["retention_archive"] set they are first copied into an archive
+database in PATHS["backups"], which has the same tables without constraints.
+
+The job works in batches of DATABASE["retention_batch_size"] rounds. Each
+batch is its own short write transaction, so writers in the application
+only ever wait for one batch, and every batch reports the rows it deleted
+and how long it took.
+
+Usage:
+    python -m operator_rounds.database.retention [--days N] [--batch-size N]
+        [--no-archive] [--dry-run]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import timedelta
+from typing import Callable, List, NamedTuple, Optional
+
+from operator_rounds.config import DATABASE, PATHS
+from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.queries import remove_rounds
+from operator_rounds.database.timeutils import format_epoch, local_midnight_epoch, local_today
+
+SELECT_EXPIRED_ROUND_IDS_SQL = '''
+    SELECT id FROM rounds
+    WHERE timestamp_utc < ?
+    ORDER BY timestamp_utc
+    LIMIT ?
+'''
+COUNT_EXPIRED_ROUNDS_SQL = 'SELECT COUNT(*) FROM rounds WHERE timestamp_utc < ?'
+
+# Rows copied to the archive for a batch of round ids, parents first.
+# {placeholders} is filled with one "?" per round id.
+ARCHIVED_ROWS = [
+    ("operators", "id IN (SELECT operator_id FROM main.rounds WHERE id IN ({placeholders}))"),
+    ("item_definitions", '''id IN (
+        SELECT ri.item_definition_id
+        FROM main.round_items ri
+        JOIN main.sections s ON ri.section_id = s.id
+        WHERE s.round_id IN ({placeholders})
+    )'''),
+    ("rounds", "id IN ({placeholders})"),
+    ("sections", "round_id IN ({placeholders})"),
+    ("round_items", "section_id IN (SELECT id FROM main.sections WHERE round_id IN ({placeholders}))"),
+    ("superseded_round_items",
+     "section_id IN (SELECT id FROM main.sections WHERE round_id IN ({placeholders}))"),
+]
+
+# Gives other writers in this process a chance at the write connection
+# between batches
+BATCH_PAUSE_SECONDS = 0.05
+
+class BatchReport(NamedTuple):
+    """The outcome of one retention batch."""
+    batch: int
+    rounds: int
+    rows_deleted: int
+    rows_archived: int
+    elapsed_seconds: float
+
+def get_archive_path() -> str:
+    """Return the path of the archive database."""
+    return os.path.join(PATHS["backups"], DATABASE.get("archive_filename", "rounds_archive.db"))
+
+def retention_cutoff(retention_days: int) -> int:
+    """Return the UTC epoch before which rounds are expired: local midnight ``retention_days`` days ago."""
+    return local_midnight_epoch(local_today() - timedelta(days=retention_days))
+
+def _ensure_archive_tables(c: sqlite3.Cursor) -> None:
+    """Create the archive tables, or add columns that later migrations introduced."""
+    for table, _ in ARCHIVED_ROWS:
+        c.execute(f"CREATE TABLE IF NOT EXISTS archive.{table} AS SELECT * FROM main.{table} WHERE 0")
+        c.execute(f"PRAGMA archive.table_info({table})")
+        archived = {info[1] for info in c.fetchall()}
+        c.execute(f"PRAGMA main.table_info({table})")
+        for info in c.fetchall():
+            if info[1] not in archived:
+                c.execute(f"ALTER TABLE archive.{table} ADD COLUMN {info[1]} {info[2]}")
+        # Re-archiving a row after an interrupted run replaces it
+        c.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS archive.idx_{table}_id ON {table} (id)")
+
+def _archive_rounds(c: sqlite3.Cursor, round_ids: List[int]) -> int:
+    """Copy rounds and everything they reference into the archive. Returns rows copied."""
+    placeholders = ", ".join("?" * len(round_ids))
+    copied = 0
+    for table, condition in ARCHIVED_ROWS:
+        c.execute(f"PRAGMA main.table_info({table})")
+        columns = ", ".join(info[1] for info in c.fetchall())
+        c.execute(
+            f"INSERT OR REPLACE INTO archive.{table} ({columns}) "
+            f"SELECT {columns} FROM main.{table} WHERE {condition.format(placeholders=placeholders)}",
+            round_ids
+        )
+        copied += c.rowcount
+    return copied
+
+def count_expired_rounds(retention_days: int) -> int:
+    """Return how many rounds the retention job would remove."""
+    with get_db_connection(readonly=True) as conn:
+        return conn.execute(COUNT_EXPIRED_ROUNDS_SQL, (retention_cutoff(retention_days),)).fetchone()[0]
+
+def purge_expired_rounds(retention_days: Optional[int] = None, batch_size: Optional[int] = None,
+                         archive: Optional[bool] = None, max_batches: Optional[int] = None,
+                         on_batch: Optional[Callable[[BatchReport], None]] = None) -> List[BatchReport]:
+    """
+    Delete (and optionally archive) expired rounds in bounded batches.
+
+    Args:
+        retention_days (int, optional): Keep rounds newer than this; defaults to DATABASE["retention_days"]
+        batch_size (int, optional): Rounds per transaction; defaults to DATABASE["retention_batch_size"]
+        archive (bool, optional): Copy rounds to the archive first; defaults to DATABASE["retention_archive"]
+        max_batches (int, optional): Stop after this many batches
+        on_batch (Callable[[BatchReport], None], optional): Called after each committed batch
+
+    Returns:
+        List[BatchReport]: One report per batch; empty if retention is disabled
+    """
+    retention_days = DATABASE.get("retention_days", 0) if retention_days is None else retention_days
+    batch_size = batch_size or DATABASE.get("retention_batch_size", 50)
+    archive = DATABASE.get("retention_archive", True) if archive is None else archive
+    if retention_days <= 0:
+        return []
+
+    cutoff = retention_cutoff(retention_days)
+    archive_path = get_archive_path()
+    if archive:
+        os.makedirs(os.path.dirname(archive_path) or ".", exist_ok=True)
+
+    reports = []
+    while max_batches is None or len(reports) < max_batches:
+        started = time.perf_counter()
+        with get_db_connection() as conn:
+            # ATTACH is not allowed inside a transaction
+            if archive:
+                conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    c = conn.cursor()
+                    c.execute(SELECT_EXPIRED_ROUND_IDS_SQL, (cutoff, batch_size))
+                    round_ids = [row[0] for row in c.fetchall()]
+                    if not round_ids:
+                        conn.rollback()
+                        break
+
+                    rows_archived = 0
+                    if archive:
+                        if not reports:
+                            _ensure_archive_tables(c)
+                        rows_archived = _archive_rounds(c, round_ids)
+                    rows_deleted = remove_rounds(c, round_ids)
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    raise
+            finally:
+                if archive:
+                    conn.execute("DETACH DATABASE archive")
+
+        report = BatchReport(len(reports) + 1, len(round_ids), rows_deleted, rows_archived,
+                             time.perf_counter() - started)
+        reports.append(report)
+        if on_batch:
+            on_batch(report)
+        time.sleep(BATCH_PAUSE_SECONDS)
+
+    return reports
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the retention job."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.database.retention",
+        description="Delete (and archive) rounds older than the retention period."
+    )
+    parser.add_argument("--days", type=int, default=None,
+                        help="Keep rounds newer than this many days (default: DATABASE['retention_days'])")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rounds deleted per transaction")
+    parser.add_argument("--no-archive", action="store_true", help="Delete without copying to the archive")
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many rounds would be removed")
+    args = parser.parse_args(argv)
+
+    retention_days = DATABASE.get("retention_days", 0) if args.days is None else args.days
+    if retention_days <= 0:
+        print("Retention is disabled; pass --days or set DATABASE['retention_days']")
+        return 0
+
+    def print_batch(report: BatchReport) -> None:
+        print(f"Batch {report.batch}: {report.rounds} rounds, {report.rows_deleted} rows deleted, "
+              f"{report.rows_archived} rows archived in {report.elapsed_seconds * 1000:.1f} ms")
+
+    try:
+        print(f"Removing rounds before {format_epoch(retention_cutoff(retention_days))}")
+        if args.dry_run:
+            print(f"{count_expired_rounds(retention_days)} rounds would be removed")
+            return 0
+
+        reports = purge_expired_rounds(retention_days, args.batch_size,
+                                       archive=not args.no_archive, on_batch=print_batch)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Retention error: {str(e)}", file=sys.stderr)
+        return 1
+
+    rounds = sum(report.rounds for report in reports)
+    rows = sum(report.rows_deleted for report in reports)
+    seconds = sum(report.elapsed_seconds for report in reports)
+    print(f"Removed {rounds} rounds ({rows} rows) in {len(reports)} batches, {seconds:.2f} s")
+    if reports and not args.no_archive:
+        print(f"Archived to {get_archive_path()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,85 +1,643 @@
-"""Database schema definition and initialization."""
+"""
+Database schema definition and migrations.
+
+The schema version lives in SQLite's ``PRAGMA user_version``. Every entry in
+MIGRATIONS upgrades the database by exactly one version and runs in its own
+transaction. ensure_schema() applies whatever is pending once per process
+and is a cheap no-op on every later call (e.g. on each Streamlit rerun).
+
+See operator_rounds.database.migrate for the command line interface.
+"""
+import logging
 import sqlite3
+import threading
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from operator_rounds.config import get_database_path
 from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database import latest_values
+from operator_rounds.database.models import normalize_key
 
-def add_mode_column_to_round_items():
-    """Add mode column to round_items table if it doesn't exist yet"""
-    try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            # Check if the column already exists
-            c.execute("PRAGMA table_info(round_items)")
-            columns = [info[1] for info in c.fetchall()]
-            
-            if 'mode' not in columns:
-                # Add the column
-                c.execute("ALTER TABLE round_items ADD COLUMN mode TEXT")
-                conn.commit()
-                return True, "Mode column added successfully"
-            else:
-                return True, "Mode column already exists"
-                
-    except sqlite3.Error as e:
-        return False, f"Database error: {str(e)}"
+logger = logging.getLogger(__name__)
 
-def init_db():
-    """Initialize SQLite database with necessary tables"""
-    try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            
-            # Create operators table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS operators (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Create rounds table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS rounds (
-                    id INTEGER PRIMARY KEY,
-                    round_type TEXT NOT NULL,
-                    operator_id INTEGER,
-                    shift TEXT NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (operator_id) REFERENCES operators (id)
-                )
-            ''')
-            
-            # Create sections table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS sections (
-                    id INTEGER PRIMARY KEY,
-                    round_id INTEGER,
-                    unit TEXT NOT NULL,
-                    section_name TEXT NOT NULL,
-                    completed BOOLEAN DEFAULT 0,
-                    FOREIGN KEY (round_id) REFERENCES rounds (id)
-                )
-            ''')
-            
-            # Create round items table
-            c.execute('''
-                CREATE TABLE IF NOT EXISTS round_items (
-                    id INTEGER PRIMARY KEY,
-                    section_id INTEGER,
-                    description TEXT NOT NULL,
-                    value TEXT,
-                    output TEXT,
-                    mode TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (section_id) REFERENCES sections (id)
+class Migration(NamedTuple):
+    """A single schema upgrade step."""
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Cursor], None]
+    # The step changes what the latest-value tables are derived from
+    rebuild_latest_values: bool = False
+    # The step rebuilds tables that other tables reference. SQLite only
+    # honours PRAGMA foreign_keys outside a transaction, so
+    # apply_migrations switches enforcement off around the step.
+    disable_foreign_keys: bool = False
+
+def _create_base_tables(c: sqlite3.Cursor) -> None:
+    """Create the operators, rounds, sections and round_items tables."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS operators (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS rounds (
+            id INTEGER PRIMARY KEY,
+            round_type TEXT NOT NULL,
+            operator_id INTEGER,
+            shift TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (operator_id) REFERENCES operators (id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS sections (
+            id INTEGER PRIMARY KEY,
+            round_id INTEGER,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            completed BOOLEAN DEFAULT 0,
+            FOREIGN KEY (round_id) REFERENCES rounds (id)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS round_items (
+            id INTEGER PRIMARY KEY,
+            section_id INTEGER,
+            description TEXT NOT NULL,
+            value TEXT,
+            output TEXT,
+            mode TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (section_id) REFERENCES sections (id)
+        )
+    ''')
+
+def _add_round_items_mode(c: sqlite3.Cursor) -> None:
+    """Add the mode column to databases created before it existed."""
+    c.execute("PRAGMA table_info(round_items)")
+    columns = [info[1] for info in c.fetchall()]
+
+    if 'mode' not in columns:
+        c.execute("ALTER TABLE round_items ADD COLUMN mode TEXT")
+
+def _create_join_path_indexes(c: sqlite3.Cursor) -> None:
+    """
+    Add secondary indexes for the history, prefill and round lookup queries.
+
+    - operators(name): operator lookup in start_round and the operator filter
+    - rounds(timestamp): newest-first history listing
+    - rounds(operator_id, timestamp) / rounds(round_type, timestamp): filtered
+      history, per-operator listings and the DISTINCT filter option lists
+    - sections(round_id, unit, section_name, completed): covers every
+      per-round section lookup, including get_round_by_id's ORDER BY
+    - round_items(section_id): item fetch per section (rowid keeps ORDER BY id)
+    """
+    c.execute("CREATE INDEX IF NOT EXISTS idx_operators_name ON operators (name)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rounds_timestamp ON rounds (timestamp)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rounds_operator_timestamp ON rounds (operator_id, timestamp)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rounds_type_timestamp ON rounds (round_type, timestamp)")
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sections_round
+        ON sections (round_id, unit, section_name, completed)
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_round_items_section ON round_items (section_id)")
+
+def _create_latest_value_tables(c: sqlite3.Cursor) -> None:
+    """Create the materialized latest-value tables."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS latest_sections (
+            round_type TEXT NOT NULL,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            PRIMARY KEY (round_type, unit, section_name)
+        )
+    ''')
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS latest_item_values (
+            id INTEGER PRIMARY KEY,
+            round_type TEXT NOT NULL,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            value TEXT,
+            output TEXT,
+            mode TEXT,
+            round_id INTEGER,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (round_type, unit, section_name, description)
+        )
+    ''')
+
+def _create_item_catalog(c: sqlite3.Cursor) -> None:
+    """
+    Move item definitions into their own catalog table.
+
+    Backfills one definition per distinct (unit, section, description) found
+    in round_items, ordered by first use, links every reading to it and
+    marks the latest-value tables for a rebuild from the catalog.
+    """
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS item_definitions (
+            id INTEGER PRIMARY KEY,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            description TEXT NOT NULL COLLATE NOCASE,
+            default_mode TEXT,
+            sort_order INTEGER NOT NULL DEFAULT 0,
+            active INTEGER NOT NULL DEFAULT 1,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (unit, section_name, description)
+        )
+    ''')
+
+    c.execute("PRAGMA table_info(round_items)")
+    if 'item_definition_id' not in [info[1] for info in c.fetchall()]:
+        c.execute("ALTER TABLE round_items ADD COLUMN item_definition_id INTEGER REFERENCES item_definitions (id)")
+
+    # The mode of the first reading becomes the default mode
+    c.execute('''
+        INSERT OR IGNORE INTO item_definitions (unit, section_name, description, default_mode, sort_order)
+        SELECT unit, section_name, description, mode,
+               ROW_NUMBER() OVER (PARTITION BY unit, section_name ORDER BY first_id)
+        FROM (
+            SELECT TRIM(s.unit) AS unit, TRIM(s.section_name) AS section_name,
+                   TRIM(ri.description) AS description, ri.mode, MIN(ri.id) AS first_id
+            FROM round_items ri
+            JOIN sections s ON ri.section_id = s.id
+            WHERE TRIM(ri.description) != ''
+            GROUP BY TRIM(s.unit), TRIM(s.section_name), LOWER(TRIM(ri.description))
+        )
+    ''')
+
+    c.execute('''
+        UPDATE round_items SET item_definition_id = (
+            SELECT d.id
+            FROM sections s
+            JOIN item_definitions d
+                ON d.unit = TRIM(s.unit)
+                AND d.section_name = TRIM(s.section_name)
+                AND d.description = TRIM(round_items.description)
+            WHERE s.id = round_items.section_id
+        )
+        WHERE item_definition_id IS NULL
+    ''')
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_round_items_definition ON round_items (item_definition_id)")
+
+def _create_superseded_readings(c: sqlite3.Cursor) -> None:
+    """
+    Create superseded_round_items, which keeps readings that a migration
+    displaced from round_items.
+
+    round_item_id is the reading's id in round_items and superseded_by the
+    id of the reading it gave way to. Rows go with their section.
+    """
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS superseded_round_items (
+            id INTEGER PRIMARY KEY,
+            round_item_id INTEGER NOT NULL,
+            section_id INTEGER REFERENCES sections (id) ON DELETE CASCADE,
+            description TEXT NOT NULL,
+            value TEXT,
+            output TEXT,
+            mode TEXT,
+            timestamp DATETIME,
+            item_definition_id INTEGER REFERENCES item_definitions (id),
+            superseded_by INTEGER NOT NULL,
+            superseded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS idx_superseded_round_items_section
+        ON superseded_round_items (section_id)
+    ''')
+
+def _supersede_duplicate_readings(c: sqlite3.Cursor) -> int:
+    """
+    Keep only the newest reading per catalog item in each section.
+
+    Older readings are moved to superseded_round_items, not dropped.
+
+    Returns:
+        int: The number of readings moved
+    """
+    _create_superseded_readings(c)
+    c.execute('''
+        INSERT INTO superseded_round_items
+        (round_item_id, section_id, description, value, output, mode, timestamp,
+         item_definition_id, superseded_by)
+        SELECT ri.id, ri.section_id, ri.description, ri.value, ri.output, ri.mode, ri.timestamp,
+               ri.item_definition_id, newest.id
+        FROM round_items ri
+        JOIN (
+            SELECT section_id, item_definition_id, MAX(id) AS id
+            FROM round_items
+            WHERE item_definition_id IS NOT NULL
+            GROUP BY section_id, item_definition_id
+            HAVING COUNT(*) > 1
+        ) newest
+            ON ri.section_id IS newest.section_id
+            AND ri.item_definition_id = newest.item_definition_id
+        WHERE ri.id != newest.id
+    ''')
+    moved = c.rowcount
+    if moved:
+        # The same rows: every reading with a newer one of its item and section
+        c.execute('''
+            DELETE FROM round_items
+            WHERE item_definition_id IS NOT NULL
+            AND id NOT IN (
+                SELECT MAX(id) FROM round_items
+                WHERE item_definition_id IS NOT NULL
+                GROUP BY section_id, item_definition_id
+            )
+        ''')
+        if c.rowcount != moved:
+            raise sqlite3.IntegrityError(f"Moved {moved} superseded readings but removed {c.rowcount}")
+        logger.warning("Moved %d older duplicate reading(s) to superseded_round_items", moved)
+    return moved
+
+def _add_section_reading_key(c: sqlite3.Cursor) -> None:
+    """
+    Allow at most one reading per catalog item in a section.
+
+    The unique (section_id, item_definition_id) index is the conflict
+    target of save_round_section's UPSERT. Where a section already holds
+    several readings of an item, the older ones are moved to
+    superseded_round_items first. The index also serves every per-section
+    lookup, so the plain section_id index is dropped.
+    """
+    _supersede_duplicate_readings(c)
+    c.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_round_items_section_definition
+        ON round_items (section_id, item_definition_id)
+    ''')
+    c.execute("DROP INDEX IF EXISTS idx_round_items_section")
+
+def _merge_duplicate_definitions(c: sqlite3.Cursor) -> int:
+    """
+    Merge catalog items whose normalized keys are equal.
+
+    Migration 5 matched unit and section names exactly, so a section
+    recorded as "017 Alky I" / "Pumps" in one round and "017 alky i" /
+    "pumps" in another gave its items a definition each. The oldest
+    definition is kept and the readings of the others are repointed to it;
+    readings that then repeat an item within a section are superseded like
+    in migration 6. Expects the key columns to be filled in.
+
+    Returns:
+        int: The number of definitions merged away
+    """
+    c.execute('''
+        CREATE TEMP TABLE merged_definitions AS
+        SELECT id, kept_id FROM (
+            SELECT id, MIN(id) OVER (PARTITION BY unit_key, section_key, description_key) AS kept_id
+            FROM item_definitions
+        )
+        WHERE id != kept_id
+    ''')
+    merged = c.execute("SELECT COUNT(*) FROM temp.merged_definitions").fetchone()[0]
+    if merged:
+        # Repointing can repeat an item within a section until the duplicates are superseded
+        c.execute("DROP INDEX IF EXISTS idx_round_items_section_definition")
+        _create_superseded_readings(c)
+        for table in ("round_items", "superseded_round_items"):
+            c.execute(f'''
+                UPDATE {table}
+                SET item_definition_id = (
+                    SELECT kept_id FROM temp.merged_definitions m WHERE m.id = {table}.item_definition_id
                 )
+                WHERE item_definition_id IN (SELECT id FROM temp.merged_definitions)
             ''')
-            
+        c.execute("DELETE FROM item_definitions WHERE id IN (SELECT id FROM temp.merged_definitions)")
+        logger.warning("Merged %d item definition(s) that differed only in case or spacing", merged)
+
+        _supersede_duplicate_readings(c)
+        c.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_round_items_section_definition
+            ON round_items (section_id, item_definition_id)
+        ''')
+    c.execute("DROP TABLE temp.merged_definitions")
+    return merged
+
+def _add_normalized_keys(c: sqlite3.Cursor) -> None:
+    """
+    Store normalize_key() versions of unit, section and item names.
+
+    Lookups compare these indexed columns instead of LOWER(TRIM(...)),
+    which no index can serve. Catalog items that only differed in case or
+    spacing are merged before their keys are made unique. The latest-value
+    tables are derived data, so they are recreated keyed the same way.
+    """
+    # The backfill uses the same function as the application
+    c.connection.create_function("normalize_key", 1, normalize_key, deterministic=True)
+
+    for table, columns in [
+        ("sections", [("unit_key", "unit"), ("section_key", "section_name")]),
+        ("item_definitions", [("unit_key", "unit"), ("section_key", "section_name"),
+                              ("description_key", "description")]),
+    ]:
+        c.execute(f"PRAGMA table_info({table})")
+        existing = [info[1] for info in c.fetchall()]
+        for key_column, _ in columns:
+            if key_column not in existing:
+                c.execute(f"ALTER TABLE {table} ADD COLUMN {key_column} TEXT")
+        assignments = ", ".join(f"{key} = normalize_key({source})" for key, source in columns)
+        c.execute(f"UPDATE {table} SET {assignments}")
+
+    # Section lookups within a round; covers get_rounds_by_ids' section list
+    c.execute("DROP INDEX IF EXISTS idx_sections_round")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sections_round_key ON sections (round_id, unit_key, section_key)")
+
+    _merge_duplicate_definitions(c)
+    c.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_item_definitions_key
+        ON item_definitions (unit_key, section_key, description_key)
+    ''')
+
+    c.execute("DROP TABLE IF EXISTS latest_item_values")
+    c.execute("DROP TABLE IF EXISTS latest_sections")
+    c.execute('''
+        CREATE TABLE latest_sections (
+            round_type TEXT NOT NULL,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            unit_key TEXT NOT NULL,
+            section_key TEXT NOT NULL,
+            PRIMARY KEY (round_type, unit_key, section_key)
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE latest_item_values (
+            id INTEGER PRIMARY KEY,
+            round_type TEXT NOT NULL,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            unit_key TEXT NOT NULL,
+            section_key TEXT NOT NULL,
+            description_key TEXT NOT NULL,
+            value TEXT,
+            output TEXT,
+            mode TEXT,
+            round_id INTEGER,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (round_type, unit_key, section_key, description_key)
+        )
+    ''')
+    # Section editor renames and deletes apply across round types
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS idx_latest_item_values_key
+        ON latest_item_values (unit_key, section_key, description_key)
+    ''')
+
+def _add_utc_epoch_columns(c: sqlite3.Cursor) -> None:
+    """
+    Add an indexed integer UTC epoch (timestamp_utc) to rounds and round_items.
+
+    The TEXT timestamp columns hold CURRENT_TIMESTAMP values, which are UTC,
+    so the backfill is a direct conversion. Date filters become half-open
+    integer ranges on the new column, and the history indexes move to it.
+    """
+    for table in ("rounds", "round_items"):
+        c.execute(f"PRAGMA table_info({table})")
+        if 'timestamp_utc' not in [info[1] for info in c.fetchall()]:
+            c.execute(f"ALTER TABLE {table} ADD COLUMN timestamp_utc INTEGER")
+        c.execute(f"""
+            UPDATE {table}
+            SET timestamp_utc = CAST(strftime('%s', timestamp) AS INTEGER)
+            WHERE timestamp_utc IS NULL
+        """)
+
+    c.execute("DROP INDEX IF EXISTS idx_rounds_timestamp")
+    c.execute("DROP INDEX IF EXISTS idx_rounds_operator_timestamp")
+    c.execute("DROP INDEX IF EXISTS idx_rounds_type_timestamp")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rounds_utc ON rounds (timestamp_utc)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rounds_operator_utc ON rounds (operator_id, timestamp_utc)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rounds_type_utc ON rounds (round_type, timestamp_utc)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_round_items_utc ON round_items (timestamp_utc)")
+
+def _add_cascading_deletes(c: sqlite3.Cursor) -> None:
+    """
+    Rebuild sections and round_items with ON DELETE CASCADE foreign keys.
+
+    Deleting a round then removes its sections and readings in the same
+    statement. SQLite cannot alter a foreign key in place, so both tables
+    are copied into new ones following the documented 12-step procedure;
+    rows whose round or section no longer exists are left behind (with the
+    superseded readings of such sections), and the indexes are recreated
+    from their stored definitions.
+    """
+    c.execute('''
+        SELECT sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name IN ('sections', 'round_items') AND sql IS NOT NULL
+    ''')
+    index_definitions = [row[0] for row in c.fetchall()]
+
+    c.execute('''
+        CREATE TABLE sections_new (
+            id INTEGER PRIMARY KEY,
+            round_id INTEGER REFERENCES rounds (id) ON DELETE CASCADE,
+            unit TEXT NOT NULL,
+            section_name TEXT NOT NULL,
+            completed BOOLEAN DEFAULT 0,
+            unit_key TEXT,
+            section_key TEXT
+        )
+    ''')
+    c.execute('''
+        INSERT INTO sections_new (id, round_id, unit, section_name, completed, unit_key, section_key)
+        SELECT id, round_id, unit, section_name, completed, unit_key, section_key
+        FROM sections
+        WHERE round_id IN (SELECT id FROM rounds)
+    ''')
+
+    c.execute('''
+        CREATE TABLE round_items_new (
+            id INTEGER PRIMARY KEY,
+            section_id INTEGER REFERENCES sections (id) ON DELETE CASCADE,
+            description TEXT NOT NULL,
+            value TEXT,
+            output TEXT,
+            mode TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            item_definition_id INTEGER REFERENCES item_definitions (id),
+            timestamp_utc INTEGER
+        )
+    ''')
+    c.execute('''
+        INSERT INTO round_items_new
+        (id, section_id, description, value, output, mode, timestamp, item_definition_id, timestamp_utc)
+        SELECT id, section_id, description, value, output, mode, timestamp, item_definition_id, timestamp_utc
+        FROM round_items
+        WHERE section_id IN (SELECT id FROM sections_new)
+    ''')
+
+    # superseded_round_items already cascades from sections
+    c.execute("DELETE FROM superseded_round_items WHERE section_id NOT IN (SELECT id FROM sections_new)")
+    if c.rowcount:
+        logger.warning("Left behind %d superseded reading(s) of deleted sections", c.rowcount)
+
+    c.execute("DROP TABLE round_items")
+    c.execute("DROP TABLE sections")
+    c.execute("ALTER TABLE sections_new RENAME TO sections")
+    c.execute("ALTER TABLE round_items_new RENAME TO round_items")
+    for index_sql in index_definitions:
+        c.execute(index_sql)
+
+    c.execute("PRAGMA foreign_key_check")
+    violations = c.fetchall()
+    if violations:
+        raise sqlite3.IntegrityError(f"Foreign key violations after rebuild: {violations[:5]}")
+
+def _analyze_tables(c: sqlite3.Cursor) -> None:
+    """
+    Collect planner statistics (sqlite_stat1).
+
+    Without them SQLite assumes every table is the same size and can pick
+    plans that read every reading; plan_check's representative statistics
+    describe what an analyzed database gives the planner. analysis_limit
+    samples each index so the step stays quick on large files;
+    vacuum-analyze refreshes the statistics in full.
+    """
+    c.execute("PRAGMA analysis_limit = 1000")
+    c.execute("ANALYZE")
+    c.execute("PRAGMA analysis_limit = 0")
+
+# Ordered list of schema upgrades. Append new steps; never edit or reorder
+# a step that has already shipped.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create base tables", _create_base_tables),
+    Migration(2, "Add mode column to round_items", _add_round_items_mode),
+    Migration(3, "Add indexes for history and round lookups", _create_join_path_indexes),
+    Migration(4, "Add materialized latest item values", _create_latest_value_tables,
+              rebuild_latest_values=True),
+    Migration(5, "Add item definition catalog", _create_item_catalog, rebuild_latest_values=True),
+    Migration(6, "Add unique reading key per section item", _add_section_reading_key),
+    Migration(7, "Add normalized name key columns", _add_normalized_keys, rebuild_latest_values=True),
+    Migration(8, "Add UTC epoch timestamps", _add_utc_epoch_columns),
+    Migration(9, "Cascade round deletes to sections and readings", _add_cascading_deletes,
+              disable_foreign_keys=True),
+    Migration(10, "Collect query planner statistics", _analyze_tables),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+# The first version whose latest-value tables latest_values._rebuild can
+# fill (migration 7 recreated them keyed by the normalized names)
+LATEST_VALUES_VERSION = 7
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def get_pending_migrations(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    List the migrations that still need to run.
+
+    Args:
+        conn (sqlite3.Connection): An open database connection
+        target (int, optional): Stop at this version instead of the latest
+
+    Returns:
+        List[Migration]: Pending migrations in the order they must be applied
+    """
+    current = get_schema_version(conn)
+    target = SCHEMA_VERSION if target is None else target
+    return [m for m in MIGRATIONS if current < m.version <= target]
+
+def apply_migrations(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations, each in its own transaction.
+
+    The version is re-read inside every transaction so that two processes
+    starting at the same time never apply the same step twice. If any
+    step up to the target is marked rebuild_latest_values, the latest-value
+    tables are rebuilt once, inside the transaction of the last step up to
+    the target, provided that is at least LATEST_VALUES_VERSION. A run that
+    stops below it leaves the rebuild to the later run that applies
+    migration 7, which recreates the tables.
+
+    Args:
+        conn (sqlite3.Connection): A writable database connection
+        target (int, optional): Stop at this version instead of the latest
+
+    Returns:
+        List[Migration]: The migrations that were applied
+    """
+    applied = []
+    pending = get_pending_migrations(conn, target)
+    rebuild_latest = any(m.rebuild_latest_values for m in pending)
+    last_version = pending[-1].version if pending else None
+
+    for migration in pending:
+        foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        if migration.disable_foreign_keys:
+            conn.execute("PRAGMA foreign_keys = OFF")
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+
+            c = conn.cursor()
+            migration.apply(c)
+            if rebuild_latest and migration.version == last_version >= LATEST_VALUES_VERSION:
+                latest_values._rebuild(c)
+            c.execute(f"PRAGMA user_version = {int(migration.version)}")
             conn.commit()
-            return True
-            
-    except sqlite3.Error as e:
-        print(f"Database initialization error: {str(e)}")
-        return False
-    
\ No newline at end of file
+            applied.append(migration)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if migration.disable_foreign_keys:
+                conn.execute(f"PRAGMA foreign_keys = {int(foreign_keys)}")
+
+    return applied
+
+# Database paths already migrated by this process
+_migrated_paths = set()
+_migration_lock = threading.Lock()
+
+def ensure_schema() -> Tuple[bool, str]:
+    """
+    Bring the configured database up to date, once per process.
+
+    Returns:
+        Tuple[bool, str]: (success, message)
+    """
+    database_path = get_database_path()
+    if database_path in _migrated_paths:
+        return True, f"Schema version {SCHEMA_VERSION} (already checked)"
+
+    with _migration_lock:
+        if database_path in _migrated_paths:
+            return True, f"Schema version {SCHEMA_VERSION} (already checked)"
+
+        try:
+            with get_db_connection() as conn:
+                applied = apply_migrations(conn)
+        except sqlite3.Error as e:
+            return False, f"Database migration error: {str(e)}"
+
+        _migrated_paths.add(database_path)
+
+    if applied:
+        steps = ", ".join(f"{m.version} ({m.description})" for m in applied)
+        return True, f"Applied migrations: {steps}"
+    return True, f"Schema version {SCHEMA_VERSION} is up to date"
+
+def init_db():
+    """Initialize SQLite database by applying any pending migrations"""
+    success, message = ensure_schema()
+    if not success:
+        print(f"Database initialization error: {message}")
+    return success
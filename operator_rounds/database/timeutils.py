@@ -0,0 +1,86 @@
+"""
+Time handling for Operator Rounds Tracking.
+
+Rounds and readings are stored with an integer ``timestamp_utc`` column
+(seconds since the Unix epoch, UTC). Conversion to and from local time
+happens only at the edges: date filters are turned into half-open UTC
+epoch ranges before they reach SQL, and stored epochs are converted back to
+local time for display and export.
+
+Local time is the server's time zone unless DEFAULTS["timezone"] names an
+IANA zone.
+"""
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from operator_rounds.config import DEFAULTS
+
+# SQL expression for "now" as a UTC epoch; evaluates to the same instant as
+# CURRENT_TIMESTAMP within one statement
+SQL_UTC_NOW_EPOCH = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+def _local_zone() -> Optional[tzinfo]:
+    """Return the configured time zone, or None for the server's local time."""
+    name = DEFAULTS.get("timezone")
+    return ZoneInfo(name) if name else None
+
+def utc_now_epoch() -> int:
+    """Return the current time as a UTC epoch."""
+    return int(datetime.now().timestamp())
+
+def local_today() -> date:
+    """Return today's date in local time."""
+    return datetime.now(_local_zone()).date()
+
+def local_datetime_epoch(value: datetime) -> int:
+    """Return the UTC epoch of a naive local datetime."""
+    zone = _local_zone()
+    if zone is not None:
+        value = value.replace(tzinfo=zone)
+    # Naive datetimes are interpreted as server local time, DST included
+    return int(value.timestamp())
+
+def local_midnight_epoch(day: date) -> int:
+    """Return the UTC epoch of local midnight at the start of a day."""
+    return local_datetime_epoch(datetime.combine(day, time.min))
+
+def local_date_range(start_date: date, end_date: date) -> Tuple[int, int]:
+    """
+    Convert an inclusive range of local dates to a half-open epoch range.
+
+    Args:
+        start_date (date): First local day in the range
+        end_date (date): Last local day in the range
+
+    Returns:
+        Tuple[int, int]: (start, end) such that start <= timestamp_utc < end
+    """
+    return local_midnight_epoch(start_date), local_midnight_epoch(end_date + timedelta(days=1))
+
+def recent_days_range(days: int) -> Tuple[int, int]:
+    """Return the epoch range from local midnight ``days`` days ago through the end of today."""
+    today = local_today()
+    return local_date_range(today - timedelta(days=days), today)
+
+def epoch_to_local(epoch: Optional[int]) -> Optional[datetime]:
+    """Convert a stored UTC epoch to a local datetime."""
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch, _local_zone())
+
+def format_epoch(epoch: Optional[int], date_format: Optional[str] = None) -> str:
+    """
+    Format a stored UTC epoch as local time.
+
+    Args:
+        epoch (int, optional): Seconds since the epoch, UTC
+        date_format (str, optional): strftime format; defaults to DEFAULTS["date_format"]
+
+    Returns:
+        str: The formatted local time, or an empty string for missing values
+    """
+    local = epoch_to_local(epoch)
+    if local is None:
+        return ""
+    return local.strftime(date_format or DEFAULTS.get("date_format", "%Y-%m-%d %H:%M:%S"))
@@ -12,6 +12,9 @@ from datetime import datetime
 import hashlib
 from operator_rounds.utils.validation import validate_input_data, ValidationError
 from operator_rounds.database.connection import get_db_connection
+from operator_rounds.database.models import normalize_key
+from operator_rounds.database.queries import find_section_id, upsert_section_items
+from operator_rounds.database.item_catalog import find_item_definition_id, rename_item_definition
 
 def generate_unique_form_key(unit, section, prefix=""):
     """
@@ -363,53 +366,34 @@ def save_item_to_database(unit_name, section_name, item_data):
     
     try:
         with get_db_connection() as conn:
-            conn.execute("BEGIN TRANSACTION")
+            conn.execute("BEGIN IMMEDIATE")
             c = conn.cursor()
             
-            # Find or create the section
-            c.execute('''
-                SELECT id FROM sections 
-                WHERE round_id = ? AND LOWER(TRIM(unit)) = LOWER(TRIM(?)) 
-                AND LOWER(TRIM(section_name)) = LOWER(TRIM(?))
-            ''', (st.session_state.current_round_id, unit_name, section_name))
-            
-            section_result = c.fetchone()
-            
-            if section_result:
-                section_id = section_result[0]
-            else:
-                # Create new section
-                c.execute('''
-                    INSERT INTO sections (round_id, unit, section_name)
-                    VALUES (?, ?, ?)
-                ''', (st.session_state.current_round_id, unit_name, section_name))
-                section_id = c.lastrowid
-            
             # Check if item already exists (for update)
             original_desc = item_data.get("original_description")
             new_desc = item_data["description"]
+            lookup_desc = original_desc or new_desc
+            
+            # Find this round's reading of the item through its catalog entry
+            section_id = find_section_id(c, st.session_state.current_round_id, unit_name, section_name)
+            definition_id = find_item_definition_id(c, unit_name, section_name, lookup_desc)
+            c.execute('''
+                SELECT id FROM round_items 
+                WHERE section_id = ? AND item_definition_id = ?
+            ''', (section_id, definition_id))
+            
+            item_result = c.fetchone()
             
             if original_desc:
-                # This is an update - find the existing item
-                c.execute('''
-                    SELECT id FROM round_items 
-                    WHERE section_id = ? AND LOWER(TRIM(description)) = LOWER(TRIM(?))
-                ''', (section_id, original_desc))
-                
-                item_result = c.fetchone()
-                
+                # This is an update
                 if item_result:
-                    # Update the item
-                    item_id = item_result[0]
-                    c.execute('''
-                        UPDATE round_items 
-                        SET description = ?, value = ?, output = ?, mode = ?
-                        WHERE id = ?
-                    ''', (new_desc, 
-                          item_data["value"], 
-                          item_data["output"], 
-                          item_data["mode"], 
-                          item_id))
+                    # A new description renames the item's catalog entry
+                    if normalize_key(original_desc) != normalize_key(new_desc):
+                        rename_item_definition(c, unit_name, section_name, original_desc,
+                                               new_desc, item_data["mode"])
+                    
+                    upsert_section_items(c, st.session_state.current_round_id, unit_name, section_name,
+                                         [item_data])
                     
                     conn.commit()
                     return (True, f"Item '{new_desc}' updated successfully")
@@ -418,23 +402,13 @@ def save_item_to_database(unit_name, section_name, item_data):
                     return (False, f"Item '{original_desc}' not found for update")
             else:
                 # This is a new item - check if description already exists
-                c.execute('''
-                    SELECT id FROM round_items 
-                    WHERE section_id = ? AND LOWER(TRIM(description)) = LOWER(TRIM(?))
-                ''', (section_id, new_desc))
-                
-                if c.fetchone():
+                if item_result:
                     conn.rollback()
                     return (False, f"An item with description '{new_desc}' already exists")
                 
-                # Insert new item
-                c.execute('''
-                    INSERT INTO round_items (section_id, description, value, output, mode)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (section_id, new_desc, 
-                      item_data["value"], 
-                      item_data["output"], 
-                      item_data["mode"]))
+                # Insert new item (and its section, if needed)
+                upsert_section_items(c, st.session_state.current_round_id, unit_name, section_name,
+                                     [item_data])
                 
                 conn.commit()
                 return (True, f"Item '{new_desc}' added successfully")
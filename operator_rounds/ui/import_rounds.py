@@ -0,0 +1,70 @@
+"""
+Import rounds UI components for Operator Rounds Tracking.
+
+This module provides the page for importing historical rounds from CSV
+files (see utils/csv_import.py). It is only offered when
+FEATURES["import_csv"] is enabled.
+"""
+import streamlit as st
+import sqlite3
+from operator_rounds.database.bulk_load import BulkLoader
+from operator_rounds.utils.csv_import import ImportFormatError, format_report, import_parsed_file, parse_import_file
+
+def render_import_page():
+    """
+    Render the CSV import page.
+
+    Uploaded files are parsed and validated first; the rows that would be
+    rejected are shown with their reasons and can be downloaded. The valid
+    rows are written when the user confirms the import.
+    """
+    st.write("Files can be bulk exports (one row per reading) or single round "
+             "exports that include metadata. Rounds already in the database are skipped.")
+
+    uploads = st.file_uploader(
+        "CSV files", type=["csv"], accept_multiple_files=True, key="import_files"
+    )
+    if not uploads:
+        return
+
+    parsed_files = []
+    for upload in uploads:
+        try:
+            parsed = parse_import_file(upload, upload.name)
+        except (ImportFormatError, ValueError) as e:
+            st.error(f"Cannot import {upload.name}: {str(e)}")
+            continue
+        parsed_files.append(parsed)
+
+        rounds = parsed.rows["round_key"].nunique()
+        st.write(f"**{parsed.name}:** {rounds} rounds, {len(parsed.rows)} valid rows, "
+                 f"{len(parsed.rejects)} rejected")
+        if not parsed.rejects.empty:
+            with st.expander(f"Rejected rows of {parsed.name}", expanded=False):
+                st.dataframe(parsed.rejects, use_container_width=True, hide_index=True)
+                st.download_button(
+                    label="Download rejected rows",
+                    data=parsed.rejects.to_csv(index=False),
+                    file_name=parsed.name.rsplit(".", 1)[0] + ".rejected.csv",
+                    mime="text/csv",
+                    key=f"import_rejects_{parsed.name}"
+                )
+
+    if not any(len(parsed.rows) for parsed in parsed_files):
+        return
+
+    if st.button("Import", type="primary", key="import_confirm"):
+        loader = BulkLoader()
+        try:
+            with st.spinner("Importing..."):
+                reports = [import_parsed_file(parsed, loader) for parsed in parsed_files]
+                loader.finish()
+        except sqlite3.Error as e:
+            st.error(f"Import error: {str(e)}")
+            if st.session_state.get('debug_mode', False):
+                st.exception(e)
+            return
+
+        for report in reports:
+            st.write(format_report(report))
+        st.success(f"Imported {loader.rounds_loaded} rounds")
@@ -9,7 +9,7 @@ import logging
 import sqlite3
 import traceback
 from operator_rounds.database.connection import get_db_connection
-from operator_rounds.database.queries import start_round, save_round_section
+from operator_rounds.ui.session import start_session_round, save_session_section
 from operator_rounds.utils.validation import validate_input_data
 
 def render_round_completion(unit):
@@ -52,7 +52,7 @@ def render_round_completion(unit):
     
     # Create a new round if one hasn't been started
     if not hasattr(st.session_state, 'current_round_id') or not st.session_state.current_round_id:
-        round_id = start_round(unit)
+        round_id = start_session_round()
         if not round_id:
             st.error("Failed to start round. Please ensure operator name is entered.")
             return
@@ -247,9 +247,9 @@ def handle_section_form_submission(unit, current_section, sections, sections_lis
         
         # Save the current section data
         sections[current_section]["items"] = updated_items
-        save_success = save_round_section(unit, current_section, {"items": updated_items})
+        item_outcomes = save_session_section(unit, current_section, updated_items)
         
-        if not save_success:
+        if item_outcomes is None:
             st.error("Failed to save section data")
             return
         
@@ -12,7 +12,27 @@ import sqlite3
 from operator_rounds.database.connection import get_db_connection
 from operator_rounds.utils.validation import validate_input_data, ValidationError
 from operator_rounds.utils.helpers import generate_unique_form_key
-from operator_rounds.database.queries import save_round_section
+from operator_rounds.database.queries import upsert_section_items
+from operator_rounds.database.models import normalize_key
+from operator_rounds.database.latest_values import rename_latest_item, delete_latest_item
+from operator_rounds.database.item_catalog import (
+    find_item_definition_id,
+    rename_item_definition,
+    retire_item_definition
+)
+
+# Edits and deletes apply to the reading of the current round only
+UPDATE_ROUND_READING_SQL = '''
+    UPDATE round_items
+    SET description = ?, value = ?, output = ?, mode = ?
+    WHERE item_definition_id = ?
+    AND section_id IN (SELECT id FROM sections WHERE round_id = ?)
+'''
+DELETE_ROUND_READING_SQL = '''
+    DELETE FROM round_items
+    WHERE item_definition_id = ?
+    AND section_id IN (SELECT id FROM sections WHERE round_id = ?)
+'''
 
 def render_section_editor(unit, section):
     """
@@ -323,62 +343,24 @@ def process_add_item_form_submission(submitted, canceled, unit_name, section_nam
                             st.write("Debug - Database connection successful")
                         
                         # Start a transaction
-                        conn.execute("BEGIN TRANSACTION")
+                        conn.execute("BEGIN IMMEDIATE")
                         
                         try:
-                            # Check if section exists first
-                            c.execute('''
-                                SELECT id FROM sections 
-                                WHERE round_id = ? AND LOWER(TRIM(unit)) = LOWER(TRIM(?)) 
-                                AND LOWER(TRIM(section_name)) = LOWER(TRIM(?))
-                            ''', (st.session_state.current_round_id, unit_name, section_name))
-                            
-                            section_result = c.fetchone()
-                            
-                            if section_result:
-                                section_id = section_result[0]
-                                if st.session_state.get('debug_mode', False):
-                                    st.write(f"Debug - Found existing section ID: {section_id}")
-                            else:
-                                # Create a new section
-                                if st.session_state.get('debug_mode', False):
-                                    st.write(f"Debug - Creating new section")
-                                
-                                c.execute('''
-                                    INSERT INTO sections (round_id, unit, section_name)
-                                    VALUES (?, ?, ?)
-                                ''', (st.session_state.current_round_id, unit_name, section_name))
-                                
-                                section_id = c.lastrowid
-                                if st.session_state.get('debug_mode', False):
-                                    st.write(f"Debug - Created new section with ID: {section_id}")
-                            
-                            # Now insert the item
-                            if st.session_state.get('debug_mode', False):
-                                st.write(f"Debug - Inserting item for section ID: {section_id}")
-                            
-                            c.execute('''
-                                INSERT INTO round_items 
-                                (section_id, description, value, output, mode)
-                                VALUES (?, ?, ?, ?, ?)
-                            ''', (section_id, 
-                                  description.strip(), 
-                                  value.strip(), 
-                                  output.strip(),
-                                  mode.strip()))
-                            
-                            # Get the new item ID
-                            item_id = c.lastrowid
-                            if st.session_state.get('debug_mode', False):
-                                st.write(f"Debug - Item inserted with ID: {item_id}")
-                            
-                            # Update session state with the new item
-                            section_data["items"].append({
+                            new_item = {
                                 "description": description.strip(),
                                 "value": value.strip(),
                                 "output": output.strip(),
                                 "mode": mode.strip()
-                            })
+                            }
+                            
+                            # Find or create the section and write the reading
+                            outcomes = upsert_section_items(c, st.session_state.current_round_id,
+                                                            unit_name, section_name, [new_item])
+                            if st.session_state.get('debug_mode', False):
+                                st.write(f"Debug - Item outcome: {outcomes}")
+                            
+                            # Update session state with the new item
+                            section_data["items"].append(new_item)
                             
                             # Commit the transaction
                             conn.commit()
@@ -583,86 +565,52 @@ def process_edit_item_form_submission(save_changes, delete_item, unit_name, sect
                     c = conn.cursor()
                     
                     # Start transaction
-                    conn.execute("BEGIN TRANSACTION")
+                    conn.execute("BEGIN IMMEDIATE")
                     
-                    # Improved section lookup that's more tolerant of differences
-                    if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Looking for sections with unit='{unit_name}', section='{section_name}' in ANY round")
-
-                    # Get all sections matching the unit and section name across ALL rounds
-                    c.execute('''
-                        SELECT id, round_id FROM sections 
-                        WHERE LOWER(TRIM(unit)) = LOWER(TRIM(?)) 
-                        AND LOWER(TRIM(section_name)) = LOWER(TRIM(?))
-                    ''', (unit_name, section_name))
+                    definition_id = find_item_definition_id(c, unit_name, section_name, original_desc)
                     
-                    section_results = c.fetchall()
-
                     if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Found {len(section_results)} matching sections across all rounds")
-                        for sec in section_results:
-                            st.write(f"  Section ID: {sec[0]}, Round ID: {sec[1]}")
+                        st.write(f"Debug - Catalog entry for '{original_desc}': {definition_id}")
                     
-                    if not section_results:
-                        raise Exception(f"No sections found with unit '{unit_name}' and name '{section_name}' in any round")
+                    if definition_id is None:
+                        conn.rollback()
+                        section_data["items"][idx] = original_item
+                        st.error(f"Could not find any items with description '{original_desc}' to update")
+                        return
                     
-                    # Check if the new description would conflict with any existing item
-                    if original_desc.lower() != edited_desc.lower():
-                        for section_id, _ in section_results:
-                            c.execute('''
-                                SELECT COUNT(*) FROM round_items 
-                                WHERE section_id = ? AND LOWER(TRIM(description)) = LOWER(TRIM(?))
-                            ''', (section_id, edited_desc))
-                            
-                            if c.fetchone()[0] > 0:
-                                conn.rollback()
-                                st.error("An item with this description already exists. Please use a different description.")
-                                section_data["items"][idx] = original_item
-                                return
+                    # Check if the new description would conflict with another item
+                    if normalize_key(original_desc) != normalize_key(edited_desc):
+                        existing_id = find_item_definition_id(c, unit_name, section_name, edited_desc)
+                        if existing_id is not None and existing_id != definition_id:
+                            conn.rollback()
+                            st.error("An item with this description already exists. Please use a different description.")
+                            section_data["items"][idx] = original_item
+                            return
                     
-                    # Update items across ALL relevant sections
-                    updated_count = 0
+                    # Renaming is one catalog change; readings from earlier
+                    # rounds keep the description they were recorded under
+                    rename_item_definition(c, unit_name, section_name, original_desc,
+                                           edited_desc, edited_mode)
                     
-                    for section_id, _ in section_results:
-                        c.execute('''
-                            SELECT id FROM round_items 
-                            WHERE section_id = ? AND LOWER(TRIM(description)) = LOWER(TRIM(?))
-                        ''', (section_id, original_desc))
-                        
-                        item_results = c.fetchall()
-                        
-                        for item_row in item_results:
-                            item_id = item_row[0]
-                            
-                            c.execute('''
-                                UPDATE round_items 
-                                SET description = ?, value = ?, output = ?, mode = ?
-                                WHERE id = ?
-                            ''', (edited_desc.strip(), 
+                    # Correct the reading of the current round, if recorded
+                    if st.session_state.current_round_id:
+                        c.execute(UPDATE_ROUND_READING_SQL, (edited_desc.strip(), 
                                   edited_value.strip(), 
                                   edited_output.strip(), 
                                   edited_mode.strip(), 
-                                  item_id))
-                            
-                            updated_count += 1
+                                  definition_id,
+                                  st.session_state.current_round_id))
                     
-                    if updated_count > 0:
-                        # Force refresh on next load
-                        st.session_state.rounds_data_needs_refresh = True
-                        
-                        # Commit changes
-                        conn.commit()
-                        
-                        if st.session_state.get('debug_mode', False):
-                            st.write(f"Debug - Updated {updated_count} items across all sections")
-                        
-                        st.success(f"Item updated successfully in {updated_count} places!")
-                        st.rerun()
-                    else:
-                        # No items found with this description
-                        conn.rollback()
-                        section_data["items"][idx] = original_item
-                        st.error(f"Could not find any items with description '{original_desc}' to update")
+                    rename_latest_item(c, unit_name, section_name, original_desc, section_data["items"][idx])
+                    
+                    # Force refresh on next load
+                    st.session_state.rounds_data_needs_refresh = True
+                    
+                    # Commit changes
+                    conn.commit()
+                    
+                    st.success("Item updated successfully!")
+                    st.rerun()
             
             except Exception as e:
                 # Handle errors
@@ -703,53 +651,28 @@ def process_edit_item_form_submission(save_changes, delete_item, unit_name, sect
             if st.session_state.get('debug_mode', False):
                 st.write(f"Debug - Item description: '{deleted_item['description']}'")
             
-            # Delete the item directly from the database
+            # Remove the item from the catalog; readings from earlier rounds stay
             try:
                 with get_db_connection() as conn:
                     c = conn.cursor()
                     
                     # Start transaction
-                    conn.execute("BEGIN TRANSACTION")
-                    
-                    # Improved section lookup that's more tolerant of differences
-                    if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Looking for sections with unit='{unit_name}', section='{section_name}' in ANY round")
-                
-                    # Get all sections matching the unit and section name across ALL rounds
-                    c.execute('''
-                        SELECT id, round_id FROM sections 
-                        WHERE LOWER(TRIM(unit)) = LOWER(TRIM(?)) 
-                        AND LOWER(TRIM(section_name)) = LOWER(TRIM(?))
-                    ''', (unit_name, section_name))
+                    conn.execute("BEGIN IMMEDIATE")
                     
-                    section_results = c.fetchall()
+                    definition_id = find_item_definition_id(c, unit_name, section_name, deleted_desc)
                     
                     if st.session_state.get('debug_mode', False):
-                        st.write(f"Debug - Found {len(section_results)} matching sections across all rounds")
-                        for sec in section_results:
-                            st.write(f"  Section ID: {sec[0]}, Round ID: {sec[1]}")
+                        st.write(f"Debug - Catalog entry for '{deleted_desc}': {definition_id}")
                     
-                    if not section_results:
-                        raise Exception(f"No sections found with unit '{unit_name}' and name '{section_name}' in any round")
-                    
-                    # Delete items across ALL relevant sections
-                    deleted_count = 0
-                    
-                    for section_id, _ in section_results:
-                        c.execute('''
-                            SELECT id FROM round_items 
-                            WHERE section_id = ? AND LOWER(TRIM(description)) = LOWER(TRIM(?))
-                        ''', (section_id, deleted_desc))
+                    if definition_id is not None:
+                        retire_item_definition(c, unit_name, section_name, deleted_desc)
                         
-                        item_results = c.fetchall()
+                        # Drop the reading of the current round, if recorded
+                        if st.session_state.current_round_id:
+                            c.execute(DELETE_ROUND_READING_SQL, (definition_id, st.session_state.current_round_id))
+                        
+                        delete_latest_item(c, unit_name, section_name, deleted_desc)
                         
-                        for item_row in item_results:
-                            item_id = item_row[0]
-                            
-                            c.execute('DELETE FROM round_items WHERE id = ?', (item_id,))
-                            deleted_count += 1
-                    
-                    if deleted_count > 0:
                         # Remove from session state
                         section_data["items"].pop(idx)
                         
@@ -759,10 +682,7 @@ def process_edit_item_form_submission(save_changes, delete_item, unit_name, sect
                         # Commit changes
                         conn.commit()
                         
-                        if st.session_state.get('debug_mode', False):
-                            st.write(f"Debug - Deleted {deleted_count} items across all sections")
-                        
-                        st.success(f"Item deleted successfully from {deleted_count} places!")
+                        st.success("Item deleted successfully!")
                         st.rerun()
                     else:
                         # No items found with this description
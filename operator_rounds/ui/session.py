@@ -0,0 +1,117 @@
+"""
+Streamlit adapters for the data-access layer of Operator Rounds Tracking.
+
+database/queries.py and utils/export.py take explicit arguments and raise
+on errors, so that they can be used outside a browser session. The
+functions here supply those arguments from st.session_state and turn
+errors into messages on the page; debug details are shown in debug mode.
+"""
+import streamlit as st
+import sqlite3
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+from operator_rounds.database.queries import (
+    ITEM_INSERTED, ITEM_UNCHANGED, ITEM_UPDATED, start_round, save_round_section
+)
+from operator_rounds.utils.export import ExportError, get_round_export
+
+def _show_debug_error(context: str, error: Exception) -> None:
+    """Write an error and its traceback to the page in debug mode."""
+    if st.session_state.get('debug_mode', False):
+        st.write(f"Debug - Error in {context}: {str(error)}")
+        st.write(traceback.format_exc())
+
+def start_session_round() -> Optional[int]:
+    """
+    Start a round for the session's operator, shift and round sheet.
+
+    Returns:
+        Optional[int]: The ID of the new round, or None if it could not be created
+    """
+    if st.session_state.get('debug_mode', False):
+        st.write("Debug - Attempting to start round with:")
+        st.write(f"Operator: {st.session_state.operator_name}")
+        st.write(f"Round type: {st.session_state.current_round}")
+        st.write(f"Shift: {st.session_state.shift}")
+
+    try:
+        round_id = start_round(
+            st.session_state.current_round, st.session_state.operator_name, st.session_state.shift
+        )
+    except sqlite3.Error as e:
+        _show_debug_error("start_round", e)
+        return None
+
+    if st.session_state.get('debug_mode', False):
+        st.write(f"Debug - Created round with ID: {round_id}")
+    return round_id
+
+def save_session_section(unit: str, section: str, items: List[Dict[str, Any]]) -> Optional[Dict[str, str]]:
+    """
+    Save a section of the session's current round.
+
+    Args:
+        unit (str): The unit name
+        section (str): The section name
+        items (List[Dict[str, Any]]): Items with description/value/output/mode
+
+    Returns:
+        Optional[Dict[str, str]]: Outcome per item description, or None if
+            the section could not be saved
+    """
+    if st.session_state.get('debug_mode', False):
+        st.write("Debug - save_round_section function called")
+        st.write(f"Debug - Unit: {unit}, Section: {section}")
+        st.write(f"Debug - Items count: {len(items)}")
+
+    # Verify we have a valid round ID
+    if not st.session_state.get('current_round_id'):
+        st.error("No active round found. Please start a new round.")
+        return None
+
+    try:
+        outcomes = save_round_section(st.session_state.current_round_id, unit, section, items)
+    except sqlite3.Error as e:
+        st.error(f"Error saving section: {str(e)}")
+        _show_debug_error("save_round_section", e)
+        return None
+
+    if st.session_state.get('debug_mode', False):
+        counts = {outcome: list(outcomes.values()).count(outcome)
+                  for outcome in (ITEM_INSERTED, ITEM_UPDATED, ITEM_UNCHANGED)}
+        st.write(f"Debug - Item outcomes: {counts}")
+    return outcomes
+
+def get_session_round_export(round_id: int) -> Optional[Tuple[str, str]]:
+    """
+    Return the CSV export of a round with the session's metadata setting.
+
+    Returns:
+        Optional[Tuple[str, str]]: (csv_string, filename), or None after
+            showing the error if the round could not be exported
+    """
+    try:
+        return get_round_export(round_id, st.session_state.get('include_metadata', True))
+    except (ExportError, sqlite3.Error) as e:
+        st.error(f"Export error: {str(e)}")
+        _show_debug_error("export_round_to_csv", e)
+        return None
+
+def toggle_expand_all(unit_name: str, sections: List[str]) -> None:
+    """
+    Helper function to handle expand/collapse all functionality for a unit's sections.
+
+    Args:
+        unit_name (str): The name of the unit
+        sections (List[str]): List of section names in the unit
+    """
+    unit_sections = {f"{unit_name}_{section}" for section in sections}
+
+    if not hasattr(st.session_state, 'expanded_sections'):
+        st.session_state.expanded_sections = set()
+
+    # If all sections are expanded, collapse all. Otherwise, expand all
+    if unit_sections.issubset(st.session_state.expanded_sections):
+        st.session_state.expanded_sections -= unit_sections
+    else:
+        st.session_state.expanded_sections.update(unit_sections)
@@ -4,12 +4,14 @@ Sidebar UI components for Operator Rounds Tracking.
 This module handles all sidebar-related UI elements including:
 - Round type selection
 - Operator information input and display
-- Navigation buttons for viewing rounds and changing operators
+- Navigation buttons for viewing rounds, changing operators and importing rounds
 """
 import streamlit as st
 import sqlite3
+from operator_rounds.config import FEATURES
 from operator_rounds.database.connection import get_db_connection
-from operator_rounds.database.queries import start_round
+from operator_rounds.database.queries import upsert_section_items
+from operator_rounds.ui.session import start_session_round
 
 def render_sidebar():
     """
@@ -80,7 +82,7 @@ def render_operator_login_form():
                 st.session_state.operator_info_set = True
                 
                 # Start an initial round immediately
-                round_id = start_round(st.session_state.current_round)
+                round_id = start_session_round()
                 if round_id:
                     st.session_state.current_round_id = round_id
                     
@@ -100,7 +102,8 @@ def render_operator_info():
     
     This is shown when an operator is already logged in and displays:
     1. The current operator's name and shift
-    2. Navigation buttons for viewing previous rounds or changing operator
+    2. Navigation buttons for viewing previous rounds or changing operator,
+       and for importing rounds when FEATURES["import_csv"] is enabled
     """
     st.write("---")  # Visual separator
     st.write(f"**Operator:** {st.session_state.operator_name}")
@@ -116,6 +119,11 @@ def render_operator_info():
         if st.button("Change Operator", use_container_width=True):
             st.session_state.operator_info_set = False
             st.rerun()
+    
+    if FEATURES.get("import_csv", False):
+        if st.button("Import Rounds", use_container_width=True):
+            st.session_state.importing_rounds = True
+            st.rerun()
 
 def process_pending_sections(round_id):
     """
@@ -129,26 +137,11 @@ def process_pending_sections(round_id):
             for section_name, section_data in sections.items():
                 # Save each pending section to the database
                 with get_db_connection() as conn:
-                    conn.execute("BEGIN TRANSACTION")
+                    conn.execute("BEGIN IMMEDIATE")
                     try:
-                        c = conn.cursor()
-                        c.execute('''
-                            INSERT INTO sections (round_id, unit, section_name)
-                            VALUES (?, ?, ?)
-                        ''', (round_id, unit_name, section_name))
-                        
-                        # If there are any items, save those too
-                        section_id = c.lastrowid
-                        for item in section_data.get("items", []):
-                            c.execute('''
-                                INSERT INTO round_items 
-                                (section_id, description, value, output, mode)
-                                VALUES (?, ?, ?, ?, ?)
-                            ''', (section_id, 
-                                  item.get("description", ""), 
-                                  item.get("value", ""), 
-                                  item.get("output", ""),
-                                  item.get("mode", "")))
+                        # Creates the section and saves any items with it
+                        upsert_section_items(conn.cursor(), round_id, unit_name, section_name,
+                                             section_data.get("items", []))
                         
                         conn.commit()
                     except sqlite3.Error as e:
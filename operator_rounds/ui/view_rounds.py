@@ -6,11 +6,40 @@ including filtering, sorting, and exporting round data.
 """
 import streamlit as st
 import pandas as pd
+import os
 import sqlite3
 import traceback
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from operator_rounds.database.connection import get_db_connection
-from operator_rounds.utils.export import export_round_to_csv
+from operator_rounds.config import DEFAULTS, FEATURES
+from operator_rounds.database.connection import get_data_version, get_db_connection
+from operator_rounds.database.query_cache import cached_query
+from operator_rounds.database.history import HistoryFilter
+from operator_rounds.database.reference_data import get_operator_names, get_round_types, get_unit_names
+from operator_rounds.database.timeutils import format_epoch, local_date_range, recent_days_range
+from operator_rounds.utils.bulk_export import export_rounds_to_file
+from operator_rounds.ui.session import get_session_round_export
+from operator_rounds.utils.pivot_export import ROUND_COLUMNS, export_pivot_to_file, get_round_pivot
+
+# Detail queries (checked by database/plan_check.py)
+ROUND_DETAILS_SQL = """
+    SELECT r.round_type, o.name, r.shift, r.timestamp_utc
+    FROM rounds r
+    JOIN operators o ON r.operator_id = o.id
+    WHERE r.id = ?
+"""
+ROUND_DETAIL_ITEMS_SQL = """
+    SELECT s.unit, s.section_name, ri.description, ri.value, ri.output, ri.mode
+    FROM sections s
+    JOIN round_items ri ON ri.section_id = s.id
+    WHERE s.round_id = ?
+    ORDER BY s.unit, s.section_name, ri.id
+"""
+
+# Item tables of recently opened rounds kept per session
+ROUND_DETAILS_CACHE_SIZE = 10
+# Rounds per session that keep their download button once exported
+REQUESTED_EXPORTS_SIZE = 10
 
 def view_saved_rounds():
     """
@@ -48,59 +77,66 @@ def view_saved_rounds():
                 st.error("Start date must be before end date")
     
     with col2:
-        # Round type filter
+        # Round type filter (options are cached across sessions)
         try:
-            with get_db_connection() as conn:
-                c = conn.cursor()
-                c.execute("SELECT DISTINCT round_type FROM rounds ORDER BY round_type")
-                round_types = [r[0] for r in c.fetchall()]
-                
-                # Add "All" option at the beginning
-                round_types = ["All Round Types"] + round_types
-                
-                selected_round_type = st.selectbox(
-                    "Round Type",
-                    options=round_types,
-                    index=0
-                )
+            round_types = get_round_types()
+            
+            # Add "All" option at the beginning
+            round_types = ["All Round Types"] + round_types
+            
+            selected_round_type = st.selectbox(
+                "Round Type",
+                options=round_types,
+                index=0
+            )
         except sqlite3.Error as e:
             st.error(f"Error loading round types: {str(e)}")
             round_types = ["All Round Types"]
             selected_round_type = "All Round Types"
     
     with col3:
-        # Operator filter
+        # Operator filter (options are cached across sessions)
         try:
-            with get_db_connection() as conn:
-                c = conn.cursor()
-                c.execute("""
-                    SELECT DISTINCT o.name 
-                    FROM operators o
-                    JOIN rounds r ON o.id = r.operator_id
-                    ORDER BY o.name
-                """)
-                operators = [r[0] for r in c.fetchall()]
-                
-                # Add "All" option at the beginning
-                operators = ["All Operators"] + operators
-                
-                selected_operator = st.selectbox(
-                    "Operator",
-                    options=operators,
-                    index=0
-                )
+            operators = get_operator_names()
+            
+            # Add "All" option at the beginning
+            operators = ["All Operators"] + operators
+            
+            selected_operator = st.selectbox(
+                "Operator",
+                options=operators,
+                index=0
+            )
         except sqlite3.Error as e:
             st.error(f"Error loading operators: {str(e)}")
             operators = ["All Operators"]
             selected_operator = "All Operators"
     
+    # Page size control
+    page_size_options = sorted({10, 20, 50, 100, DEFAULTS["items_per_page"]})
+    page_size = st.selectbox(
+        "Rounds per page",
+        options=page_size_options,
+        index=page_size_options.index(DEFAULTS["items_per_page"])
+    )
+    
+    # Start again from the newest round whenever the filters change
+    page = get_history_page((
+        date_filter, selected_round_type, selected_operator, page_size,
+        start_date if date_filter == "Custom" else None,
+        end_date if date_filter == "Custom" else None
+    ))
+    
     # Build the SQL query based on filters
     query, params = build_rounds_query(
         date_filter, 
         selected_round_type, 
         selected_operator,
         start_date if date_filter == "Custom" else None,
-        end_date if date_filter == "Custom" else None
+        end_date if date_filter == "Custom" else None,
+        cursor=page["cursor"],
+        direction=page["direction"],
+        page_size=page_size
     )
     
     # Export all data option
@@ -109,22 +145,38 @@ def view_saved_rounds():
     else:
         st.session_state.include_metadata = False
     
+    if FEATURES.get("export_csv", True):
+        render_bulk_export(
+            get_date_range(
+                date_filter,
+                start_date if date_filter == "Custom" else None,
+                end_date if date_filter == "Custom" else None
+            ),
+            selected_round_type,
+            selected_operator
+        )
+    
     # Execute query and display results
     try:
-        with get_db_connection() as conn:
-            c = conn.cursor()
-            c.execute(query, params)
-            results = c.fetchall()
-            
-            if not results:
-                st.info("No rounds found matching the selected filters.")
-                return
-            
-            # Process results into a more usable structure
-            rounds_data = process_rounds_data(results)
-            
-            # Display the rounds
-            display_rounds(rounds_data)
+        # Pages are served from the shared query cache until rounds change
+        results = cached_query(query, params)
+        
+        # One extra row tells whether another page follows
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if page["direction"] == "prev":
+            results.reverse()
+        
+        if not results:
+            st.info("No rounds found matching the selected filters.")
+            return
+        
+        # Process results into a more usable structure
+        rounds_data = process_rounds_data(results)
+        
+        # Display the rounds
+        display_rounds(rounds_data)
+        render_page_controls(page, results, has_more)
                 
     except sqlite3.Error as e:
         st.error(f"Error retrieving saved rounds: {str(e)}")
@@ -132,9 +184,62 @@ def view_saved_rounds():
             st.write(f"Debug - Database error: {str(e)}")
             st.write(traceback.format_exc())
 
-def build_rounds_query(date_filter, round_type, operator, start_date=None, end_date=None):
+def get_history_page(filters):
+    """
+    Return the history page position, resetting it when the filters change.
+    
+    Args:
+        filters (tuple): The current filter and page size selection
+        
+    Returns:
+        dict: "cursor" ((timestamp_utc, id) key or None for the newest
+            page), "direction" ("next" or "prev") and page "number"
+    """
+    page = st.session_state.get("history_page")
+    if page is None or page["filters"] != filters:
+        page = {"filters": filters, "cursor": None, "direction": "next", "number": 1}
+        st.session_state.history_page = page
+    return page
+
+def render_page_controls(page, results, has_more):
+    """
+    Render newer/older page buttons for the history list.
+    
+    Args:
+        page (dict): The current page position from get_history_page
+        results (list): The round rows shown on this page, newest first
+        has_more (bool): Whether more rows exist past this page in the
+            direction it was fetched
+    """
+    if page["direction"] == "prev":
+        has_newer, has_older = has_more, True
+    else:
+        has_newer, has_older = page["cursor"] is not None, has_more
+    
+    # Cursors are the (timestamp_utc, id) keys of the first and last rows shown
+    first_key = (results[0][4], results[0][0])
+    last_key = (results[-1][4], results[-1][0])
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ Newer", disabled=not has_newer, key="history_newer"):
+            page.update(cursor=first_key, direction="prev", number=page["number"] - 1)
+            st.rerun()
+    with col2:
+        st.write(f"Page {page['number']}")
+    with col3:
+        if st.button("Older ▶", disabled=not has_older, key="history_older"):
+            page.update(cursor=last_key, direction="next", number=page["number"] + 1)
+            st.rerun()
+
+def build_rounds_query(date_filter, round_type, operator, start_date=None, end_date=None,
+                       cursor=None, direction="next", page_size=None):
     """
-    Build the SQL query for retrieving rounds based on filter criteria.
+    Build the SQL query for one page of rounds matching the filter criteria.
+    
+    Pages are keyed on (timestamp_utc, id) rather than OFFSET, so every page
+    is an index range scan no matter how deep the user pages. The query
+    returns up to page_size + 1 rounds; the extra row shows another page follows.
     
     Args:
         date_filter (str): The selected date filter
@@ -142,6 +247,10 @@ def build_rounds_query(date_filter, round_type, operator, start_date=None, end_d
         operator (str): The selected operator
         start_date (datetime.date, optional): Start date for custom range
         end_date (datetime.date, optional): End date for custom range
+        cursor (tuple, optional): (timestamp_utc, id) of the round the page starts after
+        direction (str): "next" for older rounds than the cursor, "prev" for
+            newer ones (returned oldest first)
+        page_size (int, optional): Rounds per page; defaults to DEFAULTS["items_per_page"]
         
     Returns:
         tuple: (query_string, parameters)
@@ -152,34 +261,19 @@ def build_rounds_query(date_filter, round_type, operator, start_date=None, end_d
             r.round_type,
             o.name as operator_name,
             r.shift,
-            r.timestamp,
-            s.unit,
-            s.section_name,
-            ri.description,
-            ri.value,
-            ri.output,
-            ri.mode
+            r.timestamp_utc
         FROM rounds r
         JOIN operators o ON r.operator_id = o.id
-        JOIN sections s ON s.round_id = r.id
-        JOIN round_items ri ON ri.section_id = s.id
     """
     
     where_clauses = []
     params = []
     
     # Date filter
-    if date_filter == "Today":
-        where_clauses.append("DATE(r.timestamp) = DATE('now', 'localtime')")
-    elif date_filter == "Last 7 Days":
-        where_clauses.append("r.timestamp >= DATE('now', 'localtime', '-7 days')")
-    elif date_filter == "Last 30 Days":
-        where_clauses.append("r.timestamp >= DATE('now', 'localtime', '-30 days')")
-    elif date_filter == "Custom" and start_date and end_date:
-        where_clauses.append("DATE(r.timestamp) BETWEEN ? AND ?")
-        # Add one day to end_date to make it inclusive
-        end_date_adjusted = end_date + timedelta(days=1)
-        params.extend([start_date.strftime("%Y-%m-%d"), end_date_adjusted.strftime("%Y-%m-%d")])
+    date_range = get_date_range(date_filter, start_date, end_date)
+    if date_range:
+        where_clauses.append("r.timestamp_utc >= ? AND r.timestamp_utc < ?")
+        params.extend(date_range)
     
     # Round type filter
     if round_type != "All Round Types":
@@ -191,62 +285,189 @@ def build_rounds_query(date_filter, round_type, operator, start_date=None, end_d
         where_clauses.append("o.name = ?")
         params.append(operator)
     
+    # Only rounds with recorded readings are listed
+    where_clauses.append("""EXISTS (
+        SELECT 1 FROM sections s
+        JOIN round_items ri ON ri.section_id = s.id
+        WHERE s.round_id = r.id
+    )""")
+    
+    # Page position
+    if cursor is not None:
+        where_clauses.append("(r.timestamp_utc, r.id) > (?, ?)" if direction == "prev"
+                             else "(r.timestamp_utc, r.id) < (?, ?)")
+        params.extend(cursor)
+    
     # Combine where clauses
-    if where_clauses:
-        base_query += " WHERE " + " AND ".join(where_clauses)
+    base_query += " WHERE " + " AND ".join(where_clauses)
     
     # Add ordering
-    base_query += " ORDER BY r.timestamp DESC, s.unit, s.section_name"
+    if direction == "prev":
+        base_query += " ORDER BY r.timestamp_utc, r.id"
+    else:
+        base_query += " ORDER BY r.timestamp_utc DESC, r.id DESC"
+    base_query += " LIMIT ?"
+    params.append((page_size or DEFAULTS["items_per_page"]) + 1)
     
     return base_query, params
 
-def process_rounds_data(results):
+def get_date_range(date_filter, start_date=None, end_date=None):
     """
-    Process the raw query results into a structured format for display.
+    Convert the date filter to a half-open UTC epoch range.
+    
+    Local dates are converted here so that the filter is a plain range scan
+    on r.timestamp_utc.
     
     Args:
-        results (list): The raw query results
+        date_filter (str): The selected date filter
+        start_date (datetime.date, optional): Start date for custom range
+        end_date (datetime.date, optional): End date for custom range
         
     Returns:
-        dict: A nested dictionary of round data organized by round ID
+        tuple: (start, end) epochs, or None for no date restriction
     """
-    rounds_data = {}
+    if date_filter == "Today":
+        return recent_days_range(0)
+    if date_filter == "Last 7 Days":
+        return recent_days_range(7)
+    if date_filter == "Last 30 Days":
+        return recent_days_range(30)
+    if date_filter == "Custom" and start_date and end_date:
+        return local_date_range(start_date, end_date)
+    return None
+
+def render_bulk_export(date_range, round_type, operator):
+    """
+    Render the bulk CSV export and comparison table of the rounds matching the history filters.
     
-    for row in results:
-        round_id, round_type, operator, shift, timestamp, unit, section, desc, value, output, mode = row
+    The long layout (one row per reading) is streamed to a file in
+    PATHS["exports"] (see utils/bulk_export.py); the wide layout (one row
+    per round, one column per item) is pivoted by utils/pivot_export.py.
+    Either file is then offered for download.
+    
+    Args:
+        date_range (tuple): (start, end) epochs, or None for all time
+        round_type (str): The selected round type
+        operator (str): The selected operator
+    """
+    with st.expander("Bulk export and comparison", expanded=False):
+        try:
+            units = ["All Units"] + get_unit_names()
+        except sqlite3.Error as e:
+            st.error(f"Error loading units: {str(e)}")
+            units = ["All Units"]
+        unit = st.selectbox("Unit", options=units, index=0, key="bulk_export_unit")
         
-        # Initialize round if not exists
-        if round_id not in rounds_data:
-            rounds_data[round_id] = {
-                "round_id": round_id,
-                "round_type": round_type,
-                "operator": operator,
-                "shift": shift,
-                "timestamp": timestamp,
-                "units": {}
-            }
+        filters = HistoryFilter(
+            start_utc=date_range[0] if date_range else None,
+            end_utc=date_range[1] if date_range else None,
+            round_type=None if round_type == "All Round Types" else round_type,
+            operator=None if operator == "All Operators" else operator,
+            unit=None if unit == "All Units" else unit
+        )
+        
+        layout = st.radio(
+            "Layout",
+            options=["One row per reading", "One row per round"],
+            key="bulk_export_layout"
+        )
+        wide = layout == "One row per round"
+        value_column = "value"
+        if wide:
+            value_column = st.selectbox(
+                "Cell values", options=["value", "output"], format_func=str.title, key="bulk_export_values"
+            )
+        export_key = (filters, wide, value_column)
         
-        # Initialize unit if not exists
-        if unit not in rounds_data[round_id]["units"]:
-            rounds_data[round_id]["units"][unit] = {}
+        if st.button("Export matching rounds", key="bulk_export"):
+            try:
+                with st.spinner("Exporting..."):
+                    if wide:
+                        path, size, _ = export_pivot_to_file(filters, "auto", value_column)
+                    else:
+                        path, size = export_rounds_to_file(filters)
+                st.session_state.last_bulk_export = (export_key, path)
+                st.success(f"Exported {size / 1024:.0f} KiB to {path}")
+            except (sqlite3.Error, OSError) as e:
+                st.error(f"Export error: {str(e)}")
         
-        # Initialize section if not exists
-        if section not in rounds_data[round_id]["units"][unit]:
-            rounds_data[round_id]["units"][unit][section] = []
+        # Offer the last export while the filters still match it
+        exported = st.session_state.get("last_bulk_export")
+        if exported and exported[0] == export_key and os.path.exists(exported[1]):
+            with open(exported[1], "rb") as f:
+                st.download_button(
+                    label="Download CSV",
+                    data=f,
+                    file_name=os.path.basename(exported[1]),
+                    mime="text/csv",
+                    key="bulk_export_download"
+                )
         
-        # Add item to section
-        rounds_data[round_id]["units"][unit][section].append({
-            "description": desc,
-            "value": value,
-            "output": output,
-            "mode": mode
-        })
+        if wide and st.checkbox("Show comparison table", key="show_round_comparison"):
+            render_round_comparison(filters, value_column)
+
+def render_round_comparison(filters, value_column):
+    """
+    Render the matching rounds as one row per round and one column per item.
+    
+    The table is kept for the session until the filters or the data change.
+    Tables too large for a dense layout are not displayed; they can still
+    be exported.
+    
+    Args:
+        filters (HistoryFilter): Which rounds and readings to compare
+        value_column (str): "value" or "output"
+    """
+    key = (filters, value_column, get_data_version())
+    cached = st.session_state.get("round_comparison")
+    if cached is None or cached[0] != key:
+        try:
+            with st.spinner("Building comparison..."):
+                table, layout = get_round_pivot(filters, "auto", value_column)
+        except sqlite3.Error as e:
+            st.error(f"Error loading readings: {str(e)}")
+            return
+        cached = (key, table, layout)
+        st.session_state.round_comparison = cached
+    
+    _, table, layout = cached
+    if table.empty:
+        st.info("No readings found matching the selected filters.")
+    elif layout != "wide":
+        st.warning(
+            f"{len(table)} rounds x {len(table.columns) - len(ROUND_COLUMNS)} items is too large to display; "
+            "narrow the filters or export the table instead."
+        )
+    else:
+        st.dataframe(table, hide_index=True)
+
+def process_rounds_data(results):
+    """
+    Process the raw query results into a structured format for display.
+    
+    Args:
+        results (list): The round rows of the page from build_rounds_query
+        
+    Returns:
+        dict: Round summaries organized by round ID
+    """
+    rounds_data = {}
+    
+    for round_id, round_type, operator, shift, timestamp_utc in results:
+        rounds_data[round_id] = {
+            "round_id": round_id,
+            "round_type": round_type,
+            "operator": operator,
+            "shift": shift,
+            "timestamp": format_epoch(timestamp_utc),
+            "timestamp_utc": timestamp_utc
+        }
     
     return rounds_data
 
 def display_rounds(rounds_data):
     """
-    Display the processed rounds data in an expandable format.
+    Display the processed rounds data, loading details only for opened rounds.
     
     Args:
         rounds_data (dict): The processed rounds data structure
@@ -254,7 +475,7 @@ def display_rounds(rounds_data):
     # Sort rounds by timestamp (most recent first)
     sorted_rounds = sorted(
         rounds_data.values(), 
-        key=lambda x: x["timestamp"], 
+        key=lambda x: x["timestamp_utc"] or 0, 
         reverse=True
     )
     
@@ -268,72 +489,114 @@ def display_rounds(rounds_data):
         col1, col2 = st.columns([5, 1])
         
         with col1:
-            expander_label = f"Round {round_id} - {timestamp} by {operator}"
-            expander = st.expander(expander_label, expanded=False)
+            st.markdown(f"**Round {round_id}** - {timestamp} by {operator}")
+            show_details = st.checkbox("Show details", key=f"details_{round_id}")
         
         with col2:
-            # Create a download button for this specific round
-            csv_data, filename = export_round_to_csv(round_id)
-            if csv_data:
-                st.download_button(
-                    label="Export CSV",
-                    data=csv_data,
-                    file_name=filename,
-                    mime="text/csv",
-                    key=f"download_{round_id}"
-                )
-            else:
-                st.error("Export error")
+            render_export_button(round_id)
         
-        # Display round details in the expander
-        with expander:
-            st.write(f"**Round Type:** {round_data['round_type']}")
-            st.write(f"**Shift:** {round_data['shift']}")
-            
-            # Create tabular data for this round
-            table_data = []
-
-            for unit, sections in round_data["units"].items():
-                for section, items in sections.items():
-                    for item in items:
-                        table_data.append({
-                            "Unit": unit,
-                            "Section": section,
-                            "Item Description": item["description"],
-                            "Value": item["value"],
-                            "Output": item["output"],
-                            "Mode": item["mode"]
-                        })
-            
-            # Store table data in session state for potential export
-            st.session_state[f"table_data_{round_id}"] = table_data
-            
-            # Display as dataframe
-            if table_data:
-                df = pd.DataFrame(table_data)
-                
-                # Make sure the Mode column exists
-                if 'Mode' not in df.columns:
-                    df['Mode'] = ""
+        # Round details are queried and styled only while they are shown
+        if show_details:
+            with st.container():
+                st.write(f"**Round Type:** {round_data['round_type']}")
+                st.write(f"**Shift:** {round_data['shift']}")
                 
-                # Define a row styling function
-                def style_row(row):
-                    if row['Mode'] == 'Manual':
-                        return ['background-color: rgba(255, 200, 87, 0.5); font-weight: bold;'] * len(row)
-                    elif row['Mode'] == 'Cascade':
-                        return ['background-color: rgba(74, 222, 128, 0.5); font-weight: bold; color: white;'] * len(row)
-                    elif row['Mode'] == 'Auto-Init':
-                        return ['background-color: rgba(167, 139, 250, 0.5); font-weight: bold; color: white;'] * len(row)
-                    elif row['Mode'] == 'B-Cascade':
-                        return ['background-color: rgba(6, 214, 160, 0.5); font-weight: bold; color: white;'] * len(row)
-                    return [''] * len(row)
+                df = get_round_items_table(round_id)
+                if df is None:
+                    continue
                 
-                # Apply styling row by row
-                styled_df = df.style.apply(style_row, axis=1)
-                
-                st.dataframe(styled_df, use_container_width=True)
-            else:
-                st.info("No items found for this round.")
+                # Display as dataframe
+                if not df.empty:
+                    # Define a row styling function
+                    def style_row(row):
+                        if row['Mode'] == 'Manual':
+                            return ['background-color: rgba(255, 200, 87, 0.5); font-weight: bold;'] * len(row)
+                        elif row['Mode'] == 'Cascade':
+                            return ['background-color: rgba(74, 222, 128, 0.5); font-weight: bold; color: white;'] * len(row)
+                        elif row['Mode'] == 'Auto-Init':
+                            return ['background-color: rgba(167, 139, 250, 0.5); font-weight: bold; color: white;'] * len(row)
+                        elif row['Mode'] == 'B-Cascade':
+                            return ['background-color: rgba(6, 214, 160, 0.5); font-weight: bold; color: white;'] * len(row)
+                        return [''] * len(row)
+                    
+                    # Apply styling row by row
+                    styled_df = df.style.apply(style_row, axis=1)
+                    
+                    st.dataframe(styled_df, use_container_width=True)
+                else:
+                    st.info("No items found for this round.")
+
+def get_round_items_table(round_id):
+    """
+    Return the item table of a round, using the session's recently opened rounds.
+    
+    The cache holds at most ROUND_DETAILS_CACHE_SIZE rounds and entries are
+    reloaded once the database has changed.
+    
+    Args:
+        round_id (int): The ID of the round
+        
+    Returns:
+        pd.DataFrame: Unit, Section, Item Description, Value, Output and Mode
+            columns, or None if the items could not be loaded
+    """
+    cache = st.session_state.setdefault("round_details_cache", OrderedDict())
+    data_version = get_data_version()
+    
+    cached = cache.get(round_id)
+    if cached is not None and cached[0] == data_version:
+        cache.move_to_end(round_id)
+        return cached[1]
+    
+    try:
+        with get_db_connection(readonly=True) as conn:
+            c = conn.cursor()
+            c.execute(ROUND_DETAIL_ITEMS_SQL, (round_id,))
+            df = pd.DataFrame(
+                c.fetchall(),
+                columns=["Unit", "Section", "Item Description", "Value", "Output", "Mode"]
+            )
+    except sqlite3.Error as e:
+        st.error(f"Error loading round details: {str(e)}")
+        return None
+    
+    df["Mode"] = df["Mode"].fillna("")
+    cache[round_id] = (data_version, df)
+    cache.move_to_end(round_id)
+    while len(cache) > ROUND_DETAILS_CACHE_SIZE:
+        cache.popitem(last=False)
+    
+    return df
+
+def render_export_button(round_id):
+    """
+    Render the CSV export control for a round in the history list.
+    
+    The export is only generated once the user asks for it; after that the
+    round offers a download button while it is among the
+    REQUESTED_EXPORTS_SIZE most recently exported rounds of the session.
+    
+    Args:
+        round_id (int): The ID of the round to export
+    """
+    requested = st.session_state.setdefault("requested_exports", OrderedDict())
+    if round_id not in requested:
+        if not st.button("Export CSV", key=f"export_{round_id}"):
+            return
+        requested[round_id] = True
+        while len(requested) > REQUESTED_EXPORTS_SIZE:
+            requested.popitem(last=False)
+    
+    export = get_session_round_export(round_id)
+    if export:
+        csv_data, filename = export
+        st.download_button(
+            label="Download CSV",
+            data=csv_data,
+            file_name=filename,
+            mime="text/csv",
+            key=f"download_{round_id}"
+        )
 
 def render_round_details(round_id):
     """
@@ -346,16 +609,11 @@ def render_round_details(round_id):
         round_id (int): The ID of the round to display
     """
     try:
-        with get_db_connection() as conn:
+        with get_db_connection(readonly=True) as conn:
             c = conn.cursor()
             
             # Get round information
-            c.execute("""
-                SELECT r.round_type, o.name, r.shift, r.timestamp
-                FROM rounds r
-                JOIN operators o ON r.operator_id = o.id
-                WHERE r.id = ?
-            """, (round_id,))
+            c.execute(ROUND_DETAILS_SQL, (round_id,))
             
             round_info = c.fetchone()
             
@@ -363,7 +621,8 @@ def render_round_details(round_id):
                 st.error(f"Round {round_id} not found")
                 return
                 
-            round_type, operator_name, shift, timestamp = round_info
+            round_type, operator_name, shift, timestamp_utc = round_info
+            timestamp = format_epoch(timestamp_utc)
             
             # Display round header
             st.header(f"Round {round_id} Details")
@@ -373,13 +632,7 @@ def render_round_details(round_id):
             st.write(f"**Timestamp:** {timestamp}")
             
             # Get all items for this round
-            c.execute("""
-                SELECT s.unit, s.section_name, ri.description, ri.value, ri.output, ri.mode
-                FROM sections s
-                JOIN round_items ri ON ri.section_id = s.id
-                WHERE s.round_id = ?
-                ORDER BY s.unit, s.section_name, ri.id
-            """, (round_id,))
+            c.execute(ROUND_DETAIL_ITEMS_SQL, (round_id,))
             
             items = c.fetchall()
             
@@ -441,8 +694,9 @@ def render_round_details(round_id):
                             st.dataframe(styled_df, use_container_width=True)
             
             # Export option
-            csv_data, filename = export_round_to_csv(round_id)
-            if csv_data:
+            export = get_session_round_export(round_id)
+            if export:
+                csv_data, filename = export
                 st.download_button(
                     label="Export as CSV",
                     data=csv_data,
@@ -9,7 +9,10 @@ tracking application.
 # Import key utility functions to expose at the package level
 from operator_rounds.utils.validation import validate_input_data, ValidationError
 from operator_rounds.utils.state import initialize_round_data_structure, init_session_state
-from operator_rounds.utils.export import export_round_to_csv
+from operator_rounds.utils.export import export_round_to_csv, get_round_export, ExportError
+from operator_rounds.utils.bulk_export import iter_rounds_csv, export_rounds_to_file
+from operator_rounds.utils.pivot_export import get_round_pivot, export_pivot_to_file
+from operator_rounds.utils.csv_import import parse_import_file, import_csv_files
 from operator_rounds.utils.helpers import generate_unique_form_key
 
 # Define what gets imported with "from operator_rounds.utils import *"
@@ -19,5 +22,13 @@ __all__ = [
     'initialize_round_data_structure',
     'init_session_state',
     'export_round_to_csv',
+    'get_round_export',
+    'ExportError',
+    'iter_rounds_csv',
+    'export_rounds_to_file',
+    'get_round_pivot',
+    'export_pivot_to_file',
+    'parse_import_file',
+    'import_csv_files',
     'generate_unique_form_key'
 ]
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+Parallel backfill of historical rounds for Operator Rounds Tracking.
+
+Imports a large archive of CSV files (in the formats read by
+utils/csv_import.py) in two stages:
+
+- parse: files are read and validated in a pool of worker processes, in
+  chunks of DATABASE["backfill_files_per_task"] files, each returning the
+  valid readings of every file (rejected rows are written next to the file
+  as <name>.rejected.csv);
+- write: the main process is the only writer. It collects parsed files
+  until DATABASE["backfill_batch_rounds"] rounds are waiting and writes
+  them with one BulkLoader (database/bulk_load.py) call.
+
+Only a couple of chunks per worker are parsed ahead of the writer, so
+memory use does not grow with the size of the archive.
+
+A checkpoint file lists every file whose rounds are committed, one path
+per line. It is appended to after each write, so an interrupted backfill
+resumes with the files not yet listed. Files parsed but not yet committed
+are parsed again; the rounds of a batch interrupted half-way are skipped
+as already present.
+
+Usage:
+    python -m operator_rounds.utils.backfill [PATH ...] [--workers N]
+        [--batch-rounds N] [--checkpoint FILE] [--restart]
+
+PATH can be files or directories (searched recursively for *.csv);
+without any, PATHS["imports"] is used.
+"""
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from operator_rounds.config import DATABASE, PATHS
+from operator_rounds.database.bulk_load import BulkLoader
+from operator_rounds.utils.csv_import import (
+    ImportFormatError, ParsedFile, read_import_file, validate_rows, write_rejects
+)
+
+CHECKPOINT_FILENAME = "backfill.checkpoint"
+
+class BackfillReport(NamedTuple):
+    """Running totals of a backfill, with the time spent in each stage."""
+    files: int  # Files committed in this run
+    files_already_done: int  # Files skipped because the checkpoint lists them
+    files_failed: int  # Files in neither format or unreadable
+    rows_read: int
+    rows_rejected: int
+    rounds_imported: int
+    rounds_skipped: int
+    rows_imported: int
+    parse_seconds: float  # Summed over the workers
+    write_seconds: float  # Spent by the writer in database transactions
+    wait_seconds: float  # Spent by the writer waiting for parsed files
+    elapsed_seconds: float
+
+def get_checkpoint_path() -> str:
+    """Return the default checkpoint file, in PATHS["imports"]."""
+    return os.path.join(PATHS["imports"], CHECKPOINT_FILENAME)
+
+def read_checkpoint(path: str) -> Set[str]:
+    """Return the absolute paths of the files a checkpoint lists as done."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+def find_import_files(paths: List[str]) -> List[str]:
+    """Expand directories to the *.csv files below them, skipping reject files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.csv"), recursive=True)))
+        else:
+            files.append(path)
+    return [os.path.abspath(path) for path in files if not path.endswith(".rejected.csv")]
+
+def _parse_files(files: List[Tuple[int, str]]) -> List[Tuple[str, Union[ParsedFile, Exception]]]:
+    """
+    Parse a chunk of files in a worker process.
+
+    Legacy files are often a single round each, and validating a table has
+    a fixed cost, so the files of a chunk are validated as one table and
+    split up afterwards. Round keys are prefixed with the file's number,
+    which keeps files of the same name in different directories apart.
+
+    Returns:
+        List[Tuple[str, ParsedFile or Exception]]: Each path with its parsed
+            content, or with the error that made it unreadable
+    """
+    started = time.perf_counter()
+    results: List[Tuple[str, Union[ParsedFile, Exception]]] = []
+    readable, frames = [], []
+    for number, path in files:
+        try:
+            df = read_import_file(path, os.path.basename(path))
+        except (ImportFormatError, OSError, ValueError) as e:
+            results.append((path, e))
+            continue
+        readable.append((number, path))
+        frames.append(df.assign(round_key=f"{number}:" + df["round_key"]))
+    if not frames:
+        return results
+
+    rows, rejects = validate_rows(pd.concat(frames, ignore_index=True))
+    row_files = rows["round_key"].str.split(":", n=1).str[0].astype(int)
+    reject_files = rejects["round_key"].str.split(":", n=1).str[0].astype(int)
+    rejects["round_key"] = rejects["round_key"].str.split(":", n=1).str[1]
+
+    elapsed = (time.perf_counter() - started) / len(readable)
+    for number, path in readable:
+        parsed = ParsedFile(
+            os.path.basename(path),
+            rows[row_files == number].reset_index(drop=True),
+            rejects[reject_files == number].reset_index(drop=True),
+            elapsed
+        )
+        write_rejects(parsed, os.path.dirname(path))
+        results.append((path, parsed))
+    return results
+
+def format_backfill_report(report: BackfillReport) -> str:
+    """Return a summary of a backfill with the throughput of each stage."""
+    def rate(count, seconds):
+        return f"{count / seconds:.0f}" if seconds else "-"
+
+    return "\n".join([
+        f"Files: {report.files} imported, {report.files_already_done} already done, "
+        f"{report.files_failed} failed",
+        f"Rows: {report.rows_read} read, {report.rows_rejected} rejected, {report.rows_imported} written "
+        f"({report.rounds_imported} rounds; {report.rounds_skipped} already present)",
+        f"Parse: {rate(report.rows_read, report.parse_seconds)} rows/s per worker, "
+        f"{report.parse_seconds:.1f} s of worker time",
+        f"Write: {rate(report.rows_imported, report.write_seconds)} rows/s, "
+        f"{report.write_seconds:.1f} s in transactions, {report.wait_seconds:.1f} s waiting for parsed files",
+        f"Total: {rate(report.rows_read, report.elapsed_seconds)} rows/s in {report.elapsed_seconds:.1f} s",
+    ])
+
+def backfill(paths: List[str], workers: Optional[int] = None, batch_rounds: Optional[int] = None,
+             checkpoint: Optional[str] = None,
+             on_progress: Optional[Callable[[BackfillReport], None]] = None,
+             on_error: Optional[Callable[[str, Exception], None]] = None) -> BackfillReport:
+    """
+    Import files in parallel, skipping those the checkpoint lists as done.
+
+    Args:
+        paths (List[str]): Files to import
+        workers (int, optional): Parse processes; defaults to DATABASE["backfill_workers"],
+            or one per CPU
+        batch_rounds (int, optional): Rounds per write; defaults to DATABASE["backfill_batch_rounds"]
+        checkpoint (str, optional): Checkpoint file; defaults to get_checkpoint_path()
+        on_progress (callable, optional): Called with the running totals after each write
+        on_error (callable, optional): Called with the path and error of each file that fails to parse
+
+    Returns:
+        BackfillReport: Totals of this run
+
+    Raises:
+        sqlite3.Error: If a write fails; files committed before stay in the checkpoint
+        OSError: If the checkpoint cannot be written
+    """
+    started = time.perf_counter()
+    workers = workers or DATABASE.get("backfill_workers") or os.cpu_count() or 1
+    batch_rounds = batch_rounds or DATABASE.get("backfill_batch_rounds", 2000)
+    files_per_task = DATABASE.get("backfill_files_per_task", 50)
+    checkpoint = checkpoint or get_checkpoint_path()
+
+    done = read_checkpoint(checkpoint)
+    pending = [path for path in map(os.path.abspath, paths) if path not in done]
+    totals = dict(
+        files=0, files_already_done=len(paths) - len(pending), files_failed=0,
+        rows_read=0, rows_rejected=0, rounds_imported=0, rounds_skipped=0, rows_imported=0,
+        parse_seconds=0.0, write_seconds=0.0, wait_seconds=0.0,
+    )
+
+    def report() -> BackfillReport:
+        return BackfillReport(elapsed_seconds=time.perf_counter() - started, **totals)
+
+    loader = BulkLoader(batch_rounds)
+    waiting: List[ParsedFile] = []
+    waiting_paths: List[str] = []
+    waiting_rounds = 0
+
+    os.makedirs(os.path.dirname(os.path.abspath(checkpoint)), exist_ok=True)
+    with open(checkpoint, "a", encoding="utf-8") as checkpoint_file:
+
+        def write_waiting():
+            nonlocal waiting_rounds
+            if not waiting_paths:
+                return
+            write_started = time.perf_counter()
+            loads = loader.load(pd.concat([parsed.rows for parsed in waiting], ignore_index=True))
+            totals["write_seconds"] += time.perf_counter() - write_started
+            totals["rounds_imported"] += sum(load.rounds for load in loads)
+            totals["rounds_skipped"] += sum(load.rounds_skipped for load in loads)
+            totals["rows_imported"] += sum(load.rows for load in loads)
+            totals["files"] += len(waiting_paths)
+
+            # Every batch of these files is committed: record them as done
+            checkpoint_file.writelines(path + "\n" for path in waiting_paths)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+
+            waiting.clear()
+            waiting_paths.clear()
+            waiting_rounds = 0
+            if on_progress:
+                on_progress(report())
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                numbered = list(enumerate(pending))
+                chunks = iter(range(0, len(numbered), files_per_task))
+                in_flight: Dict[Future, List[Tuple[int, str]]] = {}
+
+                def submit_next():
+                    for start in chunks:
+                        files = numbered[start:start + files_per_task]
+                        in_flight[pool.submit(_parse_files, files)] = files
+                        return
+
+                # A couple of chunks per worker are parsed ahead of the writer
+                for _ in range(workers * 2):
+                    submit_next()
+
+                while in_flight:
+                    wait_started = time.perf_counter()
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    totals["wait_seconds"] += time.perf_counter() - wait_started
+
+                    for future in finished:
+                        files = in_flight.pop(future)
+                        submit_next()
+                        try:
+                            results = future.result()
+                        except (ImportFormatError, OSError, ValueError) as e:
+                            results = [(path, e) for _, path in files]
+
+                        for path, parsed in results:
+                            if isinstance(parsed, Exception):
+                                totals["files_failed"] += 1
+                                if on_error:
+                                    on_error(path, parsed)
+                                continue
+                            totals["rows_read"] += len(parsed.rows) + len(parsed.rejects)
+                            totals["rows_rejected"] += len(parsed.rejects)
+                            totals["parse_seconds"] += parsed.elapsed_seconds
+                            waiting.append(parsed)
+                            waiting_paths.append(path)
+                            waiting_rounds += parsed.rows["round_key"].nunique()
+
+                    if waiting_rounds >= batch_rounds:
+                        write_waiting()
+
+                write_waiting()
+        finally:
+            # Rebuild the latest values even if interrupted, for what was committed
+            loader.finish()
+
+    return report()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the backfill."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.utils.backfill",
+        description="Import an archive of round CSV files in parallel, resumably."
+    )
+    parser.add_argument("paths", nargs="*", help="Files or directories (default: PATHS['imports'])")
+    parser.add_argument("--workers", type=int, default=None, help="Parse processes (default: one per CPU)")
+    parser.add_argument("--batch-rounds", type=int, default=None, help="Rounds written per transaction")
+    parser.add_argument("--checkpoint", default=None,
+                        help=f"Checkpoint file (default: PATHS['imports']/{CHECKPOINT_FILENAME})")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start over")
+    args = parser.parse_args(argv)
+
+    checkpoint = args.checkpoint or get_checkpoint_path()
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    paths = find_import_files(args.paths or [PATHS["imports"]])
+    if not paths:
+        print("No files to import")
+        return 0
+
+    def on_progress(report):
+        print(f"{report.files + report.files_already_done}/{len(paths)} files, "
+              f"{report.rounds_imported} rounds imported, "
+              f"{report.rows_read / report.elapsed_seconds:.0f} rows/s", flush=True)
+
+    def on_error(path, error):
+        print(f"Skipped {path}: {str(error)}", file=sys.stderr)
+
+    try:
+        report = backfill(paths, args.workers, args.batch_rounds, checkpoint, on_progress, on_error)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Backfill error: {str(e)}; run again to resume", file=sys.stderr)
+        return 1
+
+    print(format_backfill_report(report))
+    return 1 if report.files_failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Bulk CSV export for Operator Rounds Tracking.
+
+Exports every reading of the rounds matching a HistoryFilter (date range,
+round type, operator, unit) as one flat CSV, one line per reading. The CSV
+is produced by a generator, chunk by chunk as rows are fetched (see
+database/history.py), so memory use does not depend on the size of the
+export. The chunks can be written to a file under PATHS["exports"] or
+passed to anything that accepts an iterable of strings, such as a streaming
+HTTP response.
+"""
+import csv
+import io
+import os
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from operator_rounds.config import PATHS
+from operator_rounds.database.history import HistoryFilter, iter_history_rows
+from operator_rounds.database.timeutils import format_epoch
+
+BULK_EXPORT_HEADER = [
+    "Round ID", "Round Type", "Operator", "Shift", "Timestamp",
+    "Unit", "Section", "Item Description", "Value", "Output", "Mode",
+]
+
+def iter_rounds_csv(filters: HistoryFilter, fetch_rows: Optional[int] = None) -> Iterator[str]:
+    """
+    Generate the bulk CSV export of a filter.
+
+    Args:
+        filters (HistoryFilter): Which rounds and readings to export
+        fetch_rows (int, optional): Rows fetched (and written) per chunk
+
+    Yields:
+        str: The header line, then one block of CSV lines per fetched chunk
+
+    Raises:
+        sqlite3.Error: If reading the history fails
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(BULK_EXPORT_HEADER)
+    yield buffer.getvalue()
+
+    for rows in iter_history_rows(filters, fetch_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            row[:4] + (format_epoch(row[4]),) + row[5:10] + (row[10] or "",)
+            for row in rows
+        )
+        yield buffer.getvalue()
+
+def bulk_export_filename(filters: HistoryFilter) -> str:
+    """Return a descriptive filename for a bulk export."""
+    parts = ["Rounds"]
+    if filters.start_utc is not None:
+        parts.append(format_epoch(filters.start_utc, "%Y%m%d"))
+    if filters.end_utc is not None:
+        # The range is half-open; name the file after the last second it covers
+        parts.append(format_epoch(filters.end_utc - 1, "%Y%m%d"))
+    for value in (filters.round_type, filters.operator, filters.unit):
+        if value:
+            parts.append("".join(ch if ch.isalnum() else "_" for ch in value))
+    parts.append(datetime.now().strftime("%Y%m%d%H%M%S"))
+    return "_".join(parts) + ".csv"
+
+def export_rounds_to_file(filters: HistoryFilter, filename: Optional[str] = None,
+                          fetch_rows: Optional[int] = None) -> Tuple[str, int]:
+    """
+    Write the bulk CSV export of a filter to a file in PATHS["exports"].
+
+    The export is written to a temporary file that replaces the target only
+    once it is complete, so a failed export never leaves a truncated file.
+
+    Args:
+        filters (HistoryFilter): Which rounds and readings to export
+        filename (str, optional): File name; defaults to bulk_export_filename(filters)
+        fetch_rows (int, optional): Rows fetched (and written) per chunk
+
+    Returns:
+        Tuple[str, int]: (path of the written file, number of bytes written)
+
+    Raises:
+        sqlite3.Error: If reading the history fails
+        OSError: If the file cannot be written
+    """
+    os.makedirs(PATHS["exports"], exist_ok=True)
+    path = os.path.join(PATHS["exports"], filename or bulk_export_filename(filters))
+    partial_path = path + ".partial"
+
+    try:
+        with open(partial_path, "w", encoding="utf-8", newline="") as f:
+            for chunk in iter_rounds_csv(filters, fetch_rows):
+                f.write(chunk)
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    return path, os.path.getsize(path)
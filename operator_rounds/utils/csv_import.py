@@ -0,0 +1,317 @@
+"""
+CSV import of rounds for Operator Rounds Tracking.
+
+Backfills historical rounds from CSV files in either of the formats the
+application exports:
+
+- a single round as written by export_round_to_csv with metadata (the
+  round details above a "---" separator, then one line per reading);
+- the long format of the bulk export (utils/bulk_export.py): one line per
+  reading with Round ID, Round Type, Operator, Shift, Timestamp, Unit,
+  Section, Item Description, Value, Output and Mode columns. Round ID only
+  groups the lines of a round; imported rounds get new ids.
+
+Timestamps are local time in DEFAULTS["date_format"] (or
+DEFAULTS["short_date_format"]). Rows are validated with column-wise checks;
+rows that fail are rejected with a reason instead of failing the file. The
+valid rows are written by database/bulk_load.py. Rounds already in the
+database are skipped, so a file can safely be imported again.
+
+Usage:
+    python -m operator_rounds.utils.csv_import [FILE ...] [--batch-rounds N]
+
+Without files, every *.csv in PATHS["imports"] is imported. Rejected rows
+are written next to each file as <name>.rejected.csv.
+"""
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+from typing import IO, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+
+from operator_rounds.config import DEFAULTS, PATHS
+from operator_rounds.database.bulk_load import BULK_LOAD_COLUMNS, BulkLoader
+from operator_rounds.database.models import normalize_key
+from operator_rounds.database.timeutils import local_datetime_epoch
+from operator_rounds.utils.bulk_export import BULK_EXPORT_HEADER
+
+# Longest accepted name or reading, as in validate_input_data
+MAX_FIELD_LENGTH = 255
+
+# Bulk export header -> column name used by the loader
+LONG_FORMAT_COLUMNS = dict(zip(BULK_EXPORT_HEADER, [
+    "round_key", "round_type", "operator_name", "shift", "timestamp",
+    "unit", "section_name", "description", "value", "output", "mode",
+]))
+ROUND_EXPORT_ITEM_COLUMNS = ["Unit", "Section", "Item Description", "Value", "Output", "Mode"]
+ROUND_EXPORT_METADATA = ["Round ID", "Round Type", "Operator", "Shift", "Timestamp"]
+METADATA_SEPARATOR = "---"
+
+class ImportFormatError(ValueError):
+    """Raised when a file is in neither supported CSV format."""
+    pass
+
+class ParsedFile(NamedTuple):
+    """The validated content of one import file."""
+    name: str
+    rows: pd.DataFrame  # Valid rows with BULK_LOAD_COLUMNS
+    rejects: pd.DataFrame  # Rejected rows with their line number and reason
+    elapsed_seconds: float
+
+class ImportReport(NamedTuple):
+    """The outcome of importing one file."""
+    name: str
+    rows_read: int
+    rows_rejected: int
+    rounds_imported: int
+    rounds_skipped: int
+    rows_imported: int
+    parse_seconds: float
+    load_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Readings read per second, parsing and loading included."""
+        seconds = self.parse_seconds + self.load_seconds
+        return self.rows_read / seconds if seconds else 0.0
+
+def read_import_file(source: Union[str, IO], name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read an import file in either supported format into long-format columns.
+
+    Args:
+        source (str or file-like): Path or open file
+        name (str, optional): Name used to key rounds; defaults to the path
+
+    Returns:
+        pd.DataFrame: One row per reading with the LONG_FORMAT_COLUMNS names,
+            all text, plus a "line" column with the line number in the file
+
+    Raises:
+        ImportFormatError: If the file is in neither format
+        OSError: If the file cannot be read
+    """
+    name = name or str(source)
+    try:
+        df = pd.read_csv(source, dtype=str, keep_default_na=False, skipinitialspace=True)
+    except (pd.errors.EmptyDataError, pd.errors.ParserError) as e:
+        raise ImportFormatError(f"{name}: {str(e)}")
+    df.columns = [str(column).strip() for column in df.columns]
+    # Line 1 is the header
+    df["line"] = range(2, len(df) + 2)
+
+    if set(LONG_FORMAT_COLUMNS) <= set(df.columns):
+        df = df.rename(columns=LONG_FORMAT_COLUMNS)
+        df["round_key"] = name + ":" + df["round_key"]
+        return df[list(LONG_FORMAT_COLUMNS.values()) + ["line"]]
+
+    if list(df.columns[:len(ROUND_EXPORT_ITEM_COLUMNS)]) == ROUND_EXPORT_ITEM_COLUMNS:
+        separators = df.index[df["Unit"] == METADATA_SEPARATOR]
+        if len(separators) == 0:
+            raise ImportFormatError(f"{name}: round export without metadata; export with metadata to import")
+        head = df["Unit"].iloc[:separators[0]].tolist()
+        # Labels first, then the values in the same order
+        metadata = dict(zip(head[:len(head) // 2], head[len(head) // 2:]))
+        if set(metadata) != set(ROUND_EXPORT_METADATA):
+            raise ImportFormatError(f"{name}: unexpected round metadata {sorted(metadata)}")
+
+        df = df.iloc[separators[0] + 1:].rename(columns=LONG_FORMAT_COLUMNS)
+        for label in ROUND_EXPORT_METADATA:
+            df[LONG_FORMAT_COLUMNS[label]] = metadata[label]
+        df["round_key"] = name + ":" + metadata["Round ID"]
+        return df[list(LONG_FORMAT_COLUMNS.values()) + ["line"]]
+
+    raise ImportFormatError(f"{name}: unrecognized columns {list(df.columns)}")
+
+def _parse_timestamps(text: pd.Series) -> pd.Series:
+    """Convert local timestamps to UTC epochs; unparseable values become NaN."""
+    parsed = pd.to_datetime(text, format=DEFAULTS.get("date_format", "%Y-%m-%d %H:%M:%S"), errors="coerce")
+    dates_only = parsed.isna()
+    if dates_only.any():
+        parsed[dates_only] = pd.to_datetime(
+            text[dates_only], format=DEFAULTS.get("short_date_format", "%Y-%m-%d"), errors="coerce"
+        )
+    # Rounds share timestamps, so each distinct one is converted once
+    epochs = {value: local_datetime_epoch(value.to_pydatetime()) for value in parsed.dropna().unique()}
+    return parsed.map(epochs)
+
+def validate_rows(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validate long-format rows with column-wise checks.
+
+    Each rejected row gets the first reason that applies. When an item
+    appears more than once in a round, the last line wins and the others
+    are rejected.
+
+    Args:
+        df (pd.DataFrame): Rows as returned by read_import_file
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: (valid rows with BULK_LOAD_COLUMNS,
+            rejected rows with a "reason" column)
+    """
+    df = df.copy()
+    text_columns = [column for column in LONG_FORMAT_COLUMNS.values() if column != "round_key"]
+    for column in text_columns:
+        df[column] = df[column].str.strip()
+    df["timestamp_utc"] = _parse_timestamps(df["timestamp"])
+    for name in ["unit", "section", "description"]:
+        column = "section_name" if name == "section" else name
+        df[f"{name}_key"] = df[column].map(normalize_key)
+
+    too_long = pd.concat([df[column].str.len() > MAX_FIELD_LENGTH for column in text_columns], axis=1).any(axis=1)
+    checks = [
+        (df["round_type"] == "", "missing round type"),
+        (df["operator_name"] == "", "missing operator"),
+        (df["shift"] == "", "missing shift"),
+        (df["timestamp_utc"].isna(), "invalid timestamp"),
+        (df["unit"] == "", "missing unit"),
+        (df["section_name"] == "", "missing section"),
+        (df["description"] == "", "missing item description"),
+        (too_long, f"field longer than {MAX_FIELD_LENGTH} characters"),
+        (df.duplicated(["round_key", "unit_key", "section_key", "description_key"], keep="last"),
+         "duplicate item in round"),
+    ]
+    reason = pd.Series("", index=df.index)
+    for failed, message in checks:
+        reason = reason.mask(failed & (reason == ""), message)
+
+    rejected = reason != ""
+    rejects = df.loc[rejected, ["line"] + list(LONG_FORMAT_COLUMNS.values())].assign(reason=reason[rejected])
+    valid = df.loc[~rejected].astype({"timestamp_utc": "int64"})
+    return valid[BULK_LOAD_COLUMNS].reset_index(drop=True), rejects.reset_index(drop=True)
+
+def parse_import_file(source: Union[str, IO], name: Optional[str] = None) -> ParsedFile:
+    """
+    Read and validate one import file.
+
+    Runs without touching the database, so files can be parsed in parallel.
+
+    Args:
+        source (str or file-like): Path or open file (e.g. an upload)
+        name (str, optional): Name used in reports; defaults to the file name
+
+    Raises:
+        ImportFormatError: If the file is in neither format
+        OSError: If the file cannot be read
+    """
+    started = time.perf_counter()
+    name = name or os.path.basename(source)
+    rows, rejects = validate_rows(read_import_file(source, name))
+    return ParsedFile(name, rows, rejects, time.perf_counter() - started)
+
+def import_parsed_file(parsed: ParsedFile, loader: BulkLoader) -> ImportReport:
+    """
+    Load a parsed file through a loader.
+
+    Raises:
+        sqlite3.Error: If writing fails; batches already committed stay
+    """
+    started = time.perf_counter()
+    loads = loader.load(parsed.rows)
+    return ImportReport(
+        name=parsed.name,
+        rows_read=len(parsed.rows) + len(parsed.rejects),
+        rows_rejected=len(parsed.rejects),
+        rounds_imported=sum(load.rounds for load in loads),
+        rounds_skipped=sum(load.rounds_skipped for load in loads),
+        rows_imported=sum(load.rows for load in loads),
+        parse_seconds=parsed.elapsed_seconds,
+        load_seconds=time.perf_counter() - started,
+    )
+
+def write_rejects(parsed: ParsedFile, directory: str) -> Optional[str]:
+    """Write a file's rejected rows to <name>.rejected.csv; returns the path, if any were rejected."""
+    if parsed.rejects.empty:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{os.path.splitext(parsed.name)[0]}.rejected.csv")
+    parsed.rejects.to_csv(path, index=False)
+    return path
+
+def format_report(report: ImportReport) -> str:
+    """Return a one-line summary of an import report."""
+    return (f"{report.name}: {report.rows_read} rows, {report.rows_rejected} rejected, "
+            f"{report.rounds_imported} rounds imported, {report.rounds_skipped} already present, "
+            f"{report.rows_per_second:.0f} rows/s")
+
+def import_csv_files(paths: List[str], batch_rounds: Optional[int] = None,
+                     rejects_directory: Optional[str] = None) -> List[ImportReport]:
+    """
+    Import files one after another.
+
+    Args:
+        paths (List[str]): CSV files to import
+        batch_rounds (int, optional): Rounds per transaction; defaults to DATABASE["import_batch_rounds"]
+        rejects_directory (str, optional): Where to write rejected rows; not written if None
+
+    Returns:
+        List[ImportReport]: One report per file
+
+    Raises:
+        ImportFormatError: If a file is in neither format
+        sqlite3.Error: If writing fails
+        OSError: If a file cannot be read
+    """
+    loader = BulkLoader(batch_rounds)
+    reports = []
+    try:
+        for path in paths:
+            parsed = parse_import_file(path)
+            if rejects_directory:
+                write_rejects(parsed, rejects_directory)
+            reports.append(import_parsed_file(parsed, loader))
+    finally:
+        loader.finish()
+    return reports
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the CSV import."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.utils.csv_import",
+        description="Import rounds from exported or long-format CSV files."
+    )
+    parser.add_argument("files", nargs="*", help="CSV files (default: every *.csv in PATHS['imports'])")
+    parser.add_argument("--batch-rounds", type=int, default=None, help="Rounds written per transaction")
+    args = parser.parse_args(argv)
+
+    paths = args.files or sorted(glob.glob(os.path.join(PATHS["imports"], "*.csv")))
+    paths = [path for path in paths if not path.endswith(".rejected.csv")]
+    if not paths:
+        print("No files to import")
+        return 0
+
+    started = time.perf_counter()
+    loader = BulkLoader(args.batch_rounds)
+    failed = 0
+    rows = 0
+    try:
+        for path in paths:
+            try:
+                parsed = parse_import_file(path)
+                rejects_path = write_rejects(parsed, os.path.dirname(path) or ".")
+                report = import_parsed_file(parsed, loader)
+            except (ImportFormatError, OSError) as e:
+                print(f"Skipped {path}: {str(e)}", file=sys.stderr)
+                failed += 1
+                continue
+            rows += report.rows_read
+            print(format_report(report))
+            if rejects_path:
+                print(f"    rejected rows written to {rejects_path}")
+        loader.finish()
+    except sqlite3.Error as e:
+        print(f"Import error: {str(e)}", file=sys.stderr)
+        return 1
+
+    seconds = time.perf_counter() - started
+    print(f"Imported {loader.rounds_loaded} rounds from {len(paths) - failed} files, "
+          f"{rows / seconds if seconds else 0:.0f} rows/s overall")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Parquet export of round history for Operator Rounds Tracking.
+
+Writes every reading of the round history to a Parquet dataset under
+PATHS["analytics"] for notebooks and other analytics tools, so that they
+read compact columnar files instead of querying the live database.
+
+Layout (Hive partitioning, readable with pyarrow.dataset or pandas):
+
+    <PATHS["analytics"]>/month=2025-03/round_type=<round type>/part-<run>.parquet
+
+Round types are URI-encoded in directory names, which pyarrow decodes.
+
+Columns are typed: ``timestamp`` is a UTC timestamp, ``value_numeric`` and
+``output_numeric`` hold the readings that parse as numbers (null
+otherwise) next to the raw text, and unit, section and mode are
+dictionary-encoded. ``month`` (local time) and ``round_type`` come from the
+directory names.
+
+Exports are incremental: a watermark file records the id of the last
+exported round, and each run appends new part files for the rounds with
+higher ids only. Round ids grow as rounds are inserted, so rounds imported
+or backfilled with a historical time are still picked up by the next run.
+A run stops short of the first round younger than
+DEFAULTS["analytics_export_lag_hours"], which may still be being recorded.
+Readings edited after their round was exported, and rounds deleted since,
+are only picked up by a full re-export (--full).
+
+Requires pyarrow (pip install pyarrow).
+
+Usage:
+    python -m operator_rounds.utils.parquet_export [--full]
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from urllib.parse import quote
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from operator_rounds.config import DEFAULTS, PATHS
+from operator_rounds.database.history import (
+    HISTORY_COLUMNS,
+    HistoryFilter,
+    get_settled_round_id,
+    iter_history_rows
+)
+from operator_rounds.database.timeutils import format_epoch, utc_now_epoch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+WATERMARK_FILENAME = "_watermark.json"
+
+class ParquetExportReport(NamedTuple):
+    """The outcome of one Parquet export run."""
+    rounds: int
+    rows: int
+    files: int
+    watermark: Optional[int]
+    elapsed_seconds: float
+
+def _schema() -> "pa.Schema":
+    """Return the schema of the part files."""
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("round_id", pa.int64()),
+        ("timestamp", pa.timestamp("ms", tz="UTC")),
+        ("operator_name", pa.string()),
+        ("shift", pa.string()),
+        ("unit", category),
+        ("section_name", category),
+        ("description", pa.string()),
+        ("value", pa.string()),
+        ("value_numeric", pa.float64()),
+        ("output", pa.string()),
+        ("output_numeric", pa.float64()),
+        ("mode", category),
+    ])
+
+def _to_frame(rows: List[Tuple]) -> pd.DataFrame:
+    """Convert a chunk of history rows to typed columns plus the partition keys."""
+    df = pd.DataFrame.from_records(rows, columns=HISTORY_COLUMNS)
+
+    # Months are computed once per round rather than once per reading
+    months = {epoch: format_epoch(epoch, "%Y-%m") for epoch in df["timestamp_utc"].unique()}
+    df["month"] = df["timestamp_utc"].map(months)
+    df["timestamp"] = pd.to_datetime(df["timestamp_utc"], unit="s", utc=True)
+
+    for column in ["value", "output"]:
+        df[f"{column}_numeric"] = pd.to_numeric(df[column], errors="coerce")
+    for column in ["unit", "section_name", "mode"]:
+        df[column] = df[column].astype("category")
+
+    return df
+
+def get_watermark_path(root: Optional[str] = None) -> str:
+    """Return the path of the watermark file of a dataset."""
+    return os.path.join(root or PATHS["analytics"], WATERMARK_FILENAME)
+
+def read_watermark(root: Optional[str] = None) -> Optional[int]:
+    """Return the id of the last exported round, or None."""
+    try:
+        with open(get_watermark_path(root), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return data["round_id"]
+
+def _write_watermark(root: str, watermark: int) -> None:
+    """Record the last exported round, replacing the file atomically."""
+    path = get_watermark_path(root)
+    with open(path + ".partial", "w", encoding="utf-8") as f:
+        json.dump({
+            "round_id": watermark,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+        }, f)
+    os.replace(path + ".partial", path)
+
+def export_history_to_parquet(root: Optional[str] = None, full: bool = False,
+                              lag_hours: Optional[float] = None,
+                              fetch_rows: Optional[int] = None) -> ParquetExportReport:
+    """
+    Append the rounds recorded since the last export to the Parquet dataset.
+
+    Part files are written under temporary names and renamed, and the
+    watermark advanced, only once every file is complete, so an interrupted
+    run leaves the dataset as it was.
+
+    Args:
+        root (str, optional): Dataset directory; defaults to PATHS["analytics"]
+        full (bool): Delete the dataset and export the whole history again
+        lag_hours (float, optional): Skip rounds younger than this; defaults to
+            DEFAULTS["analytics_export_lag_hours"]
+        fetch_rows (int, optional): Rows read and converted per chunk
+
+    Returns:
+        ParquetExportReport: What was exported
+
+    Raises:
+        ImportError: If pyarrow is not installed
+        sqlite3.Error: If reading the history fails
+        OSError: If the dataset cannot be written
+    """
+    if pa is None:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    started = time.perf_counter()
+    root = root or PATHS["analytics"]
+    lag_hours = DEFAULTS.get("analytics_export_lag_hours", 12) if lag_hours is None else lag_hours
+
+    # A full export is built next to the dataset and swapped in at the end
+    target = root + ".rebuild" if full else root
+    if full and os.path.isdir(target):
+        shutil.rmtree(target)
+    os.makedirs(target, exist_ok=True)
+
+    after_id = None if full else read_watermark(root)
+    through_id = get_settled_round_id(after_id, utc_now_epoch() - int(lag_hours * 3600))
+    filters = HistoryFilter(after_id=after_id, through_id=through_id)
+
+    schema = _schema()
+    part_name = f"part-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.parquet"
+    writers: Dict[Tuple[str, str], Tuple[str, "pq.ParquetWriter"]] = {}
+    rounds = set()
+    rows = 0
+    try:
+        for chunk in iter_history_rows(filters, fetch_rows):
+            df = _to_frame(chunk)
+            for (month, round_type), part in df.groupby(["month", "round_type"], sort=False, observed=True):
+                if (month, round_type) not in writers:
+                    directory = os.path.join(target, f"month={month}", f"round_type={quote(round_type, safe='')}")
+                    os.makedirs(directory, exist_ok=True)
+                    path = os.path.join(directory, part_name)
+                    writers[(month, round_type)] = (path, pq.ParquetWriter(path + ".partial", schema))
+                table = pa.Table.from_pandas(part[schema.names], schema=schema, preserve_index=False)
+                writers[(month, round_type)][1].write_table(table)
+
+            rounds.update(df["round_id"].unique().tolist())
+            rows += len(df)
+    except BaseException:
+        for path, writer in writers.values():
+            writer.close()
+            os.remove(path + ".partial")
+        if full:
+            shutil.rmtree(target, ignore_errors=True)
+        raise
+
+    for path, writer in writers.values():
+        writer.close()
+    for path, _ in writers.values():
+        os.replace(path + ".partial", path)
+    # Rounds in the range without readings are passed over too
+    watermark = through_id if through_id > (after_id or 0) else after_id
+    if watermark is not None:
+        _write_watermark(target, watermark)
+    if full:
+        if os.path.isdir(root):
+            shutil.rmtree(root)
+        os.replace(target, root)
+
+    return ParquetExportReport(len(rounds), rows, len(writers), watermark, time.perf_counter() - started)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for the Parquet export."""
+    parser = argparse.ArgumentParser(
+        prog="python -m operator_rounds.utils.parquet_export",
+        description="Append new rounds to the partitioned Parquet history."
+    )
+    parser.add_argument("--full", action="store_true", help="Rebuild the dataset from the whole history")
+    parser.add_argument("--root", default=None, help="Dataset directory (default: PATHS['analytics'])")
+    parser.add_argument("--lag-hours", type=float, default=None,
+                        help="Skip rounds younger than this (default: DEFAULTS['analytics_export_lag_hours'])")
+    args = parser.parse_args(argv)
+
+    try:
+        report = export_history_to_parquet(args.root, full=args.full, lag_hours=args.lag_hours)
+    except (ImportError, sqlite3.Error, OSError) as e:
+        print(f"Parquet export error: {str(e)}", file=sys.stderr)
+        return 1
+
+    print(f"Exported {report.rounds} rounds ({report.rows} readings) to {report.files} files "
+          f"in {report.elapsed_seconds:.2f} s")
+    if report.watermark:
+        print(f"Watermark: round {report.watermark}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Wide comparison table of rounds for Operator Rounds Tracking.
+
+Pivots the readings of a range of rounds into one table with a row per
+round and a column per unit / section / item, so that readings can be
+compared across shifts. The readings are read with a single history query
+(see database/history.py) and placed with one vectorized assignment into a
+rounds x items matrix; nothing is assembled round by round.
+
+A dense table costs memory for every cell, recorded or not, so the layout
+can be chosen:
+
+- "wide": a dense table (the default while it has at most
+  DEFAULTS["pivot_max_cells"] cells)
+- "sparse": the same table with sparse columns that store only the
+  recorded readings
+- "long": one row per reading, as in the bulk CSV export
+- "auto": "wide" within the cell limit, "sparse" beyond it
+"""
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from operator_rounds.config import DEFAULTS, PATHS
+from operator_rounds.database.history import HISTORY_COLUMNS, HistoryFilter, iter_history_rows
+from operator_rounds.database.timeutils import format_epoch
+from operator_rounds.utils.bulk_export import BULK_EXPORT_HEADER, bulk_export_filename, export_rounds_to_file
+
+PIVOT_LAYOUTS = ["auto", "wide", "sparse", "long"]
+# Leading columns of a pivoted table; the item columns follow
+ROUND_COLUMNS = ["Round ID", "Round Type", "Operator", "Shift", "Timestamp"]
+
+def load_readings(filters: HistoryFilter, fetch_rows: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read the readings matching a filter into a long table.
+
+    Repeated text (names, units, sections, items) is stored as categoricals,
+    so the table costs little more than the readings themselves.
+
+    Returns:
+        pd.DataFrame: One row per reading, with the columns in HISTORY_COLUMNS
+
+    Raises:
+        sqlite3.Error: If the query fails
+    """
+    categorical = ["round_type", "operator_name", "shift", "unit", "section_name", "description", "mode"]
+    chunks = []
+    for rows in iter_history_rows(filters, fetch_rows):
+        chunk = pd.DataFrame.from_records(rows, columns=HISTORY_COLUMNS)
+        chunks.append(chunk.astype({column: "category" for column in categorical}))
+
+    if not chunks:
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    # Chunks have different categories; union_categoricals merges them
+    # without going through object columns
+    return pd.DataFrame({
+        column: union_categoricals([chunk[column] for chunk in chunks]) if column in categorical
+        else np.concatenate([chunk[column].to_numpy() for chunk in chunks])
+        for column in HISTORY_COLUMNS
+    })
+
+def _round_frame(readings: pd.DataFrame) -> pd.DataFrame:
+    """Return the round-level columns, one row per round in order of appearance."""
+    rounds = readings.drop_duplicates("round_id")
+    return pd.DataFrame(dict(zip(ROUND_COLUMNS, [
+        rounds["round_id"].to_numpy(),
+        rounds["round_type"].astype(str).to_numpy(),
+        rounds["operator_name"].astype(str).to_numpy(),
+        rounds["shift"].astype(str).to_numpy(),
+        rounds["timestamp_utc"].map(format_epoch).to_numpy(),
+    ])))
+
+def _long_frame(readings: pd.DataFrame) -> pd.DataFrame:
+    """Return the readings with the column names of the bulk CSV export."""
+    df = readings.copy()
+    df["timestamp_utc"] = df["timestamp_utc"].map(format_epoch)
+    df.columns = BULK_EXPORT_HEADER
+    return df
+
+def pivot_readings(readings: pd.DataFrame, layout: str = "auto", value_column: str = "value",
+                   max_cells: Optional[int] = None) -> Tuple[pd.DataFrame, str]:
+    """
+    Pivot a long table of readings into one row per round.
+
+    Args:
+        readings (pd.DataFrame): Readings as returned by load_readings
+        layout (str): One of PIVOT_LAYOUTS
+        value_column (str): Reading column to show in the cells ("value" or "output")
+        max_cells (int, optional): Cell limit for "auto"; defaults to DEFAULTS["pivot_max_cells"]
+
+    Returns:
+        Tuple[pd.DataFrame, str]: The table and the layout actually used
+
+    Raises:
+        ValueError: If the layout or value column is unknown
+    """
+    if layout not in PIVOT_LAYOUTS:
+        raise ValueError(f"Unknown pivot layout: {layout}")
+    if value_column not in ("value", "output"):
+        raise ValueError(f"Cannot pivot on column: {value_column}")
+    if layout == "long":
+        return _long_frame(readings), layout
+
+    # Rows and columns are numbered in order of first appearance, which is
+    # round order and, within a round, unit/section/item order. Columns are
+    # keyed on integer codes; label strings are built once per column.
+    row_codes, round_ids = pd.factorize(readings["round_id"])
+    key = np.zeros(len(readings), dtype=np.int64)
+    for part in ["unit", "section_name", "description"]:
+        codes, uniques = pd.factorize(readings[part])
+        key = key * (len(uniques) + 1) + codes + 1
+    column_codes, _ = pd.factorize(key)
+    first = readings.iloc[np.unique(column_codes, return_index=True)[1]]
+    columns = [" / ".join(map(str, names))
+               for names in zip(first["unit"], first["section_name"], first["description"])]
+    values = readings[value_column].to_numpy(dtype=object)
+
+    if layout == "auto":
+        max_cells = max_cells or DEFAULTS.get("pivot_max_cells", 2000000)
+        layout = "wide" if len(round_ids) * len(columns) <= max_cells else "sparse"
+
+    if layout == "wide":
+        matrix = np.full((len(round_ids), len(columns)), None, dtype=object)
+        # Should an item appear twice in a round, the later reading wins
+        matrix[row_codes, column_codes] = values
+        cells = pd.DataFrame(matrix, columns=columns, dtype=object)
+    else:
+        # Build one column at a time from the readings sorted by column, so
+        # only a single dense column ever exists
+        order = np.argsort(column_codes, kind="stable")
+        bounds = np.searchsorted(column_codes[order], np.arange(len(columns) + 1))
+        sparse_columns = {}
+        for j, label in enumerate(columns):
+            positions = order[bounds[j]:bounds[j + 1]]
+            column = np.full(len(round_ids), None, dtype=object)
+            column[row_codes[positions]] = values[positions]
+            sparse_columns[label] = pd.arrays.SparseArray(column, fill_value=None)
+        cells = pd.DataFrame(sparse_columns)
+
+    return pd.concat([_round_frame(readings), cells], axis=1), layout
+
+def get_round_pivot(filters: HistoryFilter, layout: str = "auto",
+                    value_column: str = "value") -> Tuple[pd.DataFrame, str]:
+    """
+    Load and pivot the readings matching a filter; see pivot_readings.
+
+    Raises:
+        sqlite3.Error: If the query fails
+        ValueError: If the layout or value column is unknown
+    """
+    return pivot_readings(load_readings(filters), layout, value_column)
+
+def export_pivot_to_file(filters: HistoryFilter, layout: str = "auto", value_column: str = "value",
+                         filename: Optional[str] = None) -> Tuple[str, int, str]:
+    """
+    Write the comparison table of a filter as CSV to a file in PATHS["exports"].
+
+    The long layout is streamed by the bulk CSV export. The other layouts
+    are written in row chunks to a temporary file that replaces the target
+    once complete.
+
+    Returns:
+        Tuple[str, int, str]: (path of the written file, bytes written, layout used)
+
+    Raises:
+        sqlite3.Error: If the query fails
+        ValueError: If the layout or value column is unknown
+        OSError: If the file cannot be written
+    """
+    if layout == "long":
+        path, size = export_rounds_to_file(filters, filename)
+        return path, size, layout
+
+    table, layout = get_round_pivot(filters, layout, value_column)
+    os.makedirs(PATHS["exports"], exist_ok=True)
+    filename = filename or bulk_export_filename(filters).replace("Rounds_", "Rounds_Wide_", 1)
+    path = os.path.join(PATHS["exports"], filename)
+
+    try:
+        table.to_csv(path + ".partial", index=False, chunksize=1000)
+        os.replace(path + ".partial", path)
+    except BaseException:
+        if os.path.exists(path + ".partial"):
+            os.remove(path + ".partial")
+        raise
+
+    return path, os.path.getsize(path), layout
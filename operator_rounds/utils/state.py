@@ -1,5 +1,6 @@
 """Session state management for Operator Rounds Tracking."""
 import streamlit as st
+import sqlite3
 from datetime import datetime
 
 def initialize_round_data_structure():
@@ -62,6 +63,10 @@ def init_session_state():
         
         # Load last round data
         from operator_rounds.database.queries import load_last_round_data
-        last_round_data = load_last_round_data()
+        try:
+            last_round_data = load_last_round_data()
+        except sqlite3.Error as e:
+            st.error(f"Error loading round data: {str(e)}")
+            last_round_data = None
         if last_round_data:
             st.session_state.rounds_data.update(last_round_data)
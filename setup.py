@@ -8,6 +8,14 @@ setup(
         "streamlit>=1.20.0",
         "pandas>=1.3.0"
     ],
+    extras_require={
+        "parquet": ["pyarrow>=7.0.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "operator-rounds=operator_rounds.cli:main",
+        ],
+    },
     author="MDGL",
     description="A Streamlit application for tracking operator rounds in industrial facilities",
 )